@@ -0,0 +1,36 @@
+"""journal full-text search index
+
+Revision ID: 3f1c9a7e2b10
+Revises:
+Create Date: 2026-10-19 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7e2b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.create_index(
+        "ix_journal_entries_search",
+        "journal_entries",
+        [sa.text("to_tsvector('english'::regconfig, entry_text)")],
+        postgresql_using="gin",
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index(
+        "ix_journal_entries_search", table_name="journal_entries", if_exists=True
+    )
@@ -0,0 +1,27 @@
+"""journal entry revision counter
+
+Revision ID: 5b8e2f0c7a41
+Revises: c47a0d9e5f18
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2f0c7a41'
+down_revision = 'c47a0d9e5f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "journal_entries",
+        sa.Column("revision", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("journal_entries", "revision")
@@ -0,0 +1,38 @@
+"""keyset pagination indexes for journal entries and mood logs
+
+Revision ID: 8d2e4b6a1c35
+Revises: 3f1c9a7e2b10
+Create Date: 2026-10-19 10:25:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e4b6a1c35'
+down_revision = '3f1c9a7e2b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_journal_entries_user_created",
+        "journal_entries",
+        ["user_id", "created_at", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_mood_logs_user_timestamp",
+        "mood_logs",
+        ["user_id", "timestamp", "id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_mood_logs_user_timestamp", table_name="mood_logs", if_exists=True)
+    op.drop_index(
+        "ix_journal_entries_user_created", table_name="journal_entries", if_exists=True
+    )
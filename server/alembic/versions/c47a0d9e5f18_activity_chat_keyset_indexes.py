@@ -0,0 +1,40 @@
+"""keyset pagination indexes for activity logs and chat messages
+
+Revision ID: c47a0d9e5f18
+Revises: 8d2e4b6a1c35
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47a0d9e5f18'
+down_revision = '8d2e4b6a1c35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_activity_logs_user_completed",
+        "activity_logs",
+        ["user_id", "completed_at", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_chat_messages_room_timestamp",
+        "chat_messages",
+        ["chat_room", "timestamp", "id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_chat_messages_room_timestamp", table_name="chat_messages", if_exists=True
+    )
+    op.drop_index(
+        "ix_activity_logs_user_completed", table_name="activity_logs", if_exists=True
+    )
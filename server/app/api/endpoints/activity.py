@@ -1,66 +1,80 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.pagination import keyset_page, set_cursor_headers
 from app.core.security import get_current_active_user
 from app.db.database import get_db
 from app.db.models import ActivityLog, JournalEntry, User
 from app.db.schemas import ActivityLog as ActivityLogSchema
-from app.db.schemas import ActivityLogCreate
+from app.db.schemas import ActivityLogCreate, IngestReceipt
 from app.db.schemas import JournalEntry as JournalEntrySchema
 from app.db.schemas import JournalEntryCreate
-from app.services.ai_service import ai_service
+from app.services.activity_correlations import activity_correlations
+from app.services.content_catalog import content_catalog
+from app.services.ingest_spool import ingest_spool
+from app.services.journal_search import journal_search
+from app.services.sentiment_pipeline import sentiment_pipeline
+from app.services.topic_tagger import topic_tagger
+from app.services.wellness_cache import wellness_cache
 
 router = APIRouter()
 
 
-def analyze_journal_sentiment_background(db: Session, journal_entry_id: int):
-    """Background task to analyze journal sentiment"""
-    journal_entry = (
-        db.query(JournalEntry).filter(JournalEntry.id == journal_entry_id).first()
-    )
-    if journal_entry:
-        sentiment_score = ai_service.analyze_journal_sentiment(journal_entry.entry_text)
-        journal_entry.sentiment_score = sentiment_score
-        db.commit()
-
-
-@router.post("/log", response_model=ActivityLogSchema)
+@router.post("/log", response_model=IngestReceipt, status_code=status.HTTP_202_ACCEPTED)
 async def log_activity(
     activity_data: ActivityLogCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    """Log a completed activity"""
-
-    activity_log = ActivityLog(
-        user_id=current_user.id, content_id=activity_data.content_id
-    )
-
-    db.add(activity_log)
-    db.commit()
-    db.refresh(activity_log)
+    """Log a completed activity (acknowledged once durable in the ingest spool)"""
+
+    # Checked now: once acknowledged, a log for missing content could only be dropped later
+    if not content_catalog.exists(db, activity_data.content_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
+
+    completed_at = datetime.now()
+    try:
+        ingest_id = await ingest_spool.append(
+            "activity_log",
+            {
+                "user_id": current_user.id,
+                "content_id": activity_data.content_id,
+                "completed_at": completed_at.isoformat(),
+            },
+        )
+    except OSError:
+        raise HTTPException(status_code=503, detail="Ingest spool unavailable")
 
-    return activity_log
+    return IngestReceipt(ingest_id=ingest_id, received_at=completed_at)
 
 
 @router.get("/logs", response_model=List[ActivityLogSchema])
 async def get_activity_logs(
+    response: Response,
     limit: int = Query(50, ge=1, le=200, description="Number of items to return"),
-    offset: int = Query(0, ge=0, description="Number of items to skip"),
+    offset: int = Query(0, ge=0, description="Number of items to skip (prefer before/after)"),
+    before: Optional[str] = Query(None, description="Return items older than this cursor"),
+    after: Optional[str] = Query(None, description="Return items newer than this cursor"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get user's activity logs"""
 
-    logs = (
-        db.query(ActivityLog)
-        .filter(ActivityLog.user_id == current_user.id)
-        .order_by(ActivityLog.completed_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    query = db.query(ActivityLog).filter(ActivityLog.user_id == current_user.id)
+    logs, next_cursor = keyset_page(
+        query,
+        ActivityLog.completed_at,
+        ActivityLog.id,
+        limit,
+        before=before,
+        after=after,
+        offset=offset,
+    )
+    set_cursor_headers(
+        response, logs, ActivityLog.completed_at, ActivityLog.id, next_cursor
     )
 
     return logs
@@ -69,7 +83,6 @@ async def get_activity_logs(
 @router.post("/journal", response_model=JournalEntrySchema)
 async def create_journal_entry(
     journal_data: JournalEntryCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
@@ -78,35 +91,46 @@ async def create_journal_entry(
     journal_entry = JournalEntry(
         user_id=current_user.id, entry_text=journal_data.entry_text
     )
+    journal_entry.topic_tags = topic_tagger.build_tags(
+        current_user.id, journal_data.entry_text
+    )
 
     db.add(journal_entry)
     db.commit()
     db.refresh(journal_entry)
+    journal_search.index_entry(journal_entry)
+    wellness_cache.invalidate(current_user.id)
 
-    # Add background task to analyze sentiment
-    background_tasks.add_task(
-        analyze_journal_sentiment_background, db, journal_entry.id
-    )
+    # Queue sentiment analysis on the worker pool
+    sentiment_pipeline.submit(journal_entry.id)
 
     return journal_entry
 
 
 @router.get("/journal", response_model=List[JournalEntrySchema])
 async def get_journal_entries(
+    response: Response,
     limit: int = Query(50, ge=1, le=200, description="Number of items to return"),
-    offset: int = Query(0, ge=0, description="Number of items to skip"),
+    offset: int = Query(0, ge=0, description="Number of items to skip (prefer before/after)"),
+    before: Optional[str] = Query(None, description="Return items older than this cursor"),
+    after: Optional[str] = Query(None, description="Return items newer than this cursor"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get user's journal entries"""
 
-    entries = (
-        db.query(JournalEntry)
-        .filter(JournalEntry.user_id == current_user.id)
-        .order_by(JournalEntry.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    query = db.query(JournalEntry).filter(JournalEntry.user_id == current_user.id)
+    entries, next_cursor = keyset_page(
+        query,
+        JournalEntry.created_at,
+        JournalEntry.id,
+        limit,
+        before=before,
+        after=after,
+        offset=offset,
+    )
+    set_cursor_headers(
+        response, entries, JournalEntry.created_at, JournalEntry.id, next_cursor
     )
 
     return entries
@@ -159,5 +183,8 @@ async def delete_journal_entry(
 
     db.delete(entry)
     db.commit()
+    journal_search.remove_entry(current_user.id, entry_id)
+    wellness_cache.invalidate(current_user.id)
+    activity_correlations.mark_dirty([current_user.id])
 
     return {"message": "Journal entry deleted successfully"}
@@ -1,18 +1,31 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.orm import Session
 
 from app.core.security import get_current_user, require_admin
 from app.db.database import get_db
-from app.db.models import Content, User, UserRoleEnum, Badge
+from app.db.models import Content, User, UserRoleEnum, Badge, WellnessScore
 from app.db.schemas import (
     Content as ContentSchema, 
     ContentCreate, 
     Badge as BadgeSchema, 
     BadgeCreate,
-    User as UserSchema
+    User as UserSchema,
+    WellnessScore as WellnessScoreSchema
 )
+from app.services.activity_correlations import activity_correlations
+from app.services.anomaly_detector import anomaly_detector
+from app.services.content_catalog import content_catalog
+from app.services.content_popularity import content_popularity
+from app.services.content_similarity import content_similarity
+from app.services.ingest_spool import ingest_spool
+from app.services.item_similarity import item_similarity
+from app.services.population_sketch import population_sketch
+from app.services.sentiment_cache import sentiment_cache
+from app.services.sentiment_pipeline import sentiment_pipeline
+from app.services.wearable_ingest import wearable_ingest
+from app.services.wellness_cache import wellness_cache
 
 router = APIRouter()
 
@@ -64,8 +77,10 @@ async def create_content(
     """Create new content (admin only)"""
     content = Content(**content_data.dict())
     db.add(content)
+    content_catalog.bump(db)
     db.commit()
     db.refresh(content)
+    content_catalog.reload(db)
     return content
 
 
@@ -84,8 +99,10 @@ async def update_content(
     for field, value in content_data.dict().items():
         setattr(content, field, value)
     
+    content_catalog.bump(db)
     db.commit()
     db.refresh(content)
+    content_catalog.reload(db)
     return content
 
 
@@ -101,7 +118,9 @@ async def delete_content(
         raise HTTPException(status_code=404, detail="Content not found")
     
     db.delete(content)
+    content_catalog.bump(db)
     db.commit()
+    content_catalog.reload(db)
     
     return {"message": "Content deleted successfully"}
 
@@ -139,8 +158,10 @@ async def upload_video(
     )
     
     db.add(content)
+    content_catalog.bump(db)
     db.commit()
     db.refresh(content)
+    content_catalog.reload(db)
     
     return {"message": "Video uploaded successfully", "content": content}
 
@@ -201,4 +222,43 @@ async def get_analytics(
         "active_users": active_users,
         "total_content": total_content,
         "user_engagement": (active_users / total_users * 100) if total_users > 0 else 0
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/wellness-scores", response_model=List[WellnessScoreSchema])
+async def get_wellness_scores(
+    max_score: Optional[float] = Query(None, description="Only users scoring at or below this"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Latest nightly wellness scores, lowest first (admin only)"""
+    query = db.query(WellnessScore)
+    if max_score is not None:
+        query = query.filter(WellnessScore.overall_score <= max_score)
+    return (
+        query.order_by(WellnessScore.overall_score, WellnessScore.user_id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/metrics")
+async def get_metrics(current_user: User = Depends(require_admin)):
+    """Get background pipeline metrics (admin only)"""
+    return {
+        "sentiment_pipeline": sentiment_pipeline.stats(),
+        "sentiment_cache": sentiment_cache.stats(),
+        "wearable_ingest": wearable_ingest.stats(),
+        "ingest_spool": ingest_spool.stats(),
+        "wellness_cache": wellness_cache.stats(),
+        "population_sketch": population_sketch.stats(),
+        "activity_correlations": activity_correlations.stats(),
+        "anomaly_detector": anomaly_detector.stats(),
+        "content_popularity": content_popularity.stats(),
+        "content_catalog": content_catalog.stats(),
+        "content_similarity": content_similarity.stats(),
+        "item_similarity": item_similarity.stats(),
+    }
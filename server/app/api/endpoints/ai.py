@@ -1,48 +1,135 @@
-from fastapi import APIRouter, BackgroundTasks, Depends
+from datetime import datetime
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.security import get_current_active_user
 from app.db.database import get_db
-from app.db.models import MoodLog, User
-from app.db.schemas import AIAnalysis
-from app.db.schemas import MoodLog as MoodLogSchema
-from app.db.schemas import MoodLogCreate
+from app.db.models import User
+from app.db.schemas import (AIAnalysis, IngestReceipt, MoodLogCreate,
+                            WearableAnomaly, WearableBatch,
+                            WearableBatchResult)
 from app.services.ai_service import ai_service
+from app.services.anomaly_detector import anomaly_detector
+from app.services.ingest_spool import ingest_spool
+from app.services.mood_rollups import TREND_RESOLUTION_PATTERN
 from app.services.recommendation_service import recommendation_service
+from app.services.sensor_service import sensor_service
+from app.services.wearable_ingest import (PACKED_SAMPLES_CONTENT_TYPE,
+                                          check_reading, decode_packed_samples,
+                                          samples_to_columns, wearable_ingest)
 
 router = APIRouter()
 
 
-def analyze_wearable_data_background(db: Session, mood_log_id: int):
-    """Background task to analyze wearable data"""
-    mood_log = db.query(MoodLog).filter(MoodLog.id == mood_log_id).first()
-    if mood_log:
-        mood_score = ai_service.analyze_wearable_data(mood_log.raw_sensor_data)
-        mood_log.calculated_mood_score = mood_score
-        db.commit()
-
-
-@router.post("/smartwatch-sync", response_model=MoodLogSchema)
+@router.post(
+    "/smartwatch-sync",
+    response_model=IngestReceipt,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def sync_smartwatch_data(
     mood_data: MoodLogCreate,
-    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Sync smartwatch/fitness band data.
+    The reading is acknowledged once it is durable in the ingest spool and
+    shows up in trends when the drainer has loaded it.
+    """
+
+    # Checked now: once acknowledged, a bad value could only be dropped later
+    try:
+        reading = check_reading(mood_data.raw_sensor_data)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    received_at = datetime.now()
+
+    try:
+        ingest_id = await ingest_spool.append(
+            "sensor_sample",
+            {
+                "user_id": current_user.id,
+                "timestamp": received_at.isoformat(),
+                "calculated_mood_score": ai_service.analyze_wearable_data(
+                    mood_data.raw_sensor_data
+                ),
+                **reading,
+            },
+        )
+    except OSError:
+        raise HTTPException(status_code=503, detail="Ingest spool unavailable")
+
+    return IngestReceipt(ingest_id=ingest_id, received_at=received_at)
+
+
+def _wearable_batch_request_schema():
+    """JSON schema for WearableBatch with the sample definition inlined"""
+    schema = WearableBatch.model_json_schema()
+    sample_schema = schema.pop("$defs")["WearableSample"]
+    schema["properties"]["samples"]["items"] = sample_schema
+    return schema
+
+
+@router.post(
+    "/smartwatch-sync/batch",
+    response_model=WearableBatchResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": _wearable_batch_request_schema()},
+                PACKED_SAMPLES_CONTENT_TYPE: {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+            },
+        }
+    },
+)
+async def sync_smartwatch_batch(
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    """Sync smartwatch/fitness band data"""
-
-    mood_log = MoodLog(
-        user_id=current_user.id, raw_sensor_data=mood_data.raw_sensor_data
-    )
-
-    db.add(mood_log)
-    db.commit()
-    db.refresh(mood_log)
-
-    # Add background task to analyze the data
-    background_tasks.add_task(analyze_wearable_data_background, db, mood_log.id)
-
-    return mood_log
+    """
+    Sync a buffered batch of timestamped smartwatch samples, sent as JSON
+    or in the packed binary format (see PACKED_SAMPLES_CONTENT_TYPE)
+    """
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    body = await request.body()
+
+    if content_type == PACKED_SAMPLES_CONTENT_TYPE:
+        try:
+            timestamps, columns = decode_packed_samples(
+                body, settings.wearable_batch_max_samples
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=422, detail=str(e)
+            )
+    elif content_type in ("application/json", ""):
+        try:
+            batch = WearableBatch.model_validate_json(body)
+        except ValidationError as e:
+            # Rejected inputs may be Infinity or NaN, which can't be sent back as JSON
+            raise RequestValidationError(e.errors(include_url=False, include_input=False))
+        try:
+            timestamps, columns = samples_to_columns(batch.samples)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=422, detail=str(e)
+            )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send application/json or {PACKED_SAMPLES_CONTENT_TYPE}",
+        )
+
+    return wearable_ingest.ingest(db, current_user.id, timestamps, columns)
 
 
 @router.get("/analysis", response_model=AIAnalysis)
@@ -52,8 +139,10 @@ async def get_ai_analysis(
     """Get AI analysis overview"""
 
     # Get trends
-    sentiment_trends = ai_service.get_sentiment_trends(db, current_user.id)
-    mood_trends = ai_service.get_mood_trends(db, current_user.id)
+    sentiment_trends = ai_service.get_sentiment_trends(
+        db, current_user.id, resolution="auto"
+    )
+    mood_trends = ai_service.get_mood_trends(db, current_user.id, resolution="auto")
 
     # Get insights
     insights = ai_service.generate_insights(db, current_user.id)
@@ -110,27 +199,61 @@ async def get_insights(
     }
 
 
+@router.get("/anomalies", response_model=List[WearableAnomaly])
+async def get_anomalies(
+    hours: int = Query(72, ge=1, le=24 * 30),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Get recent HRV drops and stress spikes flagged in wearable data"""
+
+    return anomaly_detector.recent(db, current_user.id, hours)
+
+
 @router.get("/trends/sentiment")
 async def get_sentiment_trends(
     days: int = 30,
+    resolution: str = Query(
+        "auto",
+        pattern=TREND_RESOLUTION_PATTERN,
+        description="raw, hour, day, or auto to fit the span in a few hundred points",
+    ),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get sentiment trends over time"""
 
-    trends = ai_service.get_sentiment_trends(db, current_user.id, days)
+    trends = ai_service.get_sentiment_trends(db, current_user.id, days, resolution)
 
     return {"trends": trends, "period_days": days}
 
 
+@router.get("/sensors/daily")
+async def get_sensor_daily_averages(
+    days: int = 30,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Get daily averages of wearable metrics"""
+
+    averages = sensor_service.daily_averages(db, current_user.id, days)
+
+    return {"averages": averages, "period_days": days}
+
+
 @router.get("/trends/mood")
 async def get_mood_trends(
     days: int = 30,
+    resolution: str = Query(
+        "auto",
+        pattern=TREND_RESOLUTION_PATTERN,
+        description="raw, hour, day, or auto to fit the span in a few hundred points",
+    ),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get mood trends over time"""
 
-    trends = ai_service.get_mood_trends(db, current_user.id, days)
+    trends = ai_service.get_mood_trends(db, current_user.id, days, resolution)
 
     return {"trends": trends, "period_days": days}
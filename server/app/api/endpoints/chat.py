@@ -1,10 +1,12 @@
 import json
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+from fastapi import (APIRouter, Depends, Query, Response, WebSocket,
+                     WebSocketDisconnect)
 from sqlalchemy.orm import Session
 
+from app.core.pagination import keyset_page, set_cursor_headers
 from app.core.security import get_current_active_user
 from app.db.database import get_db
 from app.db.models import ChatMessage, User
@@ -113,21 +115,29 @@ async def websocket_endpoint(
 
 @router.get("/rooms/{chat_room}/messages", response_model=List[ChatMessageSchema])
 async def get_chat_messages(
+    response: Response,
     chat_room: str,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Number of messages to skip (prefer before/after)"),
+    before: Optional[str] = Query(None, description="Return messages older than this cursor"),
+    after: Optional[str] = Query(None, description="Return messages newer than this cursor"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get chat message history for a room"""
 
-    messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.chat_room == chat_room)
-        .order_by(ChatMessage.timestamp.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    query = db.query(ChatMessage).filter(ChatMessage.chat_room == chat_room)
+    messages, next_cursor = keyset_page(
+        query,
+        ChatMessage.timestamp,
+        ChatMessage.id,
+        limit,
+        before=before,
+        after=after,
+        offset=offset,
+    )
+    set_cursor_headers(
+        response, messages, ChatMessage.timestamp, ChatMessage.id, next_cursor
     )
 
     # Reverse to get chronological order
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.core.security import get_current_active_user
@@ -8,6 +8,8 @@ from app.db.database import get_db
 from app.db.models import CategoryEnum, Content, ContentTypeEnum, User
 from app.db.schemas import Content as ContentSchema
 from app.db.schemas import ContentCreate
+from app.services.content_catalog import content_catalog
+from app.services.content_similarity import content_similarity
 
 router = APIRouter()
 
@@ -20,20 +22,16 @@ async def get_explore_content(
     ),
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Get content for the Explore tab with filtering"""
 
-    query = db.query(Content)
-
-    if category:
-        query = query.filter(Content.category == category)
-
-    if content_type:
-        query = query.filter(Content.content_type == content_type)
-
-    content_items = query.offset(offset).limit(limit).all()
+    content_items = content_catalog.snapshot.select(
+        categories=[category] if category else None,
+        content_types=[content_type] if content_type else None,
+        offset=offset,
+        limit=limit,
+    )
 
     return content_items
 
@@ -42,17 +40,12 @@ async def get_explore_content(
 async def get_library_content(
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Get learning modules for the Library tab"""
 
-    content_items = (
-        db.query(Content)
-        .filter(Content.content_type == ContentTypeEnum.LEARNING_MODULE)
-        .offset(offset)
-        .limit(limit)
-        .all()
+    content_items = content_catalog.snapshot.select(
+        content_types=[ContentTypeEnum.LEARNING_MODULE], offset=offset, limit=limit
     )
 
     return content_items
@@ -78,6 +71,22 @@ async def get_content_by_id(
     return content
 
 
+@router.get("/{content_id}/similar", response_model=List[ContentSchema])
+async def get_similar_content(
+    content_id: int,
+    limit: int = Query(5, ge=1, le=20, description="Number of items to return"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get content with similar titles and descriptions ("more like this")"""
+
+    if content_catalog.snapshot.get(content_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Content not found"
+        )
+
+    return content_similarity.similar(content_id, limit=limit)
+
+
 @router.post("/", response_model=ContentSchema)
 async def create_content(content_data: ContentCreate, db: Session = Depends(get_db)):
     """Create new content (admin function)"""
@@ -92,8 +101,10 @@ async def create_content(content_data: ContentCreate, db: Session = Depends(get_
     )
 
     db.add(content)
+    content_catalog.bump(db)
     db.commit()
     db.refresh(content)
+    content_catalog.reload(db)
 
     return content
 
@@ -1,16 +1,24 @@
 from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, load_only
 from pydantic import BaseModel
 
 from app.db.database import get_db
 from app.db.models import JournalEntry, User
+from app.core.pagination import (decode_cursor, encode_cursor, keyset_page,
+                                 parse_fields, set_cursor_headers)
 from app.core.security import get_current_user
+from app.services.journal_search import journal_search
+from app.services.sentiment_pipeline import sentiment_pipeline
+from app.services.topic_tagger import topic_tagger
+from app.services.wellness_cache import wellness_cache
 
 router = APIRouter()
 
+JOURNAL_ENTRY_FIELDS = ["id", "entry_text", "sentiment_score", "created_at"]
+
 
 class JournalEntryCreate(BaseModel):
     entry_text: str
@@ -26,6 +34,15 @@ class JournalEntryResponse(BaseModel):
         from_attributes = True
 
 
+class JournalSearchResult(JournalEntryResponse):
+    rank: float
+
+
+class JournalSearchResponse(BaseModel):
+    results: List[JournalSearchResult]
+    next_cursor: str | None
+
+
 @router.get("/test")
 async def test_journal_endpoint():
     """Test endpoint to verify journal API is working"""
@@ -62,14 +79,43 @@ async def create_mock_entry(entry: JournalEntryCreate):
     }
 
 
-@router.get("/entries", response_model=List[JournalEntryResponse])
+@router.get(
+    "/entries",
+    response_model=None,
+    responses={200: {"model": List[JournalEntryResponse]}},
+)
 async def get_journal_entries(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200, description="Number of items to return"),
+    cursor: str | None = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    date_from: datetime | None = Query(None, alias="from", description="Only entries created at or after this time"),
+    date_to: datetime | None = Query(None, alias="to", description="Only entries created before this time"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all journal entries for the current user"""
-    entries = db.query(JournalEntry).filter(JournalEntry.user_id == current_user.id).order_by(JournalEntry.created_at.desc()).all()
-    return entries
+    """Get the current user's journal entries, newest first, one page at a time"""
+    selected = parse_fields(fields, JOURNAL_ENTRY_FIELDS)
+    columns = {"id", "created_at", *selected}
+
+    query = (
+        db.query(JournalEntry)
+        .options(load_only(*[getattr(JournalEntry, column) for column in columns]))
+        .filter(JournalEntry.user_id == current_user.id)
+    )
+    if date_from:
+        query = query.filter(JournalEntry.created_at >= date_from)
+    if date_to:
+        query = query.filter(JournalEntry.created_at < date_to)
+
+    entries, next_cursor = keyset_page(
+        query, JournalEntry.created_at, JournalEntry.id, limit, before=cursor
+    )
+    set_cursor_headers(
+        response, entries, JournalEntry.created_at, JournalEntry.id, next_cursor
+    )
+
+    return [{field: getattr(entry, field) for field in selected} for entry in entries]
 
 
 @router.post("/entries", response_model=JournalEntryResponse)
@@ -82,11 +128,59 @@ async def create_journal_entry(
     # Create journal entry
     db_entry = JournalEntry(
         user_id=current_user.id,
-        entry_text=entry.entry_text,
-        sentiment_score=0.5  # TODO: Implement actual sentiment analysis
+        entry_text=entry.entry_text
     )
+    db_entry.topic_tags = topic_tagger.build_tags(current_user.id, entry.entry_text)
     db.add(db_entry)
     db.commit()
     db.refresh(db_entry)
-    
-    return db_entry
\ No newline at end of file
+    journal_search.index_entry(db_entry)
+    wellness_cache.invalidate(current_user.id)
+
+    # Queue sentiment analysis on the worker pool
+    sentiment_pipeline.submit(db_entry.id)
+
+    return db_entry
+
+
+@router.get("/search", response_model=JournalSearchResponse)
+async def search_journal_entries(
+    q: str = Query(..., min_length=1, description="Search query"),
+    date_from: datetime | None = Query(None, alias="from", description="Only entries created at or after this time"),
+    date_to: datetime | None = Query(None, alias="to", description="Only entries created before this time"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    cursor: str | None = Query(None, description="Cursor from a previous page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Search the current user's journal entries, best matches first"""
+    after = decode_cursor(cursor, 3)
+    matches = journal_search.search(
+        db,
+        current_user.id,
+        q,
+        limit=limit + 1,
+        date_from=date_from,
+        date_to=date_to,
+        after=tuple(after) if after else None,
+    )
+
+    next_cursor = None
+    if len(matches) > limit:
+        matches = matches[:limit]
+        last_entry, last_rank = matches[-1]
+        next_cursor = encode_cursor([last_rank, last_entry.created_at, last_entry.id])
+
+    return {
+        "results": [
+            JournalSearchResult(
+                id=entry.id,
+                entry_text=entry.entry_text,
+                sentiment_score=entry.sentiment_score,
+                created_at=entry.created_at,
+                rank=rank,
+            )
+            for entry, rank in matches
+        ],
+        "next_cursor": next_cursor,
+    }
@@ -1,16 +1,22 @@
 from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, load_only
 from pydantic import BaseModel
 
 from app.db.database import get_db
 from app.db.models import MoodLog, User
+from app.core.pagination import keyset_page, parse_fields, set_cursor_headers
 from app.core.security import get_current_user
+from app.services.activity_correlations import activity_correlations
+from app.services.mood_rollups import mood_rollups
+from app.services.wellness_cache import wellness_cache
 
 router = APIRouter()
 
+MOOD_LOG_FIELDS = ["id", "mood_rating", "note", "timestamp"]
+
 
 class MoodLogCreate(BaseModel):
     mood_rating: int
@@ -19,7 +25,7 @@ class MoodLogCreate(BaseModel):
 
 class MoodLogResponse(BaseModel):
     id: int
-    mood_rating: int
+    mood_rating: int | None
     note: str | None
     timestamp: datetime
     
@@ -69,14 +75,56 @@ async def create_mock_log(mood: MoodLogCreate):
     }
 
 
-@router.get("/logs", response_model=List[MoodLogResponse])
+def _mood_log_field(log: MoodLog, field: str):
+    """Read a response field from a mood log (rating and note live in the sensor payload)"""
+    if field == "mood_rating":
+        rating = (log.raw_sensor_data or {}).get("mood_rating")
+        if rating is None and log.calculated_mood_score is not None:
+            # Wearable samples only carry a 0-1 score
+            rating = round(log.calculated_mood_score * 5)
+        return rating
+    if field == "note":
+        return (log.raw_sensor_data or {}).get("note")
+    return getattr(log, field)
+
+
+@router.get(
+    "/logs",
+    response_model=None,
+    responses={200: {"model": List[MoodLogResponse]}},
+)
 async def get_mood_logs(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200, description="Number of items to return"),
+    cursor: str | None = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    date_from: datetime | None = Query(None, alias="from", description="Only logs at or after this time"),
+    date_to: datetime | None = Query(None, alias="to", description="Only logs before this time"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all mood logs for the current user"""
-    logs = db.query(MoodLog).filter(MoodLog.user_id == current_user.id).order_by(MoodLog.timestamp.desc()).all()
-    return logs
+    """Get the current user's mood logs, newest first, one page at a time"""
+    selected = parse_fields(fields, MOOD_LOG_FIELDS)
+    columns = [MoodLog.id, MoodLog.timestamp]
+    if "mood_rating" in selected or "note" in selected:
+        columns += [MoodLog.raw_sensor_data, MoodLog.calculated_mood_score]
+
+    query = (
+        db.query(MoodLog)
+        .options(load_only(*columns))
+        .filter(MoodLog.user_id == current_user.id)
+    )
+    if date_from:
+        query = query.filter(MoodLog.timestamp >= date_from)
+    if date_to:
+        query = query.filter(MoodLog.timestamp < date_to)
+
+    logs, next_cursor = keyset_page(
+        query, MoodLog.timestamp, MoodLog.id, limit, before=cursor
+    )
+    set_cursor_headers(response, logs, MoodLog.timestamp, MoodLog.id, next_cursor)
+
+    return [{field: _mood_log_field(log, field) for field in selected} for log in logs]
 
 
 @router.post("/logs", response_model=MoodLogResponse)
@@ -93,8 +141,15 @@ async def create_mood_log(
         calculated_mood_score=mood.mood_rating / 5.0  # Normalize to 0-1 scale
     )
     db.add(db_mood)
+    db.flush()
+    db.refresh(db_mood)
+    mood_rollups.record(
+        db, [(current_user.id, db_mood.timestamp, db_mood.calculated_mood_score)]
+    )
     db.commit()
     db.refresh(db_mood)
+    wellness_cache.invalidate(current_user.id)
+    activity_correlations.mark_dirty([current_user.id])
     
     # Return in expected format
     return {
@@ -7,7 +7,12 @@ from sqlalchemy.orm import Session
 from app.core.security import get_current_user
 from app.db.database import get_db
 from app.db.models import ActivityLog, Badge, User, UserBadge, BadgeTypeEnum
-from app.db.schemas import StreakInfo, UserBadge as UserBadgeSchema, Badge as BadgeSchema
+from app.db.schemas import StreakInfo, StreakPercentile, UserBadge as UserBadgeSchema, Badge as BadgeSchema
+from app.services.activity_correlations import activity_correlations
+from app.services.ai_service import ai_service
+from app.services.content_popularity import content_popularity
+from app.services.population_sketch import effective_streak, population_sketch
+from app.services.wellness_cache import wellness_cache
 
 router = APIRouter()
 
@@ -69,6 +74,8 @@ async def log_activity(
     db: Session = Depends(get_db)
 ):
     """Log an activity and update streak"""
+    previous_streak = effective_streak(current_user)
+
     # Create activity log
     activity_log = ActivityLog(
         user_id=current_user.id,
@@ -76,6 +83,7 @@ async def log_activity(
         completed_at=datetime.utcnow()
     )
     db.add(activity_log)
+    content_popularity.record(db, [(content_id, activity_log.completed_at)])
     
     # Update user streak
     update_user_streak(current_user, db)
@@ -84,10 +92,26 @@ async def log_activity(
     check_and_award_badges(current_user, db)
     
     db.commit()
+    wellness_cache.invalidate(current_user.id)
+    activity_correlations.mark_dirty([current_user.id])
+    population_sketch.record_change("streak", previous_streak, current_user.current_streak)
     
     return {"message": "Activity logged successfully", "streak": current_user.current_streak}
 
 
+@router.get("/percentile", response_model=StreakPercentile)
+async def get_streak_percentile(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Where the user's streak and wellness score stand among all users"""
+    wellness_score = ai_service.calculate_wellness_score(db, current_user.id)["overall_score"]
+    return {
+        "streak": population_sketch.rank(db, "streak", effective_streak(current_user)),
+        "wellness": population_sketch.rank(db, "wellness", wellness_score),
+    }
+
+
 @router.get("/badges", response_model=List[UserBadgeSchema])
 async def get_user_badges(
     current_user: User = Depends(get_current_user),
@@ -1,9 +1,11 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from app.core.pagination import decode_cursor
 from app.core.security import get_current_active_user, verify_clerk_token
 from app.db.database import get_db
 from app.db.models import Goal, User, UserGoal, UserSettings
@@ -12,6 +14,7 @@ from app.db.schemas import OnboardingData
 from app.db.schemas import User as UserSchema
 from app.db.schemas import UserSettings as UserSettingsSchema
 from app.db.schemas import UserUpdate
+from app.services.export_service import EXPORT_RECORD_TYPES, export_service
 
 router = APIRouter()
 bearer_security = HTTPBearer()
@@ -45,6 +48,34 @@ async def update_user_profile(
     return current_user
 
 
+@router.get("/me/export")
+async def export_user_data(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+    cursor: str | None = Query(None, description="Resume after the record with this cursor"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Stream the current user's journal, mood, activity and review history"""
+
+    after = decode_cursor(cursor, 2)
+    if after and (after[0] not in EXPORT_RECORD_TYPES or not isinstance(after[1], int)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    filename = f"uplook-export.{export_format}"
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        export_service.stream(current_user.id, export_format, gzip, after),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.post("/complete-onboarding", response_model=UserSchema)
 async def complete_onboarding_simple(
     onboarding_data: OnboardingData,
@@ -1,3 +1,6 @@
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -5,15 +8,48 @@ from app.api.endpoints import activity, ai, auth, chat, content, home, users, st
 from app.core.config import settings
 from app.db.database import engine
 from app.db.models import Base
+from app.services.activity_correlations import activity_correlations
+from app.services.ai_service import ai_service
+from app.services.content_catalog import content_catalog
+from app.services.content_similarity import content_similarity
+from app.services.ingest_spool import ingest_spool
+from app.services.population_sketch import population_sketch
+from app.services.sentiment_pipeline import sentiment_pipeline
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+def warm_up():
+    ai_service.warm_up()
+    content_similarity.refresh()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start background workers
+    sentiment_pipeline.start()
+    ingest_spool.start()
+    population_sketch.start()
+    activity_correlations.start()
+    content_catalog.start()
+    # Load NumPy, the sentiment model and the content similarity index off the
+    # startup path, while requests are served
+    threading.Thread(target=warm_up, name="analytics-warm-up", daemon=True).start()
+    yield
+    content_catalog.stop()
+    activity_correlations.stop()
+    population_sketch.stop()
+    ingest_spool.stop()
+    sentiment_pipeline.stop()
+
+
 app = FastAPI(
     title="Uplook Wellness API",
     description="Backend API for the Uplook wellness application",
     version="1.0.0",
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -23,6 +59,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Before-Cursor", "X-After-Cursor"],
 )
 
 # Include routers
@@ -22,6 +22,68 @@ class Settings(BaseSettings):
     # Redis Configuration (for Celery)
     redis_url: str = "redis://localhost:6379/0"
 
+    # Sentiment Pipeline Configuration
+    sentiment_workers: int = 2
+    sentiment_batch_size: int = 64
+    sentiment_batch_wait_ms: int = 50
+    sentiment_cache_path: str = "sentiment_cache.sqlite3"
+    sentiment_cache_size: int = 10000
+    # Rows kept in the shared SQLite cache; least recently used go first
+    sentiment_cache_disk_size: int = 200000
+    # "vader", or "sklearn" for a model trained with train_sentiment_model.py
+    sentiment_backend: str = "vader"
+    sentiment_model_path: str = ""
+
+    # Journal topic lexicon (JSON file mapping topic -> keywords; empty uses defaults)
+    topic_lexicon_path: str = ""
+
+    # Wearable batch ingest
+    wearable_batch_max_samples: int = 10000
+
+    # Raw sensor sample retention (older samples are archived to Parquet)
+    sensor_retention_days: int = 90
+    sensor_archive_dir: str = "var/sensor_archive"
+    sensor_compaction_batch_size: int = 5000
+
+    # Durable local spool for single-reading and activity log writes
+    ingest_spool_dir: str = "var/ingest_spool"
+    ingest_spool_segment_bytes: int = 1024 * 1024
+    ingest_spool_segment_age_ms: int = 1000
+    ingest_spool_drain_batch_size: int = 1000
+    ingest_spool_drain_interval_ms: int = 200
+
+    # Per-user wellness score cache (invalidated when new data lands)
+    wellness_cache_size: int = 10000
+    wellness_cache_ttl_seconds: int = 900
+
+    # Population percentile histograms (per-worker changes are merged this often)
+    population_sketch_flush_seconds: int = 30
+
+    # Activity-mood correlations (users with new data are refreshed this often)
+    activity_correlation_window_days: int = 90
+    activity_correlation_refresh_seconds: int = 300
+
+    # Wearable anomaly flags (z-score of a reading against the user's rolling
+    # baseline, which follows roughly the last ANOMALY_BASELINE_WINDOW readings)
+    anomaly_zscore_threshold: float = 3.0
+    anomaly_min_samples: int = 30
+    anomaly_baseline_window: int = 1000
+    anomaly_cooldown_minutes: int = 60
+
+    # Content popularity (completions decay by half every HALF_LIFE_DAYS; content
+    # whose decayed count falls below MIN_SCORE stops counting as popular)
+    content_popularity_half_life_days: float = 7.0
+    content_popularity_min_score: float = 0.1
+
+    # In-memory content catalog (workers check for content changes this often)
+    content_catalog_poll_seconds: int = 5
+
+    # Item-item collaborative filtering ("people who did X also did Y"),
+    # trained offline by train_item_similarity.py over the last WINDOW_DAYS
+    item_similarity_path: str = "var/item_similarity.npy"
+    item_similarity_neighbors: int = 20
+    item_similarity_window_days: int = 180
+
     # Application Configuration
     secret_key: str = "your_secret_key_here"
     environment: str = "development"
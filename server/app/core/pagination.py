@@ -0,0 +1,162 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, literal, or_, tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode keyset values (datetimes, numbers, strings) as an opaque cursor"""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """Decode a cursor produced by encode_cursor, rejecting malformed input"""
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError("unexpected cursor shape")
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def parse_fields(fields: Optional[str], allowed: List[str]) -> List[str]:
+    """Parse a comma-separated field selector, defaulting to all fields"""
+    if not fields:
+        return list(allowed)
+
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    return selected
+
+
+def row_cursor(row: Any, timestamp_column: Any, id_column: Any) -> str:
+    """Cursor pointing at a row's (timestamp, id) position"""
+    return encode_cursor(
+        [getattr(row, timestamp_column.key), getattr(row, id_column.key)]
+    )
+
+
+def _keyset_filter(
+    query: Query, timestamp_column: Any, id_column: Any, cursor: str, newer: bool
+):
+    """Filter for rows past the cursor's (timestamp, id), newer or older than it"""
+    position = decode_cursor(cursor, 2)
+    if not isinstance(position[0], datetime) or not isinstance(position[1], int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    timestamp_bound = literal(position[0], timestamp_column.type)
+    id_bound = literal(position[1], id_column.type)
+    if query.session.bind.dialect.name == "sqlite" and not position[0].microsecond:
+        # SQLite keeps timestamps as text: server defaults without fractional
+        # seconds, ones written by the ORM with ".000000". Both spell the
+        # cursor's instant and sort around each other, so ties go by id
+        # within either form (rows of both forms in the same second would
+        # still sort by form first)
+        short_bound = literal(position[0].strftime("%Y-%m-%d %H:%M:%S"))
+        same_instant = timestamp_column.in_([short_bound, timestamp_bound])
+        if newer:
+            return or_(
+                timestamp_column > timestamp_bound, and_(same_instant, id_column > id_bound)
+            )
+        return or_(timestamp_column < short_bound, and_(same_instant, id_column < id_bound))
+
+    key = tuple_(timestamp_column, id_column)
+    bound = tuple_(timestamp_bound, id_bound)
+    return key > bound if newer else key < bound
+
+
+def keyset_page(
+    query: Query,
+    timestamp_column: Any,
+    id_column: Any,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    offset: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of rows ordered newest first by (timestamp, id).
+
+    before returns rows older than the cursor, after returns rows newer than
+    it; with neither, the page starts at the newest row (skipping offset rows,
+    kept for older clients). Returns the rows and a cursor that continues in
+    the same direction, or None when there is nothing further. Cursor pages
+    are served by a composite (owner, timestamp, id) index, so deep pages
+    cost the same as the first one.
+    """
+    if before and after:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either before or after, not both",
+        )
+
+    if after:
+        rows = (
+            query.filter(_keyset_filter(query, timestamp_column, id_column, after, newer=True))
+            .order_by(timestamp_column.asc(), id_column.asc())
+            .limit(limit + 1)
+            .all()
+        )
+    else:
+        if before:
+            query = query.filter(
+                _keyset_filter(query, timestamp_column, id_column, before, newer=False)
+            )
+        query = query.order_by(timestamp_column.desc(), id_column.desc())
+        if offset and not before:
+            query = query.offset(offset)
+        rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = row_cursor(rows[-1], timestamp_column, id_column)
+
+    if after:
+        rows.reverse()
+    return rows, next_cursor
+
+
+def set_cursor_headers(
+    response: Response,
+    rows: List[Any],
+    timestamp_column: Any,
+    id_column: Any,
+    next_cursor: Optional[str],
+):
+    """Expose page cursors as headers so list-shaped responses stay unchanged"""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if rows:
+        response.headers["X-Before-Cursor"] = row_cursor(
+            rows[-1], timestamp_column, id_column
+        )
+        response.headers["X-After-Cursor"] = row_cursor(
+            rows[0], timestamp_column, id_column
+        )
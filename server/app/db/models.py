@@ -1,7 +1,7 @@
 import enum
 
-from sqlalchemy import (JSON, Boolean, Column, DateTime, Enum, Float,
-                        ForeignKey, Integer, String, Text)
+from sqlalchemy import (JSON, REAL, Boolean, Column, Date, DateTime, Enum, Float,
+                        ForeignKey, Index, Integer, String, Text, literal_column)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -82,6 +82,7 @@ class User(Base):
     activity_logs = relationship("ActivityLog", back_populates="user")
     journal_entries = relationship("JournalEntry", back_populates="user")
     mood_logs = relationship("MoodLog", back_populates="user")
+    sensor_samples = relationship("SensorSample", back_populates="user")
     user_badges = relationship("UserBadge", back_populates="user")
     plans = relationship("Plan", back_populates="user")
 
@@ -138,6 +139,9 @@ class Content(Base):
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        Index("ix_activity_logs_user_completed", "user_id", "completed_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -248,19 +252,60 @@ class CardReview(Base):
 
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
+    __table_args__ = (
+        Index("ix_journal_entries_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     entry_text = Column(Text, nullable=False)
     sentiment_score = Column(Float, nullable=True)
     created_at = Column(DateTime, default=func.now())
+    # Bumped by every UPDATE, so edits change the search index signature
+    revision = Column(
+        Integer, nullable=False, default=0, onupdate=literal_column("revision") + 1
+    )
 
     # Relationships
     user = relationship("User", back_populates="journal_entries")
+    topic_tags = relationship(
+        "JournalEntryTag", back_populates="journal_entry", cascade="all, delete-orphan"
+    )
+
+
+class JournalEntryTag(Base):
+    __tablename__ = "journal_entry_tags"
+    __table_args__ = (
+        Index("ix_journal_entry_tags_user_tag_created", "user_id", "tag", "created_at"),
+    )
+
+    journal_entry_id = Column(
+        Integer, ForeignKey("journal_entries.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime, default=func.now())
+
+    # Relationships
+    journal_entry = relationship("JournalEntry", back_populates="topic_tags")
+
+
+# Full-text search index (PostgreSQL only; other databases use the
+# in-process fallback in app.services.journal_search)
+Index(
+    "ix_journal_entries_search",
+    func.to_tsvector(
+        literal_column("'english'::regconfig"), JournalEntry.entry_text
+    ),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
 
 
 class MoodLog(Base):
     __tablename__ = "mood_logs"
+    __table_args__ = (
+        Index("ix_mood_logs_user_timestamp", "user_id", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -272,8 +317,164 @@ class MoodLog(Base):
     user = relationship("User", back_populates="mood_logs")
 
 
+class SensorSample(Base):
+    """One wearable reading; metrics a device did not report are NULL"""
+
+    __tablename__ = "sensor_samples"
+    __table_args__ = (
+        Index("ix_sensor_samples_user_timestamp", "user_id", "timestamp"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    heart_rate = Column(REAL, nullable=True)
+    hrv = Column(REAL, nullable=True)
+    stress_level = Column(REAL, nullable=True)
+    sleep_quality = Column(REAL, nullable=True)
+    activity_level = Column(REAL, nullable=True)
+    calculated_mood_score = Column(REAL, nullable=True)
+
+    # Relationships
+    user = relationship("User", back_populates="sensor_samples")
+
+
+class SensorDailyAggregate(Base):
+    """Per-day sums of sensor samples that were compacted out of sensor_samples"""
+
+    __tablename__ = "sensor_daily_aggregates"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    sample_count = Column(Integer, nullable=False)
+    # Sum and count of non-NULL values for each metric
+    heart_rate_sum = Column(Float, nullable=False, default=0)
+    heart_rate_count = Column(Integer, nullable=False, default=0)
+    hrv_sum = Column(Float, nullable=False, default=0)
+    hrv_count = Column(Integer, nullable=False, default=0)
+    stress_level_sum = Column(Float, nullable=False, default=0)
+    stress_level_count = Column(Integer, nullable=False, default=0)
+    sleep_quality_sum = Column(Float, nullable=False, default=0)
+    sleep_quality_count = Column(Integer, nullable=False, default=0)
+    activity_level_sum = Column(Float, nullable=False, default=0)
+    activity_level_count = Column(Integer, nullable=False, default=0)
+    calculated_mood_score_sum = Column(Float, nullable=False, default=0)
+    calculated_mood_score_count = Column(Integer, nullable=False, default=0)
+
+
+class MoodRollup(Base):
+    """Mood score aggregate over one hour or one day of a user's mood data"""
+
+    __tablename__ = "mood_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    resolution = Column(String, primary_key=True)  # "hour" or "day"
+    bucket_start = Column(DateTime, primary_key=True)
+    sample_count = Column(Integer, nullable=False)
+    score_sum = Column(Float, nullable=False)
+    min_score = Column(Float, nullable=False)
+    max_score = Column(Float, nullable=False)
+
+
+class WellnessScore(Base):
+    """A user's latest wellness score, from the nightly batch or computed on demand"""
+
+    __tablename__ = "wellness_scores"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    overall_score = Column(Float, nullable=False, index=True)
+    sentiment_component = Column(Float, nullable=False)
+    mood_component = Column(Float, nullable=False)
+    trend = Column(String, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
+
+
+class WellnessDataVersion(Base):
+    """Bumped when a user's scoring data changes, so every worker drops its cached wellness score"""
+
+    __tablename__ = "wellness_data_versions"
+
+    # No foreign key: a bump racing a user's deletion must not fail the others
+    user_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+
+class PopulationHistogram(Base):
+    """Count of users per value bucket of a metric, for percentile lookups"""
+
+    __tablename__ = "population_histograms"
+
+    metric = Column(String, primary_key=True)  # "streak" or "wellness"
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class ActivityMoodCorrelation(Base):
+    """How a user's mood or journal sentiment differs on (or after) days with an activity type"""
+
+    __tablename__ = "activity_mood_correlations"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    activity_type = Column(String, primary_key=True)  # a ContentTypeEnum value
+    metric = Column(String, primary_key=True)  # "mood" or "sentiment"
+    lag_days = Column(Integer, primary_key=True)  # 0: same day, 1: the day after
+    days_with = Column(Integer, nullable=False)
+    days_without = Column(Integer, nullable=False)
+    mean_with = Column(Float, nullable=False)
+    mean_without = Column(Float, nullable=False)
+    effect = Column(Float, nullable=False)  # mean_with - mean_without
+    correlation = Column(Float, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
+
+
+class SensorBaseline(Base):
+    """Rolling mean and variance of one wearable metric for a user"""
+
+    __tablename__ = "sensor_baselines"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+    mean = Column(Float, nullable=False)
+    variance = Column(Float, nullable=False)
+    last_flagged_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class WearableAnomaly(Base):
+    """A reading far outside the user's baseline (e.g. an HRV drop or stress spike)"""
+
+    __tablename__ = "wearable_anomalies"
+    __table_args__ = (
+        Index("ix_wearable_anomalies_user_timestamp", "user_id", "timestamp"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    metric = Column(String, nullable=False)
+    kind = Column(String, nullable=False)  # "hrv_drop" or "stress_spike"
+    timestamp = Column(DateTime, nullable=False)  # when the reading was taken
+    value = Column(Float, nullable=False)
+    baseline_mean = Column(Float, nullable=False)
+    zscore = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+
+
+class IngestSpoolCheckpoint(Base):
+    """How many records of a spool segment are already in the database"""
+
+    __tablename__ = "ingest_spool_checkpoints"
+
+    segment = Column(String, primary_key=True)
+    records_applied = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_room_timestamp", "chat_room", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     chat_room = Column(String, nullable=False, index=True)
@@ -310,3 +511,24 @@ class UserBadge(Base):
     # Relationships
     user = relationship("User", back_populates="user_badges")
     badge = relationship("Badge", back_populates="user_badges")
+
+
+class ContentPopularity(Base):
+    """Exponentially time-decayed completion count of a content item"""
+
+    __tablename__ = "content_popularity"
+
+    content_id = Column(Integer, ForeignKey("content.id", ondelete="CASCADE"), primary_key=True)
+    # log2 of the decayed count, scaled to POPULARITY_EPOCH: decay shifts every
+    # row by the same amount, so the order (and this index) never goes stale
+    log_score = Column(Float, nullable=False, index=True)
+    last_completed_at = Column(DateTime, nullable=False)
+
+
+class ContentCatalogVersion(Base):
+    """Bumped with every content change so API workers know to reload their catalog"""
+
+    __tablename__ = "content_catalog_version"
+
+    id = Column(Integer, primary_key=True)  # a single row, id 1
+    version = Column(Integer, nullable=False)
@@ -1,7 +1,9 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, field_validator
+
+from app.core.config import settings
 
 from app.db.models import CategoryEnum, ContentTypeEnum, BadgeTypeEnum, UserRoleEnum
 
@@ -152,6 +154,83 @@ class MoodLog(MoodLogBase):
         from_attributes = True
 
 
+# Wearable batch ingest schemas
+class WearableSample(BaseModel):
+    """One buffered device reading; short aliases keep large batches compact"""
+
+    timestamp: datetime = Field(alias="t")
+    heart_rate: Optional[float] = Field(None, alias="hr", ge=0, le=300)
+    hrv: Optional[float] = Field(None, ge=0, le=500)
+    stress_level: Optional[float] = Field(None, alias="stress", ge=0, le=100)
+    sleep_quality: Optional[float] = Field(None, alias="sleep", ge=0, le=100)
+    # Nominally 0-100; scoring caps it at 100, but some devices report more
+    activity_level: Optional[float] = Field(None, alias="activity", ge=0, le=1000)
+
+    class Config:
+        populate_by_name = True
+        extra = "forbid"
+        # Infinity and NaN would poison the running baselines and rollups
+        allow_inf_nan = False
+
+    @field_validator("timestamp")
+    @classmethod
+    def to_naive_local(cls, value: datetime) -> datetime:
+        """Sensor rows are naive local time; readings with an offset are converted"""
+        if value.tzinfo is not None:
+            try:
+                return value.astimezone().replace(tzinfo=None)
+            except (OverflowError, OSError):
+                raise ValueError("timestamp out of range")
+        return value
+
+
+class WearableBatch(BaseModel):
+    samples: List[WearableSample] = Field(
+        min_length=1, max_length=settings.wearable_batch_max_samples
+    )
+
+
+class WearableBatchResult(BaseModel):
+    accepted: int
+    first_timestamp: datetime
+    last_timestamp: datetime
+    average_mood_score: float
+
+
+class WearableAnomaly(BaseModel):
+    metric: str
+    kind: str
+    timestamp: datetime
+    value: float
+    baseline_mean: float
+    zscore: float
+
+    class Config:
+        from_attributes = True
+
+
+# Wellness score schemas
+class WellnessScore(BaseModel):
+    user_id: int
+    overall_score: float
+    sentiment_component: float
+    mood_component: float
+    trend: str
+    computed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Ingest spool schemas
+class IngestReceipt(BaseModel):
+    """Acknowledgement for a write that is durable in the ingest spool"""
+
+    ingest_id: str
+    status: str = "accepted"
+    received_at: datetime
+
+
 # Chat Message schemas
 class ChatMessageBase(BaseModel):
     chat_room: str
@@ -242,5 +321,17 @@ class StreakInfo(BaseModel):
     streak_percentage: float  # Progress towards next milestone
 
 
+class PopulationRank(BaseModel):
+    value: float
+    percentile: Optional[float]  # None until the population has been counted
+    top_percent: Optional[float]
+    population: int
+
+
+class StreakPercentile(BaseModel):
+    streak: PopulationRank
+    wellness: PopulationRank
+
+
 class UserWithBadges(User):
     user_badges: List[UserBadge] = []
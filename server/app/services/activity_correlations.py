@@ -0,0 +1,295 @@
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import (ActivityLog, ActivityMoodCorrelation, Content,
+                           JournalEntry, MoodRollup)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CORRELATION_METRICS = ["mood", "sentiment"]
+# Same-day effect, and the effect on the following day
+CORRELATION_LAGS = [0, 1]
+
+# Days needed on each side (with and without the activity) to store a result
+MIN_DAYS = 3
+
+# Users per refresh batch (keeps the IN lists and memory bounded)
+REFRESH_CHUNK_SIZE = 500
+
+
+def correlate(activity: "np.ndarray", values: "np.ndarray", lag: int) -> Dict[str, "np.ndarray"]:
+    """
+    Compare a daily series with activity indicators from lag days earlier.
+
+    activity is a (types, days) 0/1 matrix and values a (days,) series with
+    NaN on days without data. The first lag days are left out, since the
+    activity lag days before them falls outside the window. Returns per-type
+    day counts, means on days with and without the activity, their
+    difference, and the point-biserial correlation (Pearson's r between the
+    indicator and the series).
+    """
+    import numpy as np
+
+    shifted = np.zeros_like(activity)
+    shifted[:, lag:] = activity[:, : activity.shape[1] - lag]
+    observed = ~np.isnan(values)
+    observed[:lag] = False
+    x = shifted[:, observed]
+    y = values[observed]
+
+    days_with = x.sum(axis=1)
+    days_without = len(y) - days_with
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_with = (x @ y) / days_with
+        mean_without = ((1 - x) @ y) / days_without
+        effect = mean_with - mean_without
+        share = days_with / len(y)
+        correlation = effect * np.sqrt(share * (1 - share)) / y.std()
+    return {
+        "days_with": days_with,
+        "days_without": days_without,
+        "mean_with": mean_with,
+        "mean_without": mean_without,
+        "effect": effect,
+        "correlation": correlation,
+    }
+
+
+def _day(value) -> date:
+    """func.date() comes back as a string on SQLite and a date on PostgreSQL"""
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+class ActivityCorrelationService:
+    """
+    Which activity types move each user's mood and journal sentiment.
+
+    Activity completions (by content type) are lined up against daily mood
+    (from the day rollups) and daily mean journal sentiment over a sliding
+    window, and compared with NumPy on the same day and the day after.
+    Results are stored per user in activity_mood_correlations, so insights
+    read a handful of rows instead of joining raw tables. Writers mark users
+    whose data changed; a background thread recomputes just those, and a
+    nightly job refreshes everyone as the window moves.
+    """
+
+    def __init__(
+        self,
+        window_days: int = settings.activity_correlation_window_days,
+        refresh_seconds: int = settings.activity_correlation_refresh_seconds,
+    ):
+        self.window_days = window_days
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._dirty: Set[int] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Metrics
+        self.users_refreshed = 0
+        self.results_stored = 0
+        self.failed_refreshes = 0
+        self.last_refresh_at: Optional[datetime] = None
+
+    def start(self):
+        """Start the periodic refresh thread"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="activity-correlations", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the refresh thread (pending users wait for the nightly job)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh_dirty()
+
+    def mark_dirty(self, user_ids: Iterable[int]):
+        """Note users with new activity, mood or journal data"""
+        with self._lock:
+            self._dirty.update(user_ids)
+
+    def refresh_dirty(self):
+        """Recompute every user marked since the last run"""
+        with self._lock:
+            user_ids, self._dirty = self._dirty, set()
+        if not user_ids:
+            return
+
+        db = SessionLocal()
+        try:
+            self.refresh(db, user_ids)
+        except Exception as e:
+            self.failed_refreshes += 1
+            print(f"Error refreshing activity correlations: {e}")
+            # Try these users again next time
+            self.mark_dirty(user_ids)
+        finally:
+            db.close()
+
+    def refresh(self, db: Session, user_ids: Iterable[int], now: Optional[datetime] = None) -> int:
+        """Recompute and store correlations for some users"""
+        now = now or datetime.now()
+        start = datetime.combine((now - timedelta(days=self.window_days)).date(), datetime.min.time())
+        user_ids = sorted(set(user_ids))
+
+        for offset in range(0, len(user_ids), REFRESH_CHUNK_SIZE):
+            chunk = user_ids[offset : offset + REFRESH_CHUNK_SIZE]
+            rows = self._compute(db, chunk, start, now)
+            db.query(ActivityMoodCorrelation).filter(
+                ActivityMoodCorrelation.user_id.in_(chunk)
+            ).delete(synchronize_session=False)
+            if rows:
+                db.execute(insert(ActivityMoodCorrelation), rows)
+            db.commit()
+            self.results_stored += len(rows)
+
+        self.users_refreshed += len(user_ids)
+        self.last_refresh_at = datetime.now()
+        return len(user_ids)
+
+    def refresh_all(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Refresh every user with activity in the window, or with stored results"""
+        now = now or datetime.now()
+        start = now - timedelta(days=self.window_days)
+        active = db.query(ActivityLog.user_id).filter(ActivityLog.completed_at >= start).distinct()
+        stored = db.query(ActivityMoodCorrelation.user_id).distinct()
+        user_ids = {row.user_id for row in active} | {row.user_id for row in stored}
+        return self.refresh(db, user_ids, now)
+
+    def _compute(
+        self, db: Session, user_ids: List[int], start: datetime, now: datetime
+    ) -> List[Dict[str, Any]]:
+        import numpy as np
+
+        days = (now.date() - start.date()).days + 1
+
+        activity_day = func.date(ActivityLog.completed_at)
+        activity: Dict[int, Dict[str, Set[int]]] = defaultdict(lambda: defaultdict(set))
+        for user_id, day, content_type in (
+            db.query(ActivityLog.user_id, activity_day, Content.content_type)
+            .join(Content, ActivityLog.content_id == Content.id)
+            .filter(ActivityLog.user_id.in_(user_ids), ActivityLog.completed_at >= start)
+            .distinct()
+        ):
+            activity[user_id][content_type.value].add((_day(day) - start.date()).days)
+
+        series: Dict[str, Dict[int, Dict[int, float]]] = {
+            metric: defaultdict(dict) for metric in CORRELATION_METRICS
+        }
+        for user_id, bucket, score in db.query(
+            MoodRollup.user_id,
+            MoodRollup.bucket_start,
+            MoodRollup.score_sum / MoodRollup.sample_count,
+        ).filter(
+            MoodRollup.user_id.in_(user_ids),
+            MoodRollup.resolution == "day",
+            MoodRollup.bucket_start >= start,
+        ):
+            series["mood"][user_id][(bucket.date() - start.date()).days] = score
+
+        journal_day = func.date(JournalEntry.created_at)
+        for user_id, day, score in (
+            db.query(JournalEntry.user_id, journal_day, func.avg(JournalEntry.sentiment_score))
+            .filter(
+                JournalEntry.user_id.in_(user_ids),
+                JournalEntry.created_at >= start,
+                JournalEntry.sentiment_score.isnot(None),
+            )
+            .group_by(JournalEntry.user_id, journal_day)
+        ):
+            series["sentiment"][user_id][(_day(day) - start.date()).days] = score
+
+        rows = []
+        for user_id, by_type in activity.items():
+            types = sorted(by_type)
+            indicators = np.zeros((len(types), days))
+            for row, activity_type in enumerate(types):
+                indicators[row, [day for day in by_type[activity_type] if day < days]] = 1
+
+            for metric in CORRELATION_METRICS:
+                by_day = series[metric].get(user_id)
+                if not by_day:
+                    continue
+                values = np.full(days, np.nan)
+                for day, score in by_day.items():
+                    if 0 <= day < days:
+                        values[day] = score
+                if np.isnan(values).all():
+                    continue
+
+                for lag in CORRELATION_LAGS:
+                    result = correlate(indicators, values, lag)
+                    for row, activity_type in enumerate(types):
+                        if (
+                            result["days_with"][row] < MIN_DAYS
+                            or result["days_without"][row] < MIN_DAYS
+                            or not np.isfinite(result["correlation"][row])
+                        ):
+                            continue
+                        rows.append(
+                            {
+                                "user_id": user_id,
+                                "activity_type": activity_type,
+                                "metric": metric,
+                                "lag_days": lag,
+                                "days_with": int(result["days_with"][row]),
+                                "days_without": int(result["days_without"][row]),
+                                "mean_with": float(result["mean_with"][row]),
+                                "mean_without": float(result["mean_without"][row]),
+                                "effect": float(result["effect"][row]),
+                                "correlation": float(result["correlation"][row]),
+                                "computed_at": now,
+                            }
+                        )
+        return rows
+
+    def strongest(
+        self, db: Session, user_id: int, min_correlation: float = 0.2, limit: int = 3
+    ) -> List[ActivityMoodCorrelation]:
+        """A user's stored results, most strongly correlated first"""
+        return (
+            db.query(ActivityMoodCorrelation)
+            .filter(
+                ActivityMoodCorrelation.user_id == user_id,
+                func.abs(ActivityMoodCorrelation.correlation) >= min_correlation,
+            )
+            .order_by(func.abs(ActivityMoodCorrelation.correlation).desc())
+            .limit(limit)
+            .all()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Refresh counters for the admin metrics endpoint"""
+        with self._lock:
+            pending = len(self._dirty)
+        return {
+            "running": self._thread is not None,
+            "pending_users": pending,
+            "users_refreshed": self.users_refreshed,
+            "results_stored": self.results_stored,
+            "failed_refreshes": self.failed_refreshes,
+            "last_refresh_at": self.last_refresh_at.isoformat() if self.last_refresh_at else None,
+        }
+
+
+# Global instance
+activity_correlations = ActivityCorrelationService()
@@ -1,25 +1,103 @@
+import heapq
+import numbers
+import threading
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
-import numpy as np
 from sqlalchemy.orm import Session
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
-from app.db.models import JournalEntry, MoodLog
+from app.db.models import JournalEntry, MoodLog, SensorSample
+from app.services.activity_correlations import activity_correlations
+from app.services.anomaly_detector import anomaly_detector
+from app.services.mood_rollups import MAX_TREND_POINTS, mood_rollups, summarize
+from app.services.population_sketch import population_sketch
+from app.services.sentiment_backends import SentimentBackend, make_backend
+from app.services.sentiment_cache import sentiment_cache
+from app.services.wellness_cache import wellness_cache
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Wearable metrics and the value assumed when a reading omits one
+WEARABLE_DEFAULTS = {
+    "heart_rate": 70,
+    "hrv": 50,
+    "stress_level": 50,
+    "sleep_quality": 70,
+    "activity_level": 50,
+}
+
+# Wellness score: a weighted blend of the past week's journal sentiment and
+# mood scores, reported as improving above the threshold
+WELLNESS_WINDOW_DAYS = 7
+WELLNESS_SENTIMENT_WEIGHT = 0.4
+WELLNESS_MOOD_WEIGHT = 0.6
+WELLNESS_IMPROVING_ABOVE = 60
+
+# Smallest activity effect worth mentioning in insights (mood is 0-1,
+# journal sentiment -1 to 1)
+CORRELATION_MIN_EFFECT = {"mood": 0.05, "sentiment": 0.1}
+
+ANOMALY_INSIGHTS = {
+    "hrv_drop": (
+        "Your HRV recently dropped well below your usual level, which can be "
+        "a sign of stress or poor recovery. Consider taking it easy today."
+    ),
+    "stress_spike": (
+        "Your wearable picked up a stress spike well above your usual level. "
+        "A short breathing exercise or meditation may help."
+    ),
+}
 
 
 class AIService:
+    """
+    NumPy and the sentiment model are loaded on first use rather than at
+    import, so API workers don't pay for them before serving; warm_up()
+    loads both in the background once the server is up.
+    """
+
     def __init__(self):
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self._sentiment_backend = None
+        self._backend_lock = threading.Lock()
+
+    @property
+    def sentiment_backend(self) -> SentimentBackend:
+        """The configured sentiment backend, created on first use"""
+        if self._sentiment_backend is None:
+            with self._backend_lock:
+                if self._sentiment_backend is None:
+                    self._sentiment_backend = make_backend()
+        return self._sentiment_backend
+
+    def warm_up(self):
+        """Load NumPy and the sentiment model ahead of the first request needing them"""
+        self.sentiment_backend.score_batch(["warm up"])
 
     def analyze_journal_sentiment(self, text: str) -> float:
         """
         Analyze sentiment of journal entry text
         Returns: float between -1.0 (negative) and 1.0 (positive)
         """
-        scores = self.sentiment_analyzer.polarity_scores(text)
-        # Use compound score which ranges from -1 to 1
-        return scores["compound"]
+        return self.analyze_journal_sentiment_batch([text])[0]
+
+    def analyze_journal_sentiment_batch(self, texts: List[str]) -> List[float]:
+        """
+        Sentiment scores for many journal texts, in input order. Cached
+        scores are reused and the rest go to the backend in one call.
+        """
+        backend = self.sentiment_backend
+        keys = [sentiment_cache.make_key(text, backend.version) for text in texts]
+        cached = sentiment_cache.get_many(keys)
+        scores = [cached.get(key) for key in keys]
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            computed = backend.score_batch([texts[i] for i in missing]).tolist()
+            for i, score in zip(missing, computed):
+                scores[i] = score
+            sentiment_cache.set_many((keys[i], scores[i]) for i in missing)
+        return scores
 
     def analyze_wearable_data(self, raw_data: Dict[str, Any]) -> float:
         """
@@ -56,6 +134,84 @@ class AIService:
             print(f"Error analyzing wearable data: {e}")
             return 0.5  # Default neutral mood
 
+    def analyze_wearable_batch(self, samples: List[Dict[str, Any]]) -> List[float]:
+        """
+        Mood scores for many wearable readings, in input order.
+        Gives exactly the same scores as analyze_wearable_data, including the
+        0.5 fallback for readings that are not dicts of numbers.
+        """
+        import numpy as np
+
+        samples = list(samples)
+        invalid = np.array([not isinstance(sample, dict) for sample in samples], dtype=bool)
+        if invalid.any():
+            samples = [sample if isinstance(sample, dict) else {} for sample in samples]
+
+        columns = []
+        for field, default in WEARABLE_DEFAULTS.items():
+            values = [sample.get(field, default) for sample in samples]
+            if set(map(type, values)) <= {int, float, bool}:
+                columns.append(np.array(values, dtype=np.float64))
+                continue
+            numeric = np.array([isinstance(v, numbers.Real) for v in values], dtype=bool)
+            invalid |= ~numeric
+            columns.append(
+                np.array(
+                    [float(v) if ok else np.nan for v, ok in zip(values, numeric)],
+                    dtype=np.float64,
+                )
+            )
+
+        scores = self.score_wearable_arrays(*columns)
+        if invalid.any():
+            print(f"Error analyzing wearable data: {int(invalid.sum())} invalid samples")
+            scores[invalid] = 0.5
+        return scores.tolist()
+
+    def score_wearable_arrays(
+        self,
+        heart_rate: "np.ndarray",
+        hrv: "np.ndarray",
+        stress_level: "np.ndarray",
+        sleep_quality: "np.ndarray",
+        activity_level: "np.ndarray",
+    ) -> "np.ndarray":
+        """
+        Vectorized analyze_wearable_data over metric columns.
+        fmax/fmin/minimum mirror how Python's max/min treat NaN arguments
+        in the scalar version, so the two agree value for value.
+        """
+        import numpy as np
+
+        heart_rate = np.asarray(heart_rate, dtype=np.float64)
+        hrv = np.asarray(hrv, dtype=np.float64)
+        stress_level = np.asarray(stress_level, dtype=np.float64)
+        sleep_quality = np.asarray(sleep_quality, dtype=np.float64)
+        activity_level = np.asarray(activity_level, dtype=np.float64)
+
+        heart_rate_norm = np.where(
+            (heart_rate >= 60) & (heart_rate <= 100),
+            1.0,
+            np.where(
+                heart_rate < 60,
+                np.fmax(0.0, 0.5 + (heart_rate - 40) / 40),
+                np.fmax(0.0, 1.0 - (heart_rate - 100) / 50),
+            ),
+        )
+        hrv_norm = np.fmin(1.0, hrv / 100)
+        stress_norm = (100 - stress_level) / 100
+        sleep_norm = sleep_quality / 100
+        activity_norm = np.minimum(activity_level / 100, 1.0)
+
+        mood_score = (
+            heart_rate_norm * 0.2
+            + hrv_norm * 0.3
+            + stress_norm * 0.25
+            + sleep_norm * 0.15
+            + activity_norm * 0.1
+        )
+        return np.fmax(0.0, np.fmin(1.0, mood_score))
+
     def _normalize_heart_rate(self, hr: float) -> float:
         """Normalize heart rate (60-100 is ideal range)"""
         if 60 <= hr <= 100:
@@ -70,9 +226,14 @@ class AIService:
         return min(1.0, hrv / 100)
 
     def get_sentiment_trends(
-        self, db: Session, user_id: int, days: int = 30
+        self, db: Session, user_id: int, days: int = 30, resolution: str = "raw"
     ) -> List[Dict[str, Any]]:
-        """Get sentiment trends for the last N days"""
+        """
+        Get sentiment trends for the last N days, per entry ("raw") or as
+        hourly/daily buckets; "auto" buckets only past MAX_TREND_POINTS.
+        Uses the scores stored by the sentiment pipeline, so entries it has
+        not scored yet are left out, as in the nightly wellness batch.
+        """
         cutoff_date = datetime.now() - timedelta(days=days)
 
         entries = (
@@ -80,6 +241,7 @@ class AIService:
             .filter(
                 JournalEntry.user_id == user_id,
                 JournalEntry.created_at >= cutoff_date,
+                JournalEntry.sentiment_score.isnot(None),
             )
             .order_by(JournalEntry.created_at)
             .all()
@@ -87,26 +249,50 @@ class AIService:
 
         trends = []
         for entry in entries:
-            # Calculate sentiment score on the fly since the field doesn't exist
-            sentiment_score = self.analyze_journal_sentiment(entry.entry_text)
             trends.append(
                 {
                     "date": entry.created_at.date().isoformat(),
-                    "sentiment_score": sentiment_score,
+                    "sentiment_score": entry.sentiment_score,
                     "entry_length": len(entry.entry_text),
                 }
             )
 
+        if resolution == "auto":
+            if len(trends) <= MAX_TREND_POINTS:
+                resolution = "raw"
+            else:
+                resolution = "hour" if days * 24 <= MAX_TREND_POINTS else "day"
+        if resolution != "raw":
+            return summarize(
+                (
+                    (entry.created_at, trend["sentiment_score"])
+                    for entry, trend in zip(entries, trends)
+                ),
+                resolution,
+                "sentiment_score",
+            )
+
         return trends
 
     def get_mood_trends(
-        self, db: Session, user_id: int, days: int = 30
+        self, db: Session, user_id: int, days: int = 30, resolution: str = "raw"
     ) -> List[Dict[str, Any]]:
-        """Get mood trends for the last N days"""
+        """
+        Get mood trends for the last N days, per reading ("raw") or from the
+        hourly/daily rollups; "auto" picks the finest level that stays
+        within MAX_TREND_POINTS.
+        """
         cutoff_date = datetime.now() - timedelta(days=days)
 
+        resolution = mood_rollups.pick_resolution(
+            db, user_id, cutoff_date, days, resolution
+        )
+        if resolution != "raw":
+            return mood_rollups.trend(db, user_id, cutoff_date, resolution)
+
+        # Manual mood logs and wearable samples, merged in time order
         mood_logs = (
-            db.query(MoodLog)
+            db.query(MoodLog.timestamp, MoodLog.calculated_mood_score)
             .filter(
                 MoodLog.user_id == user_id,
                 MoodLog.timestamp >= cutoff_date,
@@ -115,9 +301,19 @@ class AIService:
             .order_by(MoodLog.timestamp)
             .all()
         )
+        sensor_samples = (
+            db.query(SensorSample.timestamp, SensorSample.calculated_mood_score)
+            .filter(
+                SensorSample.user_id == user_id,
+                SensorSample.timestamp >= cutoff_date,
+                SensorSample.calculated_mood_score.isnot(None),
+            )
+            .order_by(SensorSample.timestamp)
+            .all()
+        )
 
         trends = []
-        for log in mood_logs:
+        for log in heapq.merge(mood_logs, sensor_samples, key=lambda row: row.timestamp):
             trends.append(
                 {
                     "date": log.timestamp.date().isoformat(),
@@ -130,6 +326,8 @@ class AIService:
 
     def generate_insights(self, db: Session, user_id: int) -> List[str]:
         """Generate AI insights based on user data"""
+        import numpy as np
+
         insights = []
 
         # Get recent sentiment and mood data
@@ -171,6 +369,28 @@ class AIService:
                     "in stress management."
                 )
 
+        # Sudden changes flagged against the user's own baseline at ingest
+        for kind in dict.fromkeys(flag.kind for flag in anomaly_detector.recent(db, user_id)):
+            insights.append(ANOMALY_INSIGHTS[kind])
+
+        # Activities that move this user's mood, precomputed by the
+        # correlation refresh rather than joined here
+        for result in activity_correlations.strongest(db, user_id):
+            if abs(result.effect) < CORRELATION_MIN_EFFECT[result.metric]:
+                continue
+            activity = result.activity_type.replace("_", " ")
+            metric = "mood" if result.metric == "mood" else "journal sentiment"
+            if result.lag_days == 0:
+                insights.append(
+                    f"{activity.capitalize()} days average {result.effect:+.2f} "
+                    f"{metric} compared with days without."
+                )
+            else:
+                insights.append(
+                    f"The day after a {activity}, your {metric} averages "
+                    f"{result.effect:+.2f} compared with other days."
+                )
+
         if not insights:
             insights.append(
                 "Keep logging your activities to get personalized insights!"
@@ -179,9 +399,22 @@ class AIService:
         return insights
 
     def calculate_wellness_score(self, db: Session, user_id: int) -> Dict[str, Any]:
-        """Calculate overall wellness score"""
-        sentiment_trends = self.get_sentiment_trends(db, user_id, 7)
-        mood_trends = self.get_mood_trends(db, user_id, 7)
+        """Overall wellness score, served from the per-user cache when fresh"""
+        return wellness_cache.get_or_compute(
+            db, user_id, lambda: self._compute_and_store_wellness_score(db, user_id)
+        )
+
+    def _compute_and_store_wellness_score(self, db: Session, user_id: int) -> Dict[str, Any]:
+        score = self._compute_wellness_score(db, user_id)
+        # Keeps the user's wellness percentile current between nightly runs
+        population_sketch.record_wellness_score(user_id, score)
+        return score
+
+    def _compute_wellness_score(self, db: Session, user_id: int) -> Dict[str, Any]:
+        import numpy as np
+
+        sentiment_trends = self.get_sentiment_trends(db, user_id, WELLNESS_WINDOW_DAYS)
+        mood_trends = self.get_mood_trends(db, user_id, WELLNESS_WINDOW_DAYS)
 
         sentiment_score = 0.5  # Default neutral
         mood_score = 0.5
@@ -193,13 +426,15 @@ class AIService:
         if mood_trends:
             mood_score = np.mean([t["mood_score"] for t in mood_trends])
 
-        overall_score = (sentiment_score * 0.4 + mood_score * 0.6) * 100
+        overall_score = (
+            sentiment_score * WELLNESS_SENTIMENT_WEIGHT + mood_score * WELLNESS_MOOD_WEIGHT
+        ) * 100
 
         return {
             "overall_score": round(overall_score, 1),
             "sentiment_component": round(sentiment_score * 100, 1),
             "mood_component": round(mood_score * 100, 1),
-            "trend": "improving" if overall_score > 60 else "needs_attention",
+            "trend": "improving" if overall_score > WELLNESS_IMPROVING_ABOVE else "needs_attention",
         }
 
 
@@ -0,0 +1,178 @@
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import SensorBaseline, WearableAnomaly
+
+# Metric -> (flag kind, direction, smallest spread). Direction -1 flags
+# drops and 1 spikes; z-scores use at least the given standard deviation so
+# that a tiny wobble around a very steady baseline isn't flagged.
+ANOMALY_RULES = {
+    "hrv": ("hrv_drop", -1, 2.0),
+    "stress_level": ("stress_spike", 1, 3.0),
+}
+
+# Rows per insert statement (keeps SQLite under its bound-parameter limit)
+UPSERT_CHUNK_SIZE = 500
+
+# A reading: (user_id, timestamp, {metric: value or None})
+Reading = Tuple[int, datetime, Dict[str, Optional[float]]]
+
+
+def update_baseline(
+    count: int, mean: float, variance: float, value: float, window: int
+) -> Tuple[int, float, float]:
+    """
+    Welford's update of a running mean and (population) variance. The
+    divisor stops growing at window, which turns it into an exponentially
+    weighted baseline that keeps following the user.
+    """
+    count += 1
+    n = min(count, window)
+    delta = value - mean
+    mean += delta / n
+    variance += (delta * (value - mean) - variance) / n
+    return count, mean, variance
+
+
+class AnomalyDetector:
+    """
+    Flags sudden HRV drops and stress spikes in wearable readings.
+
+    Each user keeps a rolling mean and variance per metric in
+    sensor_baselines, a couple of rows per user. Ingest passes every stored
+    batch through observe(), which checks each reading against the baseline
+    before folding it in: constant work per reading and no history scans.
+    Flags land in wearable_anomalies, at most one per metric per cooldown,
+    for insights and urgent recommendations to read.
+    """
+
+    def __init__(
+        self,
+        threshold: float = settings.anomaly_zscore_threshold,
+        min_samples: int = settings.anomaly_min_samples,
+        window: int = settings.anomaly_baseline_window,
+        cooldown_minutes: int = settings.anomaly_cooldown_minutes,
+    ):
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.window = window
+        self.cooldown = timedelta(minutes=cooldown_minutes)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.readings_observed = 0
+        self.flags_raised = 0
+
+    def observe(self, db: Session, readings: Iterable[Reading]) -> int:
+        """Check readings against and fold them into baselines; the caller commits"""
+        by_metric: Dict[Tuple[int, str], List[Tuple[datetime, float]]] = defaultdict(list)
+        for user_id, timestamp, metrics in readings:
+            for metric in ANOMALY_RULES:
+                value = metrics.get(metric)
+                if value is not None and value == value:
+                    by_metric[(user_id, metric)].append((timestamp, value))
+        if not by_metric:
+            return 0
+
+        self._ensure_baselines(db, sorted(by_metric))
+        # Every row exists now, so the lock (on PostgreSQL) keeps concurrent
+        # batches for a user from losing updates
+        baselines = {
+            (baseline.user_id, baseline.metric): baseline
+            for baseline in db.query(SensorBaseline)
+            .filter(
+                SensorBaseline.user_id.in_(sorted({user_id for user_id, _ in by_metric})),
+                SensorBaseline.metric.in_(list(ANOMALY_RULES)),
+            )
+            .order_by(SensorBaseline.user_id, SensorBaseline.metric)
+            .with_for_update()
+        }
+
+        flags: List[Dict[str, Any]] = []
+        observed = 0
+        for (user_id, metric), values in sorted(by_metric.items()):
+            kind, direction, min_std = ANOMALY_RULES[metric]
+            values.sort(key=lambda reading: reading[0])
+            baseline = baselines[(user_id, metric)]
+
+            count, mean, variance = baseline.count, baseline.mean, baseline.variance
+            last_flagged_at = baseline.last_flagged_at
+            for timestamp, value in values:
+                if count >= self.min_samples:
+                    zscore = (value - mean) / max(math.sqrt(variance), min_std)
+                    if direction * zscore >= self.threshold and (
+                        last_flagged_at is None or timestamp - last_flagged_at >= self.cooldown
+                    ):
+                        flags.append(
+                            {
+                                "user_id": user_id,
+                                "metric": metric,
+                                "kind": kind,
+                                "timestamp": timestamp,
+                                "value": value,
+                                "baseline_mean": mean,
+                                "zscore": zscore,
+                            }
+                        )
+                        last_flagged_at = timestamp
+                count, mean, variance = update_baseline(
+                    count, mean, variance, value, self.window
+                )
+
+            baseline.count, baseline.mean, baseline.variance = count, mean, variance
+            baseline.last_flagged_at = last_flagged_at
+            observed += len(values)
+
+        if flags:
+            db.execute(insert(WearableAnomaly), flags)
+
+        with self._lock:
+            self.readings_observed += observed
+            self.flags_raised += len(flags)
+        return len(flags)
+
+    def _ensure_baselines(self, db: Session, keys: List[Tuple[int, str]]):
+        """Create empty baselines for (user_id, metric) pairs that have none"""
+        rows = [
+            {"user_id": user_id, "metric": metric, "count": 0, "mean": 0.0, "variance": 0.0}
+            for user_id, metric in keys
+        ]
+        if db.get_bind().dialect.name == "postgresql":
+            dialect_insert = postgresql_insert
+        else:
+            dialect_insert = sqlite_insert
+        for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            statement = dialect_insert(SensorBaseline).values(rows[offset : offset + UPSERT_CHUNK_SIZE])
+            db.execute(statement.on_conflict_do_nothing(index_elements=["user_id", "metric"]))
+
+    def recent(self, db: Session, user_id: int, hours: int = 72) -> List[WearableAnomaly]:
+        """A user's flags from the last few hours, newest first"""
+        return (
+            db.query(WearableAnomaly)
+            .filter(
+                WearableAnomaly.user_id == user_id,
+                WearableAnomaly.timestamp >= datetime.now() - timedelta(hours=hours),
+            )
+            .order_by(WearableAnomaly.timestamp.desc())
+            .all()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the admin metrics endpoint"""
+        return {
+            "readings_observed": self.readings_observed,
+            "flags_raised": self.flags_raised,
+        }
+
+
+# Global instance
+anomaly_detector = AnomalyDetector()
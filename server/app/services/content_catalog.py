@@ -0,0 +1,224 @@
+import heapq
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import (CategoryEnum, Content, ContentCatalogVersion,
+                           ContentTypeEnum)
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """A content row as held in the catalog; reads like a Content model"""
+
+    id: int
+    title: str
+    description: Optional[str]
+    content_type: ContentTypeEnum
+    category: CategoryEnum
+    url: str
+    thumbnail_url: Optional[str]
+    created_at: Optional[datetime]
+
+
+class CatalogSnapshot:
+    """
+    Every content item at one catalog version, grouped by (category,
+    content_type) in id order. Never modified once built.
+    """
+
+    def __init__(self, version: int, items: Iterable[CatalogItem]):
+        self.version = version
+        self.items = tuple(sorted(items, key=attrgetter("id")))
+        self.by_id: Dict[int, CatalogItem] = {item.id: item for item in self.items}
+
+        groups: Dict[Tuple[CategoryEnum, ContentTypeEnum], List[CatalogItem]] = {}
+        for item in self.items:
+            groups.setdefault((item.category, item.content_type), []).append(item)
+        self.groups: Dict[Tuple[CategoryEnum, ContentTypeEnum], Tuple[CatalogItem, ...]] = {
+            key: tuple(group) for key, group in groups.items()
+        }
+
+    def get(self, content_id: int) -> Optional[CatalogItem]:
+        return self.by_id.get(content_id)
+
+    def select(
+        self,
+        categories: Optional[Iterable[CategoryEnum]] = None,
+        content_types: Optional[Iterable[ContentTypeEnum]] = None,
+        exclude_ids: Iterable[int] = (),
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[CatalogItem]:
+        """Items in any of the categories and content types (None: all), in id order"""
+        if categories is None and content_types is None:
+            candidates: Iterable[CatalogItem] = self.items
+        else:
+            categories = set(categories) if categories is not None else None
+            content_types = set(content_types) if content_types is not None else None
+            groups = [
+                group
+                for (category, content_type), group in self.groups.items()
+                if (categories is None or category in categories)
+                and (content_types is None or content_type in content_types)
+            ]
+            candidates = groups[0] if len(groups) == 1 else heapq.merge(*groups, key=attrgetter("id"))
+
+        exclude_ids = set(exclude_ids)
+        if exclude_ids:
+            candidates = (item for item in candidates if item.id not in exclude_ids)
+        stop = offset + limit if limit is not None else None
+        return list(islice(candidates, offset, stop))
+
+
+class ContentCatalog:
+    """
+    In-process copy of the content table for candidate generation.
+
+    Content is small and rarely written, so each worker keeps an immutable
+    snapshot and swaps in a new one when content changes, rather than
+    querying per category on every request. Writers bump the version row
+    in content_catalog_version in the same transaction as their change and
+    reload right after committing; other workers notice the new version
+    within CONTENT_CATALOG_POLL_SECONDS.
+    """
+
+    def __init__(self, poll_seconds: int = settings.content_catalog_poll_seconds):
+        self.poll_seconds = poll_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Metrics
+        self.reloads = 0
+        self.failed_polls = 0
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """The current snapshot, loaded on first use outside the API"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            db = SessionLocal()
+            try:
+                snapshot = self.reload(db)
+            finally:
+                db.close()
+        return snapshot
+
+    def reload(self, db: Session) -> CatalogSnapshot:
+        """Build a snapshot of the content table and swap it in"""
+        with self._lock:
+            # The version is read first: a change committed in between only
+            # makes the snapshot newer than its version, and the next poll reloads
+            version = self._read_version(db)
+            snapshot = CatalogSnapshot(
+                version,
+                (
+                    CatalogItem(
+                        id=content.id,
+                        title=content.title,
+                        description=content.description,
+                        content_type=content.content_type,
+                        category=content.category,
+                        url=content.url,
+                        thumbnail_url=content.thumbnail_url,
+                        created_at=content.created_at,
+                    )
+                    for content in db.query(Content)
+                ),
+            )
+            self._snapshot = snapshot
+            self.reloads += 1
+        return snapshot
+
+    def exists(self, db: Session, content_id: int) -> bool:
+        """
+        Whether content exists, checking the table when the snapshot misses:
+        another worker may have created it since this one last reloaded
+        """
+        if self.snapshot.get(content_id) is not None:
+            return True
+        if db.get(Content, content_id) is None:
+            return False
+        self.reload(db)
+        return True
+
+    def _read_version(self, db: Session) -> int:
+        return (
+            db.query(ContentCatalogVersion.version)
+            .filter(ContentCatalogVersion.id == 1)
+            .scalar()
+        ) or 0
+
+    def bump(self, db: Session):
+        """Mark the catalog changed; call in the transaction that changes content"""
+        if db.get_bind().dialect.name == "postgresql":
+            statement = postgresql_insert(ContentCatalogVersion).values(id=1, version=1)
+        else:
+            statement = sqlite_insert(ContentCatalogVersion).values(id=1, version=1)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["id"],
+                set_={"version": ContentCatalogVersion.version + 1},
+            )
+        )
+
+    def start(self):
+        """Load the catalog and start watching for changes from other workers"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="content-catalog", daemon=True
+            )
+        self._poll_with_session()
+        self._thread.start()
+
+    def stop(self):
+        """Stop the polling thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            self._poll_with_session()
+
+    def _poll_with_session(self):
+        db = SessionLocal()
+        try:
+            snapshot = self._snapshot
+            if snapshot is None or self._read_version(db) != snapshot.version:
+                self.reload(db)
+        except Exception as e:
+            self.failed_polls += 1
+            print(f"Error reloading content catalog: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the admin metrics endpoint"""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "items": len(snapshot.items) if snapshot else 0,
+            "reloads": self.reloads,
+            "failed_polls": self.failed_polls,
+        }
+
+
+# Global instance
+content_catalog = ContentCatalog()
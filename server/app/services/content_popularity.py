@@ -0,0 +1,194 @@
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import ActivityLog, ContentPopularity
+
+# Scores are stored as log2 of the decayed count as seen from this instant
+POPULARITY_EPOCH = datetime(2024, 1, 1)
+
+# Rows per insert or upsert statement
+INSERT_CHUNK_SIZE = 500
+
+LN_2 = math.log(2.0)
+
+# A rebuild reads this many half-lives further back than a lone completion
+# stays above min_score, as many old completions can add up to more
+REBUILD_MARGIN_HALF_LIVES = 10
+
+
+def log2_add(a: float, b: float) -> float:
+    """log2(2**a + 2**b) without overflowing"""
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1.0 + 2.0 ** (low - high))
+
+
+class ContentPopularityService:
+    """
+    Time-decayed completion counts behind "popular" recommendations.
+
+    Every completion is worth 1 when logged and half as much after each
+    half-life. Rather than decaying every row as time passes, a completion
+    at time t adds 2 ** ((t - POPULARITY_EPOCH) / half_life) to its content's
+    count and rows keep log2 of that sum: the same offset turns it into
+    today's decayed count for every row, so ranking is an index scan on
+    content_popularity.log_score. Writers fold completions in as they are
+    logged; a nightly rebuild recounts from activity_logs to pick up bulk
+    loads and drop content that has faded out.
+    """
+
+    def __init__(
+        self,
+        half_life_days: float = settings.content_popularity_half_life_days,
+        min_score: float = settings.content_popularity_min_score,
+    ):
+        self.half_life_days = half_life_days
+        self.min_score = min_score
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.completions_recorded = 0
+
+    def _exponent(self, timestamp: datetime) -> float:
+        return (timestamp - POPULARITY_EPOCH).total_seconds() / (self.half_life_days * 86400)
+
+    def decayed_count(self, log_score: float, now: Optional[datetime] = None) -> float:
+        """A stored log_score as a decayed completion count at now"""
+        return 2.0 ** (log_score - self._exponent(now or datetime.now()))
+
+    def _min_log_score(self, now: datetime) -> float:
+        return self._exponent(now) + math.log2(self.min_score)
+
+    def _fold(
+        self, scores: Dict[int, Tuple[float, datetime]], content_id: int, completed_at: datetime
+    ):
+        """Add one completion to a {content_id: (log_score, last_completed_at)} dict"""
+        exponent = self._exponent(completed_at)
+        previous = scores.get(content_id)
+        if previous is None:
+            scores[content_id] = (exponent, completed_at)
+        else:
+            scores[content_id] = (
+                log2_add(previous[0], exponent),
+                max(previous[1], completed_at),
+            )
+
+    def record(self, db: Session, completions: Iterable[Tuple[int, datetime]]):
+        """Fold (content_id, completed_at) completions into the counts; the caller commits"""
+        batch: Dict[int, Tuple[float, datetime]] = {}
+        recorded = 0
+        for content_id, completed_at in completions:
+            self._fold(batch, content_id, completed_at or datetime.now())
+            recorded += 1
+        if not batch:
+            return
+
+        rows = [
+            {"content_id": content_id, "log_score": log_score, "last_completed_at": last_completed_at}
+            for content_id, (log_score, last_completed_at) in sorted(batch.items())
+        ]
+        for offset in range(0, len(rows), INSERT_CHUNK_SIZE):
+            self._upsert(db, rows[offset : offset + INSERT_CHUNK_SIZE])
+
+        with self._lock:
+            self.completions_recorded += recorded
+
+    def _upsert(self, db: Session, rows: List[Dict[str, Any]]):
+        """
+        Insert rows, or log2_add them into existing ones in the same
+        statement, so concurrent writers never lose a completion
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            statement = postgresql_insert(ContentPopularity).values(rows)
+            least, greatest = func.least, func.greatest
+        else:
+            # SQLite's two-argument min()/max() are scalar functions; ln()
+            # and exp() are its built-in math functions (3.35+)
+            statement = sqlite_insert(ContentPopularity).values(rows)
+            least, greatest = func.min, func.max
+
+        current, added = ContentPopularity.log_score, statement.excluded.log_score
+        high, low = greatest(current, added), least(current, added)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["content_id"],
+                set_={
+                    # log2_add() in SQL: high + log2(1 + 2 ** (low - high))
+                    "log_score": high + func.ln(1.0 + func.exp((low - high) * LN_2)) / LN_2,
+                    "last_completed_at": greatest(
+                        ContentPopularity.last_completed_at,
+                        statement.excluded.last_completed_at,
+                    ),
+                },
+            )
+        )
+
+    def top(
+        self, db: Session, exclude_ids: List[int], limit: int = 3, now: Optional[datetime] = None
+    ) -> List[int]:
+        """Ids of the most popular content right now, skipping exclude_ids"""
+        rows = (
+            db.query(ContentPopularity.content_id)
+            .filter(
+                ContentPopularity.log_score >= self._min_log_score(now or datetime.now()),
+                ~ContentPopularity.content_id.in_(exclude_ids),
+            )
+            .order_by(ContentPopularity.log_score.desc())
+            .limit(limit)
+            .all()
+        )
+        return [row.content_id for row in rows]
+
+    def rebuild(self, db: Session, now: Optional[datetime] = None, batch_size: int = 10000) -> int:
+        """
+        Recount every content item from activity_logs, leaving out content
+        whose count has faded below min_score. Returns the rows stored.
+        """
+        now = now or datetime.now()
+        horizon = self._min_log_score(now)
+        since = now - timedelta(
+            days=self.half_life_days * (REBUILD_MARGIN_HALF_LIVES - math.log2(self.min_score))
+        )
+
+        scores: Dict[int, Tuple[float, datetime]] = {}
+        last_id = 0
+        while True:
+            logs = (
+                db.query(ActivityLog.id, ActivityLog.content_id, ActivityLog.completed_at)
+                .filter(ActivityLog.id > last_id, ActivityLog.completed_at >= since)
+                .order_by(ActivityLog.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not logs:
+                break
+            for log in logs:
+                self._fold(scores, log.content_id, log.completed_at)
+            last_id = logs[-1].id
+
+        rows = [
+            {"content_id": content_id, "log_score": log_score, "last_completed_at": last_completed_at}
+            for content_id, (log_score, last_completed_at) in scores.items()
+            if log_score >= horizon
+        ]
+        # One transaction, so readers see either the old or the new counts
+        db.query(ContentPopularity).delete(synchronize_session=False)
+        for offset in range(0, len(rows), INSERT_CHUNK_SIZE):
+            db.execute(insert(ContentPopularity), rows[offset : offset + INSERT_CHUNK_SIZE])
+        db.commit()
+        return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the admin metrics endpoint"""
+        return {"completions_recorded": self.completions_recorded}
+
+
+# Global instance
+content_popularity = ContentPopularityService()
@@ -0,0 +1,263 @@
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.content_catalog import (CatalogItem, CatalogSnapshot,
+                                          content_catalog)
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+# Neighbors kept per content item
+SIMILAR_NEIGHBORS = 20
+
+# Weaker matches than this (cosine of TF-IDF vectors) aren't "similar"
+MIN_SIMILARITY = 0.05
+
+# Refit the vocabulary once this share of the catalog has changed since the
+# last fit; until then changed items are transformed with the old one
+REFIT_FRACTION = 0.1
+
+# Rows per block when multiplying the whole catalog by itself
+SIMILARITY_BLOCK_SIZE = 1000
+
+Neighbors = List[Tuple[int, float]]
+
+
+def content_text(item: CatalogItem) -> str:
+    return f"{item.title}\n{item.description or ''}"
+
+
+def _top_neighbors(
+    similarities: "csr_matrix", row_ids: List[int], column_ids: List[int]
+) -> Dict[int, Neighbors]:
+    """Best (content_id, score) pairs per row of a similarity block, self excluded"""
+    import numpy as np
+
+    column_ids = np.asarray(column_ids)
+    top: Dict[int, Neighbors] = {}
+    for row, row_id in enumerate(row_ids):
+        start, end = similarities.indptr[row], similarities.indptr[row + 1]
+        scores = similarities.data[start:end]
+        candidates = column_ids[similarities.indices[start:end]]
+        neighbors: Neighbors = []
+        # Best first; ties go to the lower content id
+        for index in np.lexsort((candidates, -scores)).tolist():
+            score = float(scores[index])
+            if score < MIN_SIMILARITY or len(neighbors) == SIMILAR_NEIGHBORS:
+                break
+            if candidates[index] != row_id:
+                neighbors.append((int(candidates[index]), score))
+        top[row_id] = neighbors
+    return top
+
+
+class ContentSimilarityService:
+    """
+    "More like this" from TF-IDF vectors of content titles and descriptions.
+
+    The index follows the content catalog: when a new snapshot appears
+    (after admin edits here or in another worker), items whose text changed
+    are re-vectorized and only their neighbor lists, and the lists they
+    appear in, are recomputed; the rest of the table is kept. Neighbors are
+    precomputed, so serving is a dictionary lookup. Requests never build:
+    they serve the last table (empty until the startup warm-up thread's
+    first build) and, when the catalog has moved on, start a background
+    refresh, since importing scikit-learn and refitting would stall the
+    event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._vectorizer = None
+        self._ids: List[int] = []
+        self._matrix: Optional["csr_matrix"] = None
+        self._texts: Dict[int, str] = {}
+        self._neighbors: Dict[int, Neighbors] = {}
+        self._changed_since_fit = 0
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_lock = threading.Lock()
+
+        # Metrics
+        self.full_builds = 0
+        self.incremental_updates = 0
+        self.failed_refreshes = 0
+
+    def refresh(self) -> Dict[int, Neighbors]:
+        """Bring the neighbor table up to the current catalog snapshot"""
+        snapshot = content_catalog.snapshot
+        if snapshot is self._snapshot:
+            return self._neighbors
+
+        with self._lock:
+            if snapshot is not self._snapshot:
+                texts = {item.id: content_text(item) for item in snapshot.items}
+                changed = [
+                    content_id
+                    for content_id, text in texts.items()
+                    if self._texts.get(content_id) != text
+                ]
+                removed = set(self._texts) - set(texts)
+                if changed or removed:
+                    if self._vectorizer is None or (
+                        self._changed_since_fit + len(changed) + len(removed)
+                        > REFIT_FRACTION * len(texts)
+                    ):
+                        self._build(texts)
+                    else:
+                        self._update(texts, changed, removed)
+                self._snapshot = snapshot
+        return self._neighbors
+
+    def refresh_in_background(self):
+        """Start a refresh thread unless one is already running"""
+        with self._refresher_lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh_until_current, name="content-similarity", daemon=True
+            )
+            self._refresher.start()
+
+    def _refresh_until_current(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                self.failed_refreshes += 1
+                print(f"Error refreshing content similarity: {e}")
+                with self._refresher_lock:
+                    self._refresher = None
+                return
+            with self._refresher_lock:
+                # Catch catalog changes that landed during the refresh
+                if content_catalog.snapshot is self._snapshot:
+                    self._refresher = None
+                    return
+
+    def _build(self, texts: Dict[int, str]):
+        """Fit the vocabulary on the whole catalog and recompute every neighbor list"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        ids = list(texts)
+        vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True)
+        try:
+            matrix = vectorizer.fit_transform([texts[content_id] for content_id in ids])
+        except ValueError:
+            # No items, or no words left after stop words
+            vectorizer, matrix = None, None
+
+        neighbors: Dict[int, Neighbors] = {content_id: [] for content_id in ids}
+        if matrix is not None:
+            for start in range(0, len(ids), SIMILARITY_BLOCK_SIZE):
+                block = matrix[start : start + SIMILARITY_BLOCK_SIZE]
+                neighbors.update(
+                    _top_neighbors(
+                        (block @ matrix.T).tocsr(),
+                        ids[start : start + SIMILARITY_BLOCK_SIZE],
+                        ids,
+                    )
+                )
+
+        self._vectorizer, self._matrix, self._ids = vectorizer, matrix, ids
+        self._texts = texts
+        self._neighbors = neighbors
+        self._changed_since_fit = 0
+        self.full_builds += 1
+
+    def _update(self, texts: Dict[int, str], changed: List[int], removed: Iterable[int]):
+        """Re-vectorize changed items with the fitted vocabulary and patch the table"""
+        from scipy import sparse
+
+        stale = set(changed) | set(removed)
+        keep_rows = [row for row, content_id in enumerate(self._ids) if content_id not in stale]
+        ids = [self._ids[row] for row in keep_rows] + changed
+        if changed:
+            changed_rows = self._vectorizer.transform([texts[content_id] for content_id in changed])
+        else:
+            changed_rows = sparse.csr_matrix((0, self._matrix.shape[1]))
+        matrix = sparse.vstack([self._matrix[keep_rows], changed_rows]).tocsr()
+
+        neighbors = {
+            content_id: self._neighbors[content_id]
+            for content_id in ids
+            if content_id in self._neighbors and content_id not in stale
+        }
+        # Changed items get fresh lists; lists that held a changed or removed
+        # item are recomputed, since dropping it may let another one in
+        affected = [
+            content_id
+            for content_id, items in neighbors.items()
+            if any(neighbor_id in stale for neighbor_id, _ in items)
+        ]
+        row_of = {content_id: row for row, content_id in enumerate(ids)}
+        recompute = changed + affected
+        neighbors.update(
+            _top_neighbors(
+                (matrix[[row_of[content_id] for content_id in recompute]] @ matrix.T).tocsr(),
+                recompute,
+                ids,
+            )
+        )
+
+        # Everyone else only needs the changed items merged in
+        changed_scores = (matrix @ changed_rows.T).tocsr()
+        done = set(recompute)
+        for row, content_id in enumerate(ids):
+            if content_id in done:
+                continue
+            start, end = changed_scores.indptr[row], changed_scores.indptr[row + 1]
+            candidates = [
+                (changed[column], float(score))
+                for column, score in zip(
+                    changed_scores.indices[start:end].tolist(),
+                    changed_scores.data[start:end].tolist(),
+                )
+                if score >= MIN_SIMILARITY
+            ]
+            if candidates:
+                merged = sorted(
+                    neighbors[content_id] + candidates, key=lambda pair: (-pair[1], pair[0])
+                )
+                neighbors[content_id] = merged[:SIMILAR_NEIGHBORS]
+
+        self._matrix, self._ids = matrix, ids
+        self._texts = texts
+        self._neighbors = neighbors
+        self._changed_since_fit += len(stale)
+        self.incremental_updates += 1
+
+    def similar(
+        self, content_id: int, limit: int = 5, exclude_ids: Iterable[int] = ()
+    ) -> List[CatalogItem]:
+        """Content most like content_id, best first, from the last built table"""
+        snapshot = content_catalog.snapshot
+        if snapshot is not self._snapshot:
+            self.refresh_in_background()
+        neighbors = self._neighbors.get(content_id, [])
+        excluded = set(exclude_ids)
+        similar = []
+        for neighbor_id, _ in neighbors:
+            item = snapshot.get(neighbor_id)
+            if item is None or neighbor_id in excluded:
+                continue
+            similar.append(item)
+            if len(similar) == limit:
+                break
+        return similar
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the admin metrics endpoint"""
+        snapshot = self._snapshot
+        return {
+            "catalog_version": snapshot.version if snapshot else None,
+            "items": len(self._ids),
+            "vocabulary": len(self._vectorizer.vocabulary_) if self._vectorizer else 0,
+            "full_builds": self.full_builds,
+            "incremental_updates": self.incremental_updates,
+            "failed_refreshes": self.failed_refreshes,
+        }
+
+
+# Global instance
+content_similarity = ContentSimilarityService()
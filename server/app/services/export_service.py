@@ -0,0 +1,232 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Query, Session
+
+from app.core.pagination import encode_cursor
+from app.db.database import SessionLocal
+from app.db.models import (ActivityLog, CardReview, JournalEntry, MoodLog,
+                           ReviewSession, SensorSample)
+
+CSV_COLUMNS = [
+    "record_type",
+    "cursor",
+    "id",
+    "timestamp",
+    "entry_text",
+    "sentiment_score",
+    "raw_sensor_data",
+    "calculated_mood_score",
+    "heart_rate",
+    "hrv",
+    "stress_level",
+    "sleep_quality",
+    "activity_level",
+    "content_id",
+    "session_id",
+    "card_id",
+    "response",
+    "response_time_seconds",
+    "was_correct",
+    "confidence_level",
+]
+
+
+def _journal_entries(db: Session, user_id: int) -> Query:
+    return db.query(JournalEntry).filter(JournalEntry.user_id == user_id)
+
+
+def _mood_logs(db: Session, user_id: int) -> Query:
+    return db.query(MoodLog).filter(MoodLog.user_id == user_id)
+
+
+def _sensor_samples(db: Session, user_id: int) -> Query:
+    return db.query(SensorSample).filter(SensorSample.user_id == user_id)
+
+
+def _activity_logs(db: Session, user_id: int) -> Query:
+    return db.query(ActivityLog).filter(ActivityLog.user_id == user_id)
+
+
+def _card_reviews(db: Session, user_id: int) -> Query:
+    return (
+        db.query(CardReview)
+        .join(ReviewSession, CardReview.session_id == ReviewSession.id)
+        .filter(ReviewSession.user_id == user_id)
+    )
+
+
+def _journal_entry_record(entry: JournalEntry) -> Dict[str, Any]:
+    return {
+        "id": entry.id,
+        "timestamp": entry.created_at,
+        "entry_text": entry.entry_text,
+        "sentiment_score": entry.sentiment_score,
+    }
+
+
+def _mood_log_record(log: MoodLog) -> Dict[str, Any]:
+    return {
+        "id": log.id,
+        "timestamp": log.timestamp,
+        "raw_sensor_data": log.raw_sensor_data,
+        "calculated_mood_score": log.calculated_mood_score,
+    }
+
+
+def _sensor_sample_record(sample: SensorSample) -> Dict[str, Any]:
+    return {
+        "id": sample.id,
+        "timestamp": sample.timestamp,
+        "heart_rate": sample.heart_rate,
+        "hrv": sample.hrv,
+        "stress_level": sample.stress_level,
+        "sleep_quality": sample.sleep_quality,
+        "activity_level": sample.activity_level,
+        "calculated_mood_score": sample.calculated_mood_score,
+    }
+
+
+def _activity_log_record(log: ActivityLog) -> Dict[str, Any]:
+    return {
+        "id": log.id,
+        "timestamp": log.completed_at,
+        "content_id": log.content_id,
+    }
+
+
+def _card_review_record(review: CardReview) -> Dict[str, Any]:
+    return {
+        "id": review.id,
+        "timestamp": review.created_at,
+        "session_id": review.session_id,
+        "card_id": review.card_id,
+        "response": review.response.value,
+        "response_time_seconds": review.response_time_seconds,
+        "was_correct": review.was_correct,
+        "confidence_level": review.confidence_level,
+    }
+
+
+# (record type, model, query builder, serializer) in export order
+EXPORT_SECTIONS: List[Tuple[str, Any, Callable, Callable]] = [
+    ("journal_entry", JournalEntry, _journal_entries, _journal_entry_record),
+    ("mood_log", MoodLog, _mood_logs, _mood_log_record),
+    ("sensor_sample", SensorSample, _sensor_samples, _sensor_sample_record),
+    ("activity_log", ActivityLog, _activity_logs, _activity_log_record),
+    ("card_review", CardReview, _card_reviews, _card_review_record),
+]
+EXPORT_RECORD_TYPES = [section[0] for section in EXPORT_SECTIONS]
+
+
+class ExportService:
+    """
+    Streams a user's full history as NDJSON or CSV.
+
+    Rows are read through server-side cursors (yield_per) in primary-key
+    order and written out in fixed-size chunks, optionally gzip-compressed
+    on the fly, so memory stays flat regardless of history size. Every
+    record carries a cursor that can be passed back to resume after it.
+    """
+
+    def __init__(self, batch_size: int = 1000, chunk_size: int = 64 * 1024):
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+
+    def records(
+        self, db: Session, user_id: int, after: Optional[List[Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every exportable record, resuming after (record type, id)"""
+        start_section, after_id = 0, 0
+        if after:
+            start_section = EXPORT_RECORD_TYPES.index(after[0])
+            after_id = after[1]
+
+        for position, (record_type, model, build_query, serialize) in enumerate(
+            EXPORT_SECTIONS
+        ):
+            if position < start_section:
+                continue
+
+            query = build_query(db, user_id)
+            if position == start_section and after_id:
+                query = query.filter(model.id > after_id)
+
+            for row in query.order_by(model.id).yield_per(self.batch_size):
+                record = serialize(row)
+                record["record_type"] = record_type
+                record["cursor"] = encode_cursor([record_type, row.id])
+                # Keep the identity map from growing with the history
+                db.expunge(row)
+                yield record
+
+    def stream(
+        self,
+        user_id: int,
+        export_format: str = "ndjson",
+        compress: bool = False,
+        after: Optional[List[Any]] = None,
+    ) -> Iterator[bytes]:
+        """Yield encoded (and optionally gzipped) export chunks"""
+        # The request-scoped session may be closed before the body is sent
+        db = SessionLocal()
+        try:
+            encoder = self._encode_csv if export_format == "csv" else self._encode_ndjson
+            compressor = zlib.compressobj(wbits=31) if compress else None
+
+            buffer = io.BytesIO()
+            for chunk in encoder(self.records(db, user_id, after)):
+                buffer.write(chunk)
+                if buffer.tell() >= self.chunk_size:
+                    data = buffer.getvalue()
+                    buffer = io.BytesIO()
+                    data = compressor.compress(data) if compressor else data
+                    if data:
+                        yield data
+
+            data = buffer.getvalue()
+            if compressor:
+                data = compressor.compress(data) + compressor.flush()
+            if data:
+                yield data
+        finally:
+            db.close()
+
+    @staticmethod
+    def _json_default(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+    def _encode_ndjson(self, records: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+        for record in records:
+            yield (
+                json.dumps(record, default=self._json_default, separators=(",", ":"))
+                + "\n"
+            ).encode()
+
+    def _encode_csv(self, records: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+        line = io.StringIO()
+        writer = csv.DictWriter(line, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        yield line.getvalue().encode()
+        line.seek(0)
+        line.truncate()
+
+        for record in records:
+            if isinstance(record.get("timestamp"), datetime):
+                record["timestamp"] = record["timestamp"].isoformat()
+            if "raw_sensor_data" in record:
+                record["raw_sensor_data"] = json.dumps(record["raw_sensor_data"])
+            writer.writerow(record)
+            yield line.getvalue().encode()
+            line.seek(0)
+            line.truncate()
+
+
+# Global instance
+export_service = ExportService()
@@ -0,0 +1,509 @@
+import asyncio
+import json
+import os
+import struct
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import ActivityLog, IngestSpoolCheckpoint, SensorSample
+from app.services.activity_correlations import activity_correlations
+from app.services.anomaly_detector import anomaly_detector
+from app.services.content_popularity import content_popularity
+from app.services.mood_rollups import mood_rollups
+from app.services.sensor_service import SENSOR_FIELDS
+from app.services.wellness_cache import wellness_cache
+
+# Each record is its JSON payload's length and CRC32 (little-endian uint32)
+# followed by the payload. A record torn by a crash mid-write fails the
+# check and ends the segment; it was never acknowledged.
+RECORD_HEADER = struct.Struct("<II")
+
+# Segment files are named <created ms>-<pid>-<instance>-<seq> plus a state
+# suffix, so a plain sort drains the oldest first
+OPEN_SUFFIX = ".open"
+SEALED_SUFFIX = ".sealed"
+DRAINING_SUFFIX = ".draining-"
+
+# Records the drainer cannot load are appended here, one JSON object per
+# line with the error, instead of blocking their segment
+DEAD_LETTER_NAME = "dead-letter.jsonl"
+
+
+def _apply_sensor_samples(db: Session, records: List[Dict[str, Any]]):
+    rows = [
+        {
+            "user_id": record["user_id"],
+            "timestamp": datetime.fromisoformat(record["timestamp"]),
+            **{field: record.get(field) for field in SENSOR_FIELDS},
+            "calculated_mood_score": record["calculated_mood_score"],
+        }
+        for record in records
+    ]
+    db.execute(insert(SensorSample), rows)
+    mood_rollups.record(
+        db, ((row["user_id"], row["timestamp"], row["calculated_mood_score"]) for row in rows)
+    )
+    anomaly_detector.observe(db, ((row["user_id"], row["timestamp"], row) for row in rows))
+
+
+def _apply_activity_logs(db: Session, records: List[Dict[str, Any]]):
+    rows = [
+        {
+            "user_id": record["user_id"],
+            "content_id": record["content_id"],
+            "completed_at": datetime.fromisoformat(record["completed_at"]),
+        }
+        for record in records
+    ]
+    db.execute(insert(ActivityLog), rows)
+    content_popularity.record(db, ((row["content_id"], row["completed_at"]) for row in rows))
+
+
+# Record kind -> bulk loader; loaders add rows and leave the commit to the drainer
+SPOOL_HANDLERS: Dict[str, Callable[[Session, List[Dict[str, Any]]], None]] = {
+    "sensor_sample": _apply_sensor_samples,
+    "activity_log": _apply_activity_logs,
+}
+
+
+def _fsync_dir(path: str):
+    """Make renames and new files in a directory durable"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _set_result(future: asyncio.Future, error: Optional[BaseException]):
+    if future.done():
+        # The request was cancelled (client went away) while waiting on fsync
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+class IngestSpool:
+    """
+    Append-only local log in front of the database for small, frequent writes.
+
+    Requests append a record to this worker's open segment file and are
+    acknowledged once a flusher thread has fsynced it; writes that arrive
+    during an fsync share the next one (group commit). Segments are sealed
+    by size or age, and a drainer thread bulk-loads sealed segments at its
+    own pace. Each segment's progress is checkpointed in the same
+    transaction as its rows, so replaying a segment after a crash skips
+    what was already loaded.
+    """
+
+    def __init__(
+        self,
+        spool_dir: str = settings.ingest_spool_dir,
+        segment_bytes: int = settings.ingest_spool_segment_bytes,
+        segment_age_ms: int = settings.ingest_spool_segment_age_ms,
+        drain_batch_size: int = settings.ingest_spool_drain_batch_size,
+        drain_interval_ms: int = settings.ingest_spool_drain_interval_ms,
+    ):
+        self.spool_dir = spool_dir
+        self.segment_bytes = segment_bytes
+        self.segment_age = segment_age_ms / 1000
+        self.drain_batch_size = drain_batch_size
+        self.drain_interval = drain_interval_ms / 1000
+        self._instance = uuid.uuid4().hex[:8]
+        self._owner = f"{os.getpid()}-{self._instance}"
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._flusher: Optional[threading.Thread] = None
+        self._drainer: Optional[threading.Thread] = None
+        self._drainer_stop = threading.Event()
+        self._stopping = False
+
+        # Open segment, guarded by _cond
+        self._file = None
+        self._segment_path: Optional[str] = None
+        self._segment_opened = 0.0
+        self._segment_size = 0
+        self._sequence = 0
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+        # Metrics
+        self.records_appended = 0
+        self.fsyncs = 0
+        self.records_drained = 0
+        self.records_rejected = 0
+        self.replayed_records_skipped = 0
+        self.torn_records = 0
+        self.segments_drained = 0
+        self.failed_drains = 0
+        self.last_drain_at: Optional[datetime] = None
+
+    def start(self):
+        """Start the flusher and drainer threads"""
+        with self._lock:
+            if self._flusher is not None:
+                return
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._stopping = False
+            self._drainer_stop.clear()
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="ingest-spool-flusher", daemon=True
+            )
+            self._drainer = threading.Thread(
+                target=self._run_drainer, name="ingest-spool-drainer", daemon=True
+            )
+            self._flusher.start()
+            self._drainer.start()
+
+    def stop(self):
+        """Seal the open segment and make a last drain pass"""
+        with self._lock:
+            if self._flusher is None:
+                return
+            with self._cond:
+                self._stopping = True
+                self._cond.notify()
+            self._flusher.join()
+            self._drainer_stop.set()
+            self._drainer.join()
+            self._flusher = None
+            self._drainer = None
+        try:
+            self.drain_once()
+        except Exception as e:
+            print(f"Error draining ingest spool on shutdown: {e}")
+
+    async def append(self, kind: str, data: Dict[str, Any]) -> str:
+        """Durably spool one record; returns its ingest ID once it is fsynced"""
+        if kind not in SPOOL_HANDLERS:
+            raise ValueError(f"Unknown spool record kind {kind!r}")
+        if self._flusher is None:
+            self.start()
+
+        ingest_id = uuid.uuid4().hex
+        payload = json.dumps(
+            {"id": ingest_id, "kind": kind, "data": data}, separators=(",", ":")
+        ).encode()
+        frame = RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        loop = asyncio.get_running_loop()
+        durable = loop.create_future()
+        with self._cond:
+            if self._file is None:
+                self._open_segment()
+            self._file.write(frame)
+            self._segment_size += len(frame)
+            self.records_appended += 1
+            self._waiters.append((loop, durable))
+            self._cond.notify()
+
+        await durable
+        return ingest_id
+
+    # Writing
+
+    def _open_segment(self):
+        """Start a new segment file; called with _cond held"""
+        self._sequence += 1
+        name = f"{int(time.time() * 1000):013d}-{self._owner}-{self._sequence:06d}"
+        self._segment_path = os.path.join(self.spool_dir, name)
+        self._file = open(self._segment_path + OPEN_SUFFIX, "ab")
+        _fsync_dir(self.spool_dir)
+        self._segment_opened = time.monotonic()
+        self._segment_size = 0
+
+    def _rotation_due(self) -> bool:
+        return self._file is not None and (
+            self._segment_size >= self.segment_bytes
+            or time.monotonic() - self._segment_opened >= self.segment_age
+        )
+
+    def _seal_segment(self) -> List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]:
+        """
+        Sync, close and seal the open segment; called with _cond held.
+        Returns the waiters whose records this final sync covered.
+        """
+        waiters, self._waiters = self._waiters, []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.rename(self._segment_path + OPEN_SUFFIX, self._segment_path + SEALED_SUFFIX)
+        _fsync_dir(self.spool_dir)
+        self.fsyncs += 1
+        self._file = None
+        self._segment_path = None
+        return waiters
+
+    def _run_flusher(self):
+        while True:
+            with self._cond:
+                while not (self._waiters or self._stopping or self._rotation_due()):
+                    self._cond.wait(timeout=self.segment_age)
+                waiters, self._waiters = self._waiters, []
+                segment = self._file
+                if segment is not None:
+                    segment.flush()
+
+            # Appends carry on into the buffer while this sync runs and are
+            # picked up, together, by the next one
+            error = None
+            try:
+                if segment is not None and waiters:
+                    os.fsync(segment.fileno())
+                    self.fsyncs += 1
+            except OSError as e:
+                error = e
+            self._resolve(waiters, error)
+
+            with self._cond:
+                if self._rotation_due() or (self._stopping and self._file is not None):
+                    error = None
+                    try:
+                        waiters = self._seal_segment()
+                    except OSError as e:
+                        waiters, self._waiters = self._waiters, []
+                        error = e
+                        print(f"Error sealing ingest spool segment: {e}")
+                    self._resolve(waiters, error)
+                if self._stopping and not self._waiters:
+                    return
+
+    def _resolve(self, waiters, error: Optional[BaseException]):
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_set_result, future, error)
+
+    # Draining
+
+    def _run_drainer(self):
+        while not self._drainer_stop.wait(self.drain_interval):
+            try:
+                self.drain_once()
+            except Exception as e:
+                self.failed_drains += 1
+                print(f"Error draining ingest spool: {e}")
+
+    def _is_orphan(self, owner: str) -> bool:
+        """Whether a <pid>-<instance> owner is a previous or dead process"""
+        pid, _, instance = owner.partition("-")
+        if owner == self._owner:
+            return False
+        return instance != self._instance and (
+            int(pid) == os.getpid() or not _pid_alive(int(pid))
+        )
+
+    def _recover_orphans(self):
+        """Seal open segments and release claims left by dead workers"""
+        for name in os.listdir(self.spool_dir):
+            base, dot, state = name.partition(".")
+            if name.endswith(OPEN_SUFFIX):
+                owner = base.split("-", 1)[1].rsplit("-", 1)[0]
+            elif ("." + state).startswith(DRAINING_SUFFIX):
+                owner = ("." + state)[len(DRAINING_SUFFIX) :]
+            else:
+                continue
+            if self._is_orphan(owner):
+                os.rename(
+                    os.path.join(self.spool_dir, name),
+                    os.path.join(self.spool_dir, base + SEALED_SUFFIX),
+                )
+
+    def drain_once(self) -> int:
+        """Load every sealed segment into the database; returns records loaded"""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._recover_orphans()
+
+        claim = DRAINING_SUFFIX + self._owner
+        loaded = 0
+        for name in sorted(os.listdir(self.spool_dir)):
+            base = name.partition(".")[0]
+            path = os.path.join(self.spool_dir, base + claim)
+            if name.endswith(SEALED_SUFFIX):
+                try:
+                    # Renaming is the claim: only one drainer can win it
+                    os.rename(os.path.join(self.spool_dir, name), path)
+                except FileNotFoundError:
+                    continue
+            elif not name.endswith(claim):
+                continue
+            loaded += self._drain_segment(base, path)
+        self.last_drain_at = datetime.now()
+        return loaded
+
+    def _read_segment(self, path: str) -> List[Dict[str, Any]]:
+        with open(path, "rb") as f:
+            data = f.read()
+
+        records = []
+        position = 0
+        while position + RECORD_HEADER.size <= len(data):
+            length, checksum = RECORD_HEADER.unpack_from(data, position)
+            start = position + RECORD_HEADER.size
+            payload = data[start : start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            records.append(json.loads(payload))
+            position = start + length
+        if position < len(data):
+            self.torn_records += 1
+        return records
+
+    def _drain_segment(self, segment: str, path: str) -> int:
+        records = self._read_segment(path)
+
+        db = SessionLocal()
+        try:
+            checkpoint = db.get(IngestSpoolCheckpoint, segment)
+            applied = checkpoint.records_applied if checkpoint else 0
+            self.replayed_records_skipped += applied
+
+            loaded = 0
+            for offset in range(applied, len(records), self.drain_batch_size):
+                batch = records[offset : offset + self.drain_batch_size]
+                try:
+                    self._apply(db, batch)
+                    self._checkpoint(db, segment, offset + len(batch))
+                    db.commit()
+                except OperationalError:
+                    # The database is unavailable; retry the segment next pass
+                    db.rollback()
+                    raise
+                except Exception:
+                    # Some record can't be loaded: a user or content item
+                    # deleted since, a value the column rejects, or a
+                    # malformed payload. Find it by loading one at a time.
+                    db.rollback()
+                    for index, record in enumerate(batch, start=offset + 1):
+                        try:
+                            self._apply(db, [record])
+                        except OperationalError:
+                            db.rollback()
+                            raise
+                        except Exception as e:
+                            db.rollback()
+                            self._dead_letter(segment, record, e)
+                        self._checkpoint(db, segment, index)
+                        db.commit()
+                loaded += len(batch)
+                self.records_drained += len(batch)
+
+            os.remove(path)
+            _fsync_dir(self.spool_dir)
+            # Only forget the checkpoint once the file can no longer be replayed
+            db.query(IngestSpoolCheckpoint).filter(
+                IngestSpoolCheckpoint.segment == segment
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+        user_ids = {
+            record["data"].get("user_id")
+            for record in records
+            if isinstance(record.get("data"), dict)
+        }
+        user_ids.discard(None)
+        wellness_cache.invalidate_many(user_ids)
+        activity_correlations.mark_dirty(user_ids)
+        self.segments_drained += 1
+        return loaded
+
+    def _apply(self, db: Session, records: List[Dict[str, Any]]):
+        by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_kind.setdefault(record["kind"], []).append(record["data"])
+        for kind, data in by_kind.items():
+            SPOOL_HANDLERS[kind](db, data)
+
+    def _dead_letter(self, segment: str, record: Any, error: Exception):
+        """Durably set aside a record that can't be loaded, before skipping it"""
+        self.records_rejected += 1
+        print(f"Dead-lettered spooled record from {segment}: {error}")
+        line = json.dumps(
+            {
+                "segment": segment,
+                "record": record,
+                "error": f"{type(error).__name__}: {error}",
+                "rejected_at": datetime.now().isoformat(),
+            },
+            separators=(",", ":"),
+        )
+        with open(os.path.join(self.spool_dir, DEAD_LETTER_NAME), "a") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _checkpoint(self, db: Session, segment: str, records_applied: int):
+        db.merge(IngestSpoolCheckpoint(segment=segment, records_applied=records_applied))
+
+    def stats(self) -> Dict[str, Any]:
+        """Spool depth, drain lag and throughput counters"""
+        segments = 0
+        spool_bytes = 0
+        oldest_ms = None
+        try:
+            names = os.listdir(self.spool_dir)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if name == DEAD_LETTER_NAME:
+                continue
+            try:
+                spool_bytes += os.path.getsize(os.path.join(self.spool_dir, name))
+            except FileNotFoundError:
+                continue
+            segments += 1
+            created_ms = int(name.split("-", 1)[0])
+            oldest_ms = created_ms if oldest_ms is None else min(oldest_ms, created_ms)
+
+        try:
+            dead_letter_bytes = os.path.getsize(os.path.join(self.spool_dir, DEAD_LETTER_NAME))
+        except FileNotFoundError:
+            dead_letter_bytes = 0
+
+        return {
+            "running": self._flusher is not None,
+            "segments": segments,
+            "spool_bytes": spool_bytes,
+            "drain_lag_seconds": (
+                round(time.time() - oldest_ms / 1000, 3) if oldest_ms is not None else 0.0
+            ),
+            "records_appended": self.records_appended,
+            "fsyncs": self.fsyncs,
+            "records_per_fsync": (
+                round(self.records_appended / self.fsyncs, 2) if self.fsyncs else 0.0
+            ),
+            "records_drained": self.records_drained,
+            "records_rejected": self.records_rejected,
+            "dead_letter_bytes": dead_letter_bytes,
+            "replayed_records_skipped": self.replayed_records_skipped,
+            "torn_records": self.torn_records,
+            "segments_drained": self.segments_drained,
+            "failed_drains": self.failed_drains,
+            "last_drain_at": self.last_drain_at.isoformat() if self.last_drain_at else None,
+        }
+
+
+# Global instance
+ingest_spool = IngestSpool()
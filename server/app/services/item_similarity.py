@@ -0,0 +1,245 @@
+import heapq
+import os
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import ActivityLog
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# People who completed both items needed before they count as related, so
+# one person's history alone doesn't make a recommendation
+MIN_CO_USERS = 2
+
+# How often a worker checks whether the artifact file has been replaced
+RELOAD_CHECK_SECONDS = 30
+
+# (user_id, content_id) pairs fetched per round trip while training
+TRAIN_BATCH_SIZE = 50000
+
+
+def neighbor_dtype(neighbors: int) -> "np.dtype":
+    """One artifact row: an item and its most similar items, best first"""
+    import numpy as np
+
+    return np.dtype(
+        [
+            ("content_id", "<i8"),
+            ("neighbor_ids", "<i8", (neighbors,)),  # -1 pads rows with fewer neighbors
+            ("scores", "<f4", (neighbors,)),
+        ]
+    )
+
+
+def build_neighbors(
+    user_ids: "np.ndarray",
+    content_ids: "np.ndarray",
+    neighbors: int,
+    min_co_users: int = MIN_CO_USERS,
+) -> "np.ndarray":
+    """
+    Top item-item cosine similarities from (user_id, content_id) pairs.
+
+    The pairs form a binary user x item matrix X; X.T @ X counts the users
+    who completed each pair of items, with each item's own total on the
+    diagonal, so cosine similarity is co / sqrt(total_a * total_b). Returns
+    a table in neighbor_dtype, sorted by content_id.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    items, item_index = np.unique(content_ids, return_inverse=True)
+    users, user_index = np.unique(user_ids, return_inverse=True)
+    table = np.zeros(len(items), dtype=neighbor_dtype(neighbors))
+    if not len(items):
+        return table
+
+    completed = sparse.csr_matrix(
+        (np.ones(len(item_index), dtype=np.float32), (user_index, item_index)),
+        shape=(len(users), len(items)),
+    )
+    # Repeat completions are summed on construction; count each user once
+    completed.data[:] = 1
+    totals = np.asarray(completed.sum(axis=0)).ravel()
+
+    co = (completed.T @ completed).tocoo()
+    keep = (co.row != co.col) & (co.data >= min_co_users)
+    rows, cols = co.row[keep], co.col[keep]
+    similarity = co.data[keep] / np.sqrt(totals[rows] * totals[cols])
+    similarity = sparse.csr_matrix((similarity, (rows, cols)), shape=co.shape)
+
+    table["content_id"] = items
+    table["neighbor_ids"] = -1
+    for row in range(len(items)):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        if start == end:
+            continue
+        # Stable, so ties go to the lower content id
+        best = np.argsort(-similarity.data[start:end], kind="stable")[:neighbors]
+        table["neighbor_ids"][row, : len(best)] = items[similarity.indices[start:end][best]]
+        table["scores"][row, : len(best)] = similarity.data[start:end][best]
+    return table
+
+
+class ItemSimilarityService:
+    """
+    "People who did X also did Y" recommendations from item-item
+    collaborative filtering.
+
+    train_item_similarity.py builds the model offline from activity_logs
+    and writes each item's top ITEM_SIMILARITY_NEIGHBORS neighbors to a
+    fixed-width .npy file. Workers memory-map it, so every process shares
+    one copy through the page cache, and a lookup is a binary search on
+    the content ids plus a few rows read - no activity queries. A new
+    artifact is swapped in by renaming over the old one; workers notice
+    within RELOAD_CHECK_SECONDS.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.item_similarity_path,
+        neighbors: int = settings.item_similarity_neighbors,
+        window_days: int = settings.item_similarity_window_days,
+    ):
+        self.path = path
+        self.neighbors = neighbors
+        self.window_days = window_days
+        self._table: Optional["np.ndarray"] = None
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.lookups = 0
+        self.reloads = 0
+
+    def train(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Build the neighbor table from recent activity and write it; returns items"""
+        import numpy as np
+
+        since = (now or datetime.now()) - timedelta(days=self.window_days)
+        user_ids, content_ids = array("q"), array("q")
+        pairs = (
+            db.query(ActivityLog.user_id, ActivityLog.content_id)
+            .filter(ActivityLog.completed_at >= since)
+            .distinct()
+            .yield_per(TRAIN_BATCH_SIZE)
+        )
+        for user_id, content_id in pairs:
+            user_ids.append(user_id)
+            content_ids.append(content_id)
+
+        table = build_neighbors(
+            np.frombuffer(user_ids, dtype=np.int64),
+            np.frombuffer(content_ids, dtype=np.int64),
+            self.neighbors,
+        )
+        self.save(table)
+        return len(table)
+
+    def save(self, table: "np.ndarray"):
+        """Write a neighbor table and atomically replace the current artifact"""
+        import numpy as np
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, table)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+
+    def _current_table(self) -> Optional["np.ndarray"]:
+        """The mapped artifact, remapped if the file was replaced; None if missing"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return self._table
+
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < RELOAD_CHECK_SECONDS:
+                return self._table
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._table, self._file_id = None, None
+                return None
+
+            file_id = (stat.st_ino, stat.st_mtime_ns)
+            if file_id != self._file_id:
+                import numpy as np
+
+                try:
+                    # A plain ndarray view indexes faster than np.memmap
+                    self._table = np.load(self.path, mmap_mode="r").view(np.ndarray)
+                    self._file_id = file_id
+                    self.reloads += 1
+                except Exception as e:
+                    print(f"Error loading item similarity artifact: {e}")
+            return self._table
+
+    def similar_to(
+        self, seed_ids: Iterable[int], exclude_ids: Iterable[int] = (), limit: int = 3
+    ) -> List[Tuple[int, int]]:
+        """
+        Items most similar to the seeds overall, as (content_id, seed_id)
+        pairs; seed_id is the seed that contributed the most to the item.
+        """
+        table = self._current_table()
+        seeds = sorted(set(seed_ids))
+        if table is None or not seeds or not len(table):
+            return []
+
+        import numpy as np
+
+        positions = np.minimum(np.searchsorted(table["content_id"], seeds), len(table) - 1)
+        # Copies just the seeds' rows out of the mapping
+        rows = table[positions]
+        excluded = set(exclude_ids).union(seeds)
+        totals: Dict[int, float] = {}
+        best: Dict[int, Tuple[float, int]] = {}
+        for seed_id, found_id, neighbor_ids, scores in zip(
+            seeds,
+            rows["content_id"].tolist(),
+            rows["neighbor_ids"].tolist(),
+            rows["scores"].tolist(),
+        ):
+            if found_id != seed_id:
+                continue
+            for neighbor_id, score in zip(neighbor_ids, scores):
+                if neighbor_id < 0:
+                    break
+                if neighbor_id in excluded:
+                    continue
+                totals[neighbor_id] = totals.get(neighbor_id, 0.0) + score
+                if score > best.get(neighbor_id, (0.0, 0))[0]:
+                    best[neighbor_id] = (score, seed_id)
+
+        with self._lock:
+            self.lookups += 1
+        ranked = heapq.nsmallest(
+            limit, totals, key=lambda content_id: (-totals[content_id], content_id)
+        )
+        return [(content_id, best[content_id][1]) for content_id in ranked]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the admin metrics endpoint"""
+        table = self._table
+        return {
+            "items": len(table) if table is not None else 0,
+            "lookups": self.lookups,
+            "reloads": self.reloads,
+        }
+
+
+# Global instance
+item_similarity = ItemSimilarityService()
@@ -0,0 +1,244 @@
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Float, and_, cast, func, literal_column, or_, tuple_
+from sqlalchemy.orm import Session
+
+from app.db.models import JournalEntry
+
+# Must match the expression of the GIN index on journal_entries
+SEARCH_DOCUMENT = func.to_tsvector(
+    literal_column("'english'::regconfig"), JournalEntry.entry_text
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+# (rank, created_at, id)
+SearchKey = Tuple[float, datetime, int]
+
+# A user's (entry count, max id, sum of revisions); any insert, edit or
+# delete changes it
+Signature = Tuple[int, Optional[int], int]
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.strip("'") for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+class _UserIndex:
+    """Inverted index over one user's journal entries"""
+
+    def __init__(self, signature: Signature):
+        self.signature = signature
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.lengths: Dict[int, int] = {}
+        self.terms: Dict[int, List[str]] = {}
+        self.created_at: Dict[int, datetime] = {}
+
+    def add(self, entry_id: int, text: str, created_at: datetime):
+        self.remove(entry_id)
+        terms = Counter(token for token in tokenize(text) if token)
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[entry_id] = count
+        self.lengths[entry_id] = sum(terms.values())
+        self.terms[entry_id] = list(terms)
+        self.created_at[entry_id] = created_at
+
+    def remove(self, entry_id: int):
+        if entry_id not in self.lengths:
+            return
+        for term in self.terms.pop(entry_id):
+            docs = self.postings[term]
+            del docs[entry_id]
+            if not docs:
+                del self.postings[term]
+        del self.lengths[entry_id]
+        del self.created_at[entry_id]
+
+    def search(self, terms: List[str]) -> List[SearchKey]:
+        """AND-match all terms, ranked by length-normalized term frequency"""
+        if not terms:
+            return []
+
+        postings = [self.postings.get(term, {}) for term in terms]
+        postings.sort(key=len)
+        matches: Set[int] = set(postings[0])
+        for docs in postings[1:]:
+            matches &= docs.keys()
+
+        results = []
+        for entry_id in matches:
+            # Corpus-independent like ts_rank, so cursors stay stable
+            frequency = sum(docs[entry_id] for docs in postings)
+            rank = frequency / (1 + math.log(1 + self.lengths[entry_id]))
+            results.append((rank, self.created_at[entry_id], entry_id))
+        return results
+
+
+class JournalSearchService:
+    """
+    Full-text search over journal entries.
+
+    On PostgreSQL this runs against the GIN-indexed tsvector expression on
+    journal_entries. Other databases (SQLite in development) fall back to an
+    in-process inverted index built per user on first search. Each search
+    compares the index against the user's entry signature in the database
+    and rebuilds it if they differ, so new and edited entries written by other
+    workers (or racing a build) show up on the next search; entries created
+    through this process are patched in without a rebuild.
+    """
+
+    def __init__(self, max_users: int = 256):
+        self.max_users = max_users
+        self._indexes: "OrderedDict[int, _UserIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        query: str,
+        limit: int = 20,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        after: Optional[SearchKey] = None,
+    ) -> List[Tuple[JournalEntry, float]]:
+        """Return up to limit (entry, rank) pairs ordered by rank, newest first"""
+        if db.bind.dialect.name == "postgresql":
+            return self._search_postgres(
+                db, user_id, query, limit, date_from, date_to, after
+            )
+        return self._search_fallback(
+            db, user_id, query, limit, date_from, date_to, after
+        )
+
+    def _search_postgres(self, db, user_id, query, limit, date_from, date_to, after):
+        ts_query = func.websearch_to_tsquery(
+            literal_column("'english'::regconfig"), query
+        )
+        # ts_rank returns float4; widen it so cursor values round-trip exactly
+        rank = cast(func.ts_rank(SEARCH_DOCUMENT, ts_query), Float)
+
+        db_query = db.query(JournalEntry, rank.label("rank")).filter(
+            JournalEntry.user_id == user_id, SEARCH_DOCUMENT.op("@@")(ts_query)
+        )
+        if date_from:
+            db_query = db_query.filter(JournalEntry.created_at >= date_from)
+        if date_to:
+            db_query = db_query.filter(JournalEntry.created_at < date_to)
+        if after:
+            after_rank, after_created_at, after_id = after
+            db_query = db_query.filter(
+                or_(
+                    rank < after_rank,
+                    and_(
+                        rank == after_rank,
+                        tuple_(JournalEntry.created_at, JournalEntry.id)
+                        < tuple_(after_created_at, after_id),
+                    ),
+                )
+            )
+
+        rows = (
+            db_query.order_by(
+                rank.desc(), JournalEntry.created_at.desc(), JournalEntry.id.desc()
+            )
+            .limit(limit)
+            .all()
+        )
+        return [(entry, float(entry_rank)) for entry, entry_rank in rows]
+
+    def _search_fallback(self, db, user_id, query, limit, date_from, date_to, after):
+        index = self._get_index(db, user_id)
+        with self._lock:
+            matches = index.search([token for token in tokenize(query) if token])
+
+        if date_from:
+            matches = [m for m in matches if m[1] >= date_from]
+        if date_to:
+            matches = [m for m in matches if m[1] < date_to]
+        if after:
+            matches = [m for m in matches if m < after]
+
+        matches.sort(reverse=True)
+        page = matches[:limit]
+        if not page:
+            return []
+
+        entries = {
+            entry.id: entry
+            for entry in db.query(JournalEntry)
+            .filter(JournalEntry.id.in_([entry_id for _, _, entry_id in page]))
+            .all()
+        }
+        return [
+            (entries[entry_id], rank)
+            for rank, _, entry_id in page
+            if entry_id in entries
+        ]
+
+    def _signature(self, db: Session, user_id: int) -> Signature:
+        count, max_id, revisions = (
+            db.query(
+                func.count(JournalEntry.id),
+                func.max(JournalEntry.id),
+                func.coalesce(func.sum(JournalEntry.revision), 0),
+            )
+            .filter(JournalEntry.user_id == user_id)
+            .one()
+        )
+        return count, max_id, int(revisions)
+
+    def _get_index(self, db: Session, user_id: int) -> _UserIndex:
+        # Read before the entries: a write in between leaves the index newer
+        # than its signature, and the next search rebuilds it
+        signature = self._signature(db, user_id)
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None and index.signature == signature:
+                self._indexes.move_to_end(user_id)
+                return index
+
+        index = _UserIndex(signature)
+        rows = (
+            db.query(JournalEntry.id, JournalEntry.entry_text, JournalEntry.created_at)
+            .filter(JournalEntry.user_id == user_id)
+            .all()
+        )
+        for row in rows:
+            index.add(row.id, row.entry_text, row.created_at)
+
+        with self._lock:
+            self._indexes[user_id] = index
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return index
+
+    def index_entry(self, entry: JournalEntry):
+        """Add a newly written entry to an already-built fallback index"""
+        with self._lock:
+            index = self._indexes.get(entry.user_id)
+            if index is None or entry.id in index.lengths:
+                return
+            index.add(entry.id, entry.entry_text, entry.created_at)
+            # Only matches the database if the index was current before
+            count, max_id, revisions = index.signature
+            index.signature = (
+                count + 1,
+                max(entry.id, max_id or entry.id),
+                revisions + entry.revision,
+            )
+
+    def remove_entry(self, user_id: int, entry_id: int):
+        """Drop a user's fallback index after a delete; the next search rebuilds it"""
+        with self._lock:
+            self._indexes.pop(user_id, None)
+
+
+# Global instance
+journal_search = JournalSearchService()
@@ -0,0 +1,213 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import MoodLog, MoodRollup, SensorSample
+
+ROLLUP_RESOLUTIONS = ["hour", "day"]
+TREND_RESOLUTIONS = ["auto", "raw"] + ROLLUP_RESOLUTIONS
+TREND_RESOLUTION_PATTERN = f"^({'|'.join(TREND_RESOLUTIONS)})$"
+
+# "auto" picks the finest resolution that stays within this many points
+MAX_TREND_POINTS = 500
+
+# Rows per upsert statement (keeps SQLite under its bound-parameter limit)
+UPSERT_CHUNK_SIZE = 500
+
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Start of the hour or day containing timestamp"""
+    if resolution == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def summarize(
+    points: Iterable[Tuple[datetime, float]], resolution: str, value_key: str
+) -> List[Dict[str, Any]]:
+    """Bucket (timestamp, value) points in memory, for series without rollups"""
+    buckets: Dict[datetime, List[float]] = {}
+    for timestamp, value in points:
+        buckets.setdefault(bucket_start(timestamp, resolution), []).append(value)
+
+    return [
+        {
+            "date": start.date().isoformat(),
+            "timestamp": start.isoformat(),
+            value_key: sum(values) / len(values),
+            "min_score": min(values),
+            "max_score": max(values),
+            "sample_count": len(values),
+        }
+        for start, values in sorted(buckets.items())
+    ]
+
+
+class MoodRollupService:
+    """
+    Hourly and daily mood score rollups (count, sum, min, max per bucket).
+
+    Writers fold new scores in as they are stored, using an upsert that adds
+    to the existing bucket, so long trend windows are read from a few
+    hundred pre-aggregated rows instead of every raw mood log and sample.
+    """
+
+    def record(self, db: Session, points: Iterable[Tuple[int, datetime, Optional[float]]]):
+        """Fold (user_id, timestamp, score) points into the rollups; the caller commits"""
+        buckets: Dict[Tuple[int, str, datetime], List[float]] = {}
+        for user_id, timestamp, score in points:
+            if score is None:
+                continue
+            for resolution in ROLLUP_RESOLUTIONS:
+                key = (user_id, resolution, bucket_start(timestamp, resolution))
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [1, score, score, score]
+                else:
+                    bucket[0] += 1
+                    bucket[1] += score
+                    bucket[2] = min(bucket[2], score)
+                    bucket[3] = max(bucket[3], score)
+
+        rows = [
+            {
+                "user_id": user_id,
+                "resolution": resolution,
+                "bucket_start": start,
+                "sample_count": count,
+                "score_sum": total,
+                "min_score": low,
+                "max_score": high,
+            }
+            for (user_id, resolution, start), (count, total, low, high) in buckets.items()
+        ]
+        for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            self._upsert(db, rows[offset : offset + UPSERT_CHUNK_SIZE])
+
+    def _upsert(self, db: Session, rows: List[Dict[str, Any]]):
+        if db.get_bind().dialect.name == "postgresql":
+            statement = postgresql_insert(MoodRollup).values(rows)
+            least, greatest = func.least, func.greatest
+        else:
+            # SQLite's two-argument min()/max() are scalar functions
+            statement = sqlite_insert(MoodRollup).values(rows)
+            least, greatest = func.min, func.max
+
+        excluded = statement.excluded
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id", "resolution", "bucket_start"],
+                set_={
+                    "sample_count": MoodRollup.sample_count + excluded.sample_count,
+                    "score_sum": MoodRollup.score_sum + excluded.score_sum,
+                    "min_score": least(MoodRollup.min_score, excluded.min_score),
+                    "max_score": greatest(MoodRollup.max_score, excluded.max_score),
+                },
+            )
+        )
+
+    def rebuild(
+        self,
+        db: Session,
+        user_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        batch_size: int = 10000,
+    ) -> int:
+        """
+        Recompute rollups from raw mood logs and sensor samples, e.g. after
+        re-scoring. Pass since (a day boundary) to keep older buckets whose
+        raw samples have been compacted away. Run while ingest is paused, or
+        the two will double count.
+        """
+        rollups = db.query(MoodRollup)
+        if user_id is not None:
+            rollups = rollups.filter(MoodRollup.user_id == user_id)
+        if since is not None:
+            rollups = rollups.filter(MoodRollup.bucket_start >= since)
+        rollups.delete(synchronize_session=False)
+        db.commit()
+
+        folded = 0
+        for model in (MoodLog, SensorSample):
+            last_id = 0
+            while True:
+                query = db.query(
+                    model.id, model.user_id, model.timestamp, model.calculated_mood_score
+                ).filter(model.id > last_id, model.calculated_mood_score.isnot(None))
+                if since is not None:
+                    query = query.filter(model.timestamp >= since)
+                if user_id is not None:
+                    query = query.filter(model.user_id == user_id)
+                rows = query.order_by(model.id).limit(batch_size).all()
+                if not rows:
+                    break
+
+                self.record(
+                    db,
+                    (
+                        (row.user_id, row.timestamp, row.calculated_mood_score)
+                        for row in rows
+                    ),
+                )
+                db.commit()
+
+                folded += len(rows)
+                last_id = rows[-1].id
+        return folded
+
+    def pick_resolution(
+        self, db: Session, user_id: int, since: datetime, days: int, resolution: str
+    ) -> str:
+        """Resolve "auto" to the finest level within MAX_TREND_POINTS"""
+        if resolution != "auto":
+            return resolution
+
+        raw_points = (
+            db.query(func.count(MoodLog.id))
+            .filter(MoodLog.user_id == user_id, MoodLog.timestamp >= since)
+            .scalar()
+        ) + (
+            db.query(func.count(SensorSample.id))
+            .filter(SensorSample.user_id == user_id, SensorSample.timestamp >= since)
+            .scalar()
+        )
+        if raw_points <= MAX_TREND_POINTS:
+            return "raw"
+        if days * 24 <= MAX_TREND_POINTS:
+            return "hour"
+        return "day"
+
+    def trend(
+        self, db: Session, user_id: int, since: datetime, resolution: str
+    ) -> List[Dict[str, Any]]:
+        """Rollup buckets from the one containing since onwards"""
+        rollups = (
+            db.query(MoodRollup)
+            .filter(
+                MoodRollup.user_id == user_id,
+                MoodRollup.resolution == resolution,
+                MoodRollup.bucket_start >= bucket_start(since, resolution),
+            )
+            .order_by(MoodRollup.bucket_start)
+            .all()
+        )
+
+        return [
+            {
+                "date": rollup.bucket_start.date().isoformat(),
+                "timestamp": rollup.bucket_start.isoformat(),
+                "mood_score": rollup.score_sum / rollup.sample_count,
+                "min_score": rollup.min_score,
+                "max_score": rollup.max_score,
+                "sample_count": rollup.sample_count,
+            }
+            for rollup in rollups
+        ]
+
+
+# Global instance
+mood_rollups = MoodRollupService()
@@ -1,12 +1,17 @@
+import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.db.models import (
     User, Plan, PlanCard, Content, CategoryEnum, ContentTypeEnum, 
     PlanStatusEnum, Goal, UserGoal
 )
+from app.services.activity_correlations import activity_correlations
+from app.services.content_catalog import content_catalog
+from app.services.content_popularity import content_popularity
+from app.services.population_sketch import effective_streak, population_sketch
+from app.services.wellness_cache import wellness_cache
 
 
 class PlanService:
@@ -80,10 +85,11 @@ class PlanService:
                 db.refresh(plan)
                 
                 # Find relevant content
-                content_items = db.query(Content).filter(
-                    Content.category == template["category"],
-                    Content.content_type.in_(template["content_types"])
-                ).limit(20).all()  # Limit to 20 items per plan
+                content_items = content_catalog.snapshot.select(
+                    categories=[template["category"]],
+                    content_types=template["content_types"],
+                    limit=20,  # Limit to 20 items per plan
+                )
                 
                 # Create plan-content mappings
                 for idx, content in enumerate(content_items):
@@ -176,9 +182,9 @@ class PlanService:
                     suggested_categories.append(cls.GOAL_CONTENT_TEMPLATES[goal_name]["category"])
             
             if suggested_categories:
-                fallback_content = db.query(Content).filter(
-                    Content.category.in_(suggested_categories)
-                ).limit(4).all()
+                fallback_content = content_catalog.snapshot.select(
+                    categories=suggested_categories, limit=4
+                )
                 
                 for content in fallback_content:
                     activity = {
@@ -202,10 +208,10 @@ class PlanService:
         if goal_categories:
             # Exclude content already in daily activities
             existing_content_ids = [activity["id"] for activity in agenda["daily_activities"]]
-            suggested = db.query(Content).filter(
-                Content.category.in_(goal_categories),
-                ~Content.id.in_(existing_content_ids) if existing_content_ids else True
-            ).order_by(func.random()).limit(6).all()
+            candidates = content_catalog.snapshot.select(
+                categories=goal_categories, exclude_ids=existing_content_ids
+            )
+            suggested = random.sample(candidates, min(6, len(candidates)))
             
             for content in suggested:
                 suggestion = {
@@ -241,6 +247,7 @@ class PlanService:
             content_id=content_id
         )
         db.add(activity)
+        content_popularity.record(db, [(content_id, datetime.now())])
         
         # Update plan card if part of a plan
         if plan_id:
@@ -257,6 +264,7 @@ class PlanService:
                 plan_card.next_review_date = datetime.now() + timedelta(days=3)
         
         # Update user streak
+        previous_streak = effective_streak(user)
         today = datetime.now().date()
         if user.last_activity_date and user.last_activity_date.date() == today - timedelta(days=1):
             user.current_streak += 1
@@ -267,3 +275,6 @@ class PlanService:
         user.longest_streak = max(user.longest_streak, user.current_streak)
         
         db.commit()
+        wellness_cache.invalidate(user.id)
+        activity_correlations.mark_dirty([user.id])
+        population_sketch.record_change("streak", previous_streak, user.current_streak)
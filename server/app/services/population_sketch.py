@@ -0,0 +1,308 @@
+import threading
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import PopulationHistogram, User, WellnessScore
+
+# Streaks are counted per day up to a year; longer ones share the last bucket.
+# Wellness scores (0-100, one decimal) get one bucket per 0.1.
+STREAK_BUCKETS = 366
+WELLNESS_BUCKETS = 1001
+METRIC_BUCKETS = {"streak": STREAK_BUCKETS, "wellness": WELLNESS_BUCKETS}
+
+# Rows per upsert statement (keeps SQLite under its bound-parameter limit)
+UPSERT_CHUNK_SIZE = 500
+
+
+def _empty_histograms() -> Dict[str, List[int]]:
+    return {metric: [0] * size for metric, size in METRIC_BUCKETS.items()}
+
+
+def _histogram_rows(histograms: Dict[str, List[int]]) -> List[Dict[str, Any]]:
+    return [
+        {"metric": metric, "bucket": bucket, "count": count}
+        for metric, histogram in histograms.items()
+        for bucket, count in enumerate(histogram)
+        if count
+    ]
+
+
+def effective_streak(user: User, today: Optional[date] = None) -> int:
+    """The user's streak as shown to them: 0 once a day has been missed"""
+    today = today or datetime.utcnow().date()
+    if not user.last_activity_date or (today - user.last_activity_date.date()).days > 1:
+        return 0
+    return user.current_streak or 0
+
+
+def bucket_of(metric: str, value: float) -> int:
+    if metric == "streak":
+        return int(min(max(value, 0), STREAK_BUCKETS - 1))
+    return int(min(max(round(value * 10), 0), WELLNESS_BUCKETS - 1))
+
+
+class PopulationSketch:
+    """
+    Population histograms of streaks and wellness scores, for answering
+    "where do I stand" without sorting the users table.
+
+    Both metrics live on a small fixed grid, so a count per bucket is an
+    exact, mergeable sketch that, unlike t-digest or KLL, also supports
+    removing a user's old value when it changes. Each worker applies streak
+    changes locally and periodically adds its deltas to
+    population_histograms, then reloads the merged counts. Wellness scores
+    computed for one user are stored in wellness_scores and moved between
+    buckets the same way. The nightly wellness job rebuilds both histograms
+    from scratch, which also picks up streaks that lapsed without a write.
+    """
+
+    def __init__(self, flush_seconds: int = settings.population_sketch_flush_seconds):
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        # Plain lists rather than NumPy arrays: a few thousand ints at most,
+        # and importing this module shouldn't pull NumPy into worker startup
+        self._counts: Dict[str, List[int]] = {}
+        self._deltas = _empty_histograms()
+        self._below: Dict[str, List[int]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Metrics
+        self.changes_recorded = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.last_flush_at: Optional[datetime] = None
+
+    def start(self):
+        """Start the periodic flush thread"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="population-sketch", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and write out pending changes"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._flush_with_session()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_seconds):
+            self._flush_with_session()
+
+    def _flush_with_session(self):
+        db = SessionLocal()
+        try:
+            self.flush(db)
+        except Exception as e:
+            self.failed_flushes += 1
+            print(f"Error flushing population histograms: {e}")
+        finally:
+            db.close()
+
+    def record_change(self, metric: str, old: Optional[float], new: Optional[float]):
+        """Move one user from old's bucket to new's (None for added or removed)"""
+        with self._lock:
+            for value, step in ((old, -1), (new, 1)):
+                if value is None:
+                    continue
+                bucket = bucket_of(metric, value)
+                self._deltas[metric][bucket] += step
+                if metric in self._counts:
+                    self._counts[metric][bucket] += step
+                    self._below.pop(metric, None)
+            self.changes_recorded += 1
+
+    def record_wellness_score(self, user_id: int, score: Dict[str, Any]):
+        """
+        Store a freshly computed wellness score for a user and move them to
+        its bucket. Uses a session of its own, like the flush thread.
+        """
+        db = SessionLocal()
+        try:
+            # Locked (on PostgreSQL) so concurrent computations move the user once each
+            row = (
+                db.query(WellnessScore)
+                .filter(WellnessScore.user_id == user_id)
+                .with_for_update()
+                .one_or_none()
+            )
+            old = row.overall_score if row is not None else None
+            values = {
+                "overall_score": score["overall_score"],
+                "sentiment_component": score["sentiment_component"],
+                "mood_component": score["mood_component"],
+                "trend": score["trend"],
+                "computed_at": datetime.now(),
+            }
+            if row is None:
+                if db.get_bind().dialect.name == "postgresql":
+                    statement = postgresql_insert(WellnessScore)
+                else:
+                    statement = sqlite_insert(WellnessScore)
+                inserted = db.execute(
+                    statement.values(user_id=user_id, **values).on_conflict_do_nothing(
+                        index_elements=["user_id"]
+                    )
+                ).rowcount
+                if not inserted:
+                    # Another worker stored this user first and counted them
+                    db.rollback()
+                    return
+            else:
+                for field, value in values.items():
+                    setattr(row, field, value)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error storing wellness score: {e}")
+            return
+        finally:
+            db.close()
+
+        if old != values["overall_score"]:
+            self.record_change("wellness", old, values["overall_score"])
+
+    def flush(self, db: Session):
+        """Add this worker's pending deltas to the shared counts and reload them"""
+        with self._lock:
+            deltas, self._deltas = self._deltas, _empty_histograms()
+
+        rows = _histogram_rows(deltas)
+        try:
+            for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                self._upsert(db, rows[offset : offset + UPSERT_CHUNK_SIZE])
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Keep the deltas for the next attempt
+            with self._lock:
+                for metric, delta in deltas.items():
+                    for bucket, step in enumerate(delta):
+                        self._deltas[metric][bucket] += step
+            raise
+
+        self.load(db)
+        self.flushes += 1
+        self.last_flush_at = datetime.now()
+
+    def _upsert(self, db: Session, rows):
+        if db.get_bind().dialect.name == "postgresql":
+            statement = postgresql_insert(PopulationHistogram).values(rows)
+        else:
+            statement = sqlite_insert(PopulationHistogram).values(rows)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["metric", "bucket"],
+                set_={"count": PopulationHistogram.count + statement.excluded.count},
+            )
+        )
+
+    def load(self, db: Session):
+        """Replace the in-memory counts with the shared ones plus unflushed deltas"""
+        counts = _empty_histograms()
+        for metric, bucket, count in db.query(
+            PopulationHistogram.metric, PopulationHistogram.bucket, PopulationHistogram.count
+        ):
+            if metric in counts and 0 <= bucket < len(counts[metric]):
+                counts[metric][bucket] = count
+
+        with self._lock:
+            for metric, delta in self._deltas.items():
+                counts[metric] = [count + step for count, step in zip(counts[metric], delta)]
+            self._counts = counts
+            self._below = {}
+
+    def rebuild(self, db: Session, today: Optional[date] = None) -> Dict[str, int]:
+        """Recount both histograms from users and the wellness_scores snapshot"""
+        today = today or datetime.utcnow().date()
+        active_since = datetime.combine(today - timedelta(days=1), datetime.min.time())
+
+        streak = case(
+            (User.last_activity_date >= active_since, func.coalesce(User.current_streak, 0)),
+            else_=0,
+        )
+        with self._lock:
+            # Changes so far are already in the rows being counted
+            self._deltas = _empty_histograms()
+
+        counts = _empty_histograms()
+        for value, count in db.query(streak, func.count(User.id)).group_by(streak):
+            counts["streak"][bucket_of("streak", value)] += count
+        for value, count in db.query(WellnessScore.overall_score, func.count()).group_by(
+            WellnessScore.overall_score
+        ):
+            counts["wellness"][bucket_of("wellness", value)] += count
+
+        db.query(PopulationHistogram).delete(synchronize_session=False)
+        rows = _histogram_rows(counts)
+        for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            self._upsert(db, rows[offset : offset + UPSERT_CHUNK_SIZE])
+        db.commit()
+
+        self.load(db)
+        return {metric: sum(histogram) for metric, histogram in counts.items()}
+
+    def rank(self, db: Session, metric: str, value: float) -> Dict[str, Any]:
+        """Percentile of a value among all users, from the cached histogram"""
+        if metric not in self._counts:
+            self.load(db)
+
+        with self._lock:
+            counts = self._counts[metric]
+            below = self._below.get(metric)
+            if below is None:
+                # Users strictly below each bucket; recomputed after changes
+                below = list(accumulate(counts[:-1], initial=0))
+                self._below[metric] = below
+            bucket = bucket_of(metric, value)
+            population = sum(counts)
+            lower = below[bucket]
+            equal = counts[bucket]
+
+        if population <= 0:
+            return {"value": value, "percentile": None, "top_percent": None, "population": 0}
+        return {
+            "value": value,
+            # Mid-rank, so everyone on the same value gets the same percentile
+            "percentile": round(100 * (lower + equal / 2) / population, 1),
+            # Share of users at or above this value ("top 20%")
+            "top_percent": round(100 * (population - lower) / population, 1),
+            "population": population,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Population sizes and flush counters for the admin metrics endpoint"""
+        with self._lock:
+            return {
+                "running": self._thread is not None,
+                "population": {
+                    metric: sum(counts) for metric, counts in self._counts.items()
+                },
+                "pending_changes": sum(
+                    abs(step) for delta in self._deltas.values() for step in delta
+                ),
+                "changes_recorded": self.changes_recorded,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "last_flush_at": self.last_flush_at.isoformat() if self.last_flush_at else None,
+            }
+
+
+# Global instance
+population_sketch = PopulationSketch()
@@ -1,13 +1,25 @@
 import random
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
-from app.db.models import (ActivityLog, CategoryEnum, Content, ContentTypeEnum,
-                           Goal, JournalEntry, User, UserGoal)
+from app.db.models import (ActivityLog, CategoryEnum, ContentTypeEnum, Goal,
+                           JournalEntryTag, User, UserGoal, WearableAnomaly)
+from app.services.activity_correlations import activity_correlations
 from app.services.ai_service import ai_service
+from app.services.anomaly_detector import anomaly_detector
+from app.services.content_catalog import content_catalog
+from app.services.content_popularity import content_popularity
+from app.services.content_similarity import content_similarity
+from app.services.item_similarity import item_similarity
+from app.services.wellness_cache import wellness_cache
+
+# Why stress-reduction content is urgent after each kind of wearable flag
+ANOMALY_REASONS = {
+    "hrv_drop": "Your HRV recently dropped well below your usual level",
+    "stress_spike": "Your wearable picked up an unusual stress spike",
+}
 
 
 class RecommendationService:
@@ -51,14 +63,15 @@ class RecommendationService:
         # Get wellness score to determine recommendation priority
         wellness_data = ai_service.calculate_wellness_score(db, user_id)
         wellness_score = wellness_data["overall_score"]
+        anomalies = anomaly_detector.recent(db, user_id)
 
         recommendations = []
 
-        # Priority 1: Address low wellness areas
-        if wellness_score < 50:
+        # Priority 1: Address low wellness areas and flagged HRV drops or stress spikes
+        if wellness_score < 50 or anomalies:
             recommendations.extend(
                 self._get_urgent_recommendations(
-                    db, user_id, goal_categories, completed_content_ids
+                    db, user_id, goal_categories, completed_content_ids, anomalies
                 )
             )
 
@@ -69,6 +82,20 @@ class RecommendationService:
             )
         )
 
+        # Priority 3: Content completed by people who did what the user did
+        recommendations.extend(
+            self._get_collaborative_recommendations(completed_content_ids)
+        )
+
+        # Priority 3: More like what the user did last
+        if recent_activity:
+            latest = max(recent_activity, key=lambda log: log.completed_at)
+            recommendations.extend(
+                self._get_similar_content_recommendations(
+                    latest.content_id, completed_content_ids
+                )
+            )
+
         # Priority 3: Trending/popular content
         recommendations.extend(
             self._get_popular_recommendations(db, completed_content_ids)
@@ -85,7 +112,7 @@ class RecommendationService:
         for rec in recommendations:
             # rec is a dictionary with "content", "reason", and "priority" keys
             content = rec["content"]
-            content_id = content.id  # content is a SQLAlchemy Content object
+            content_id = content.id  # content is a content catalog item
                 
             if content_id and content_id not in seen_ids:
                 seen_ids.add(content_id)
@@ -101,68 +128,55 @@ class RecommendationService:
         user_id: int,
         goal_categories: List[CategoryEnum],
         completed_ids: List[int],
+        anomalies: Optional[List[WearableAnomaly]] = None,
     ) -> List[Dict[str, Any]]:
-        """Get urgent recommendations for users with low wellness scores"""
+        """Get urgent recommendations for users with low wellness scores or wearable flags"""
         recommendations = []
 
         # Get recent mood and sentiment data
         sentiment_trends = ai_service.get_sentiment_trends(db, user_id, 7)
         mood_trends = ai_service.get_mood_trends(db, user_id, 7)
 
-        # Recommend stress-reduction content if mood is low
-        if mood_trends and any(t["mood_score"] < 0.4 for t in mood_trends[-3:]):
-            stress_content = (
-                db.query(Content)
-                .filter(
-                    and_(
-                        Content.category == CategoryEnum.ANXIETY,
-                        Content.content_type.in_(
-                            [ContentTypeEnum.MEDITATION, ContentTypeEnum.MUSIC]
-                        ),
-                        ~Content.id.in_(completed_ids),
-                    )
-                )
-                .limit(2)
-                .all()
+        # Recommend stress-reduction content after a flagged HRV drop or
+        # stress spike, or if mood is low
+        stress_reason = None
+        if anomalies:
+            stress_reason = ANOMALY_REASONS[anomalies[0].kind]
+        elif mood_trends and any(t["mood_score"] < 0.4 for t in mood_trends[-3:]):
+            stress_reason = "Your recent biometric data suggests elevated stress levels"
+
+        if stress_reason:
+            stress_content = content_catalog.snapshot.select(
+                categories=[CategoryEnum.ANXIETY],
+                content_types=[ContentTypeEnum.MEDITATION, ContentTypeEnum.MUSIC],
+                exclude_ids=completed_ids,
+                limit=2,
             )
 
             for content in stress_content:
                 recommendations.append(
                     {
                         "content": content,
-                        "reason": (
-                            "Your recent biometric data suggests elevated stress levels"
-                        ),
+                        "reason": stress_reason,
                         "priority": 1,
                     }
                 )
 
-        # Recommend sleep content if mentioned in journals
+        # Recommend sleep content if mentioned in journals (tagged at write time)
         if sentiment_trends:
-            recent_entries = (
-                db.query(JournalEntry)
+            sleep_tagged_entry = (
+                db.query(JournalEntryTag.journal_entry_id)
                 .filter(
-                    JournalEntry.user_id == user_id,
-                    JournalEntry.created_at >= datetime.now() - timedelta(days=7),
+                    JournalEntryTag.user_id == user_id,
+                    JournalEntryTag.tag == "sleep",
+                    JournalEntryTag.created_at >= datetime.now() - timedelta(days=7),
                 )
-                .all()
+                .first()
             )
 
-            sleep_keywords = ["sleep", "tired", "exhausted", "insomnia", "rest"]
-            if any(
-                any(keyword in entry.entry_text.lower() for keyword in sleep_keywords)
-                for entry in recent_entries
-            ):
-                sleep_content = (
-                    db.query(Content)
-                    .filter(
-                        and_(
-                            Content.category == CategoryEnum.SLEEP,
-                            ~Content.id.in_(completed_ids),
-                        )
-                    )
-                    .limit(2)
-                    .all()
+            if sleep_tagged_entry:
+                sleep_content = content_catalog.snapshot.select(
+                    categories=[CategoryEnum.SLEEP], exclude_ids=completed_ids, limit=2
                 )
 
                 for content in sleep_content:
@@ -183,15 +197,11 @@ class RecommendationService:
     ) -> List[Dict[str, Any]]:
         """Get recommendations based on user goals"""
         recommendations = []
+        catalog = content_catalog.snapshot
 
         for category in goal_categories:
-            content_items = (
-                db.query(Content)
-                .filter(
-                    and_(Content.category == category, ~Content.id.in_(completed_ids))
-                )
-                .limit(3)
-                .all()
+            content_items = catalog.select(
+                categories=[category], exclude_ids=completed_ids, limit=3
             )
 
             for content in content_items:
@@ -208,28 +218,57 @@ class RecommendationService:
 
         return recommendations
 
+    def _get_collaborative_recommendations(
+        self, completed_ids: List[int]
+    ) -> List[Dict[str, Any]]:
+        """Get "people who did X also did Y" recommendations"""
+        catalog = content_catalog.snapshot
+        recommendations = []
+        for content_id, seed_id in item_similarity.similar_to(
+            completed_ids, completed_ids, limit=3
+        ):
+            content, seed = catalog.get(content_id), catalog.get(seed_id)
+            if content is None or seed is None:
+                continue
+            recommendations.append(
+                {
+                    "content": content,
+                    "reason": f'People who did "{seed.title}" also did this',
+                    "priority": 3,
+                }
+            )
+
+        return recommendations
+
+    def _get_similar_content_recommendations(
+        self, content_id: int, completed_ids: List[int]
+    ) -> List[Dict[str, Any]]:
+        """Get content described like the one the user completed last"""
+        seed = content_catalog.snapshot.get(content_id)
+        if seed is None:
+            return []
+
+        return [
+            {
+                "content": content,
+                "reason": f'Similar to "{seed.title}"',
+                "priority": 3,
+            }
+            for content in content_similarity.similar(
+                content_id, limit=2, exclude_ids=completed_ids
+            )
+        ]
+
     def _get_popular_recommendations(
         self, db: Session, completed_ids: List[int]
     ) -> List[Dict[str, Any]]:
         """Get popular content recommendations"""
-        # Get most completed content in the last 30 days
-        popular_content = (
-            db.query(Content)
-            .join(ActivityLog)
-            .filter(
-                and_(
-                    ActivityLog.completed_at >= datetime.now() - timedelta(days=30),
-                    ~Content.id.in_(completed_ids),
-                )
-            )
-            .group_by(Content.id)
-            .order_by(func.count(ActivityLog.id).desc())
-            .limit(3)
-            .all()
-        )
+        # Most completed content, recent completions weighing the most
+        catalog = content_catalog.snapshot
+        popular_ids = content_popularity.top(db, completed_ids, limit=3)
 
         recommendations = []
-        for content in popular_content:
+        for content in filter(None, map(catalog.get, popular_ids)):
             recommendations.append(
                 {
                     "content": content,
@@ -249,14 +288,10 @@ class RecommendationService:
         random.shuffle(all_categories)
 
         recommendations = []
+        catalog = content_catalog.snapshot
         for category in all_categories[:2]:  # Pick 2 random categories
-            content_items = (
-                db.query(Content)
-                .filter(
-                    and_(Content.category == category, ~Content.id.in_(completed_ids))
-                )
-                .limit(2)
-                .all()
+            content_items = catalog.select(
+                categories=[category], exclude_ids=completed_ids, limit=2
             )
 
             for content in content_items:
@@ -347,7 +382,10 @@ class RecommendationService:
                 completed_at=datetime.now(),
             )
             db.add(activity_log)
+            content_popularity.record(db, [(content_id, activity_log.completed_at)])
             db.commit()
+            wellness_cache.invalidate(user_id)
+            activity_correlations.mark_dirty([user_id])
             
             return {"success": True, "message": "Activity logged successfully"}
         except Exception as e:
@@ -0,0 +1,137 @@
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import SensorDailyAggregate, SensorSample
+from app.services.sensor_service import AGGREGATED_FIELDS
+
+ARCHIVE_COLUMNS = ["id", "user_id", "timestamp"] + AGGREGATED_FIELDS
+
+# Rows per upsert statement (keeps SQLite under its bound-parameter limit)
+UPSERT_CHUNK_SIZE = 500
+
+
+class SensorCompactionService:
+    """
+    Retention job for raw sensor samples.
+
+    Samples older than the retention horizon are processed in id-ordered
+    batches: each batch is written to a zstd-compressed Parquet file, then
+    folded into sensor_daily_aggregates and deleted in one short
+    transaction. Archive files are named by id range and written
+    atomically, so an interrupted run can simply be started again.
+    """
+
+    def __init__(
+        self,
+        retention_days: int = settings.sensor_retention_days,
+        archive_dir: str = settings.sensor_archive_dir,
+        batch_size: int = settings.sensor_compaction_batch_size,
+    ):
+        self.retention_days = retention_days
+        self.archive_dir = archive_dir
+        self.batch_size = batch_size
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Start of the oldest day whose raw samples are kept"""
+        horizon = (now or datetime.now()) - timedelta(days=self.retention_days)
+        return horizon.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def raw_horizon(self, db: Session) -> Optional[datetime]:
+        """Start of the day after the latest compacted one (None if none are)"""
+        last_day = db.query(func.max(SensorDailyAggregate.day)).scalar()
+        if last_day is None:
+            return None
+        return datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+
+    def compact(self, db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Archive, aggregate and delete every sample older than the cutoff"""
+        cutoff = self.cutoff(now)
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        archived = 0
+        files: List[str] = []
+        while True:
+            frame = pd.read_sql(
+                select(*[getattr(SensorSample, column) for column in ARCHIVE_COLUMNS])
+                .where(SensorSample.timestamp < cutoff)
+                .order_by(SensorSample.id)
+                .limit(self.batch_size),
+                db.connection(),
+            )
+            # Release the read snapshot before the file write
+            db.commit()
+            if frame.empty:
+                break
+
+            files.append(self._archive(frame))
+
+            self._fold(db, frame)
+            db.query(SensorSample).filter(
+                SensorSample.id.in_(frame["id"].tolist())
+            ).delete(synchronize_session=False)
+            db.commit()
+
+            archived += len(frame)
+            print(f"Archived {archived} sensor samples (up to id {frame['id'].iloc[-1]})")
+
+        return {"cutoff": cutoff.isoformat(), "archived": archived, "files": files}
+
+    def _archive(self, frame: pd.DataFrame) -> str:
+        """Write one batch to Parquet; re-running a batch overwrites the same file"""
+        name = f"sensor_samples-{frame['id'].iloc[0]:012d}-{frame['id'].iloc[-1]:012d}.parquet"
+        path = os.path.join(self.archive_dir, name)
+        partial_path = path + ".partial"
+
+        frame.to_parquet(partial_path, engine="pyarrow", compression="zstd", index=False)
+        with open(partial_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(partial_path, path)
+        return path
+
+    def _fold(self, db: Session, frame: pd.DataFrame):
+        """Add a batch's per-day sums and counts to sensor_daily_aggregates"""
+        days = pd.to_datetime(frame["timestamp"]).dt.date
+        grouped = frame.groupby([frame["user_id"], days.rename("day")])[AGGREGATED_FIELDS]
+        sums = grouped.sum(min_count=0)
+        counts = grouped.count()
+        sizes = grouped.size()
+
+        rows = []
+        for (user_id, day), sample_count in sizes.items():
+            row = {"user_id": int(user_id), "day": day, "sample_count": int(sample_count)}
+            for field in AGGREGATED_FIELDS:
+                row[f"{field}_sum"] = float(sums.at[(user_id, day), field])
+                row[f"{field}_count"] = int(counts.at[(user_id, day), field])
+            rows.append(row)
+
+        for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            self._upsert(db, rows[offset : offset + UPSERT_CHUNK_SIZE])
+
+    def _upsert(self, db: Session, rows: List[Dict[str, Any]]):
+        if db.get_bind().dialect.name == "postgresql":
+            statement = postgresql_insert(SensorDailyAggregate).values(rows)
+        else:
+            statement = sqlite_insert(SensorDailyAggregate).values(rows)
+        excluded = statement.excluded
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id", "day"],
+                set_={
+                    column: getattr(SensorDailyAggregate, column) + getattr(excluded, column)
+                    for column in rows[0]
+                    if column not in ("user_id", "day")
+                },
+            )
+        )
+
+
+# Global instance
+sensor_compaction = SensorCompactionService()
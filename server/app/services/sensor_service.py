@@ -0,0 +1,205 @@
+import numbers
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from app.db.models import MoodLog, SensorDailyAggregate, SensorSample
+from app.services.ai_service import WEARABLE_DEFAULTS, ai_service
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SENSOR_FIELDS = list(WEARABLE_DEFAULTS)
+AGGREGATED_FIELDS = SENSOR_FIELDS + ["calculated_mood_score"]
+
+
+class SensorService:
+    """
+    Wearable readings stored as typed columns in sensor_samples.
+
+    Aggregates run in the database (GROUP BY over the user/timestamp
+    index) and re-scoring works on whole columns at once; nothing has to
+    parse per-row JSON.
+    """
+
+    def score_samples(self, samples: List[Any]) -> "np.ndarray":
+        """Mood scores for sample rows, treating NULL metrics as not reported"""
+        import numpy as np
+
+        return self.score_columns(
+            {
+                field: np.array([getattr(sample, field) for sample in samples], dtype=np.float64)
+                for field in SENSOR_FIELDS
+            }
+        )
+
+    def score_columns(self, columns: Dict[str, "np.ndarray"]) -> "np.ndarray":
+        """Mood scores for metric columns, where NaN means not reported"""
+        import numpy as np
+
+        return ai_service.score_wearable_arrays(
+            *[
+                np.where(np.isnan(columns[field]), default, columns[field])
+                for field, default in WEARABLE_DEFAULTS.items()
+            ]
+        )
+
+    def daily_averages(
+        self, db: Session, user_id: int, days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-day sample count and metric averages for the last N days, from
+        raw samples plus the daily sums kept for compacted ones.
+        """
+        cutoff_date = datetime.now() - timedelta(days=days)
+        day = func.date(SensorSample.timestamp).label("day")
+
+        raw_days = (
+            db.query(
+                day,
+                func.count(SensorSample.id).label("sample_count"),
+                *[
+                    column
+                    for field in AGGREGATED_FIELDS
+                    for column in (
+                        func.sum(getattr(SensorSample, field)).label(f"{field}_sum"),
+                        func.count(getattr(SensorSample, field)).label(f"{field}_count"),
+                    )
+                ],
+            )
+            .filter(
+                SensorSample.user_id == user_id,
+                SensorSample.timestamp >= cutoff_date,
+            )
+            .group_by(day)
+            .all()
+        )
+        compacted_days = (
+            db.query(SensorDailyAggregate)
+            .filter(
+                SensorDailyAggregate.user_id == user_id,
+                SensorDailyAggregate.day >= cutoff_date.date(),
+            )
+            .all()
+        )
+
+        totals: Dict[str, Dict[str, float]] = {}
+        for row in list(raw_days) + compacted_days:
+            total = totals.setdefault(str(row.day), defaultdict(float))
+            total["sample_count"] += row.sample_count
+            for field in AGGREGATED_FIELDS:
+                total[f"{field}_sum"] += getattr(row, f"{field}_sum") or 0.0
+                total[f"{field}_count"] += getattr(row, f"{field}_count")
+
+        return [
+            {
+                "date": date,
+                "samples": int(total["sample_count"]),
+                **{
+                    field: (
+                        total[f"{field}_sum"] / total[f"{field}_count"]
+                        if total[f"{field}_count"]
+                        else None
+                    )
+                    for field in AGGREGATED_FIELDS
+                },
+            }
+            for date, total in sorted(totals.items())
+        ]
+
+    def rescore_samples(self, db: Session, batch_size: int = 10000) -> int:
+        """Recompute calculated_mood_score for every sample, in id batches"""
+        rescored = 0
+        last_id = 0
+        while True:
+            rows = (
+                db.query(SensorSample.id, *[getattr(SensorSample, f) for f in SENSOR_FIELDS])
+                .filter(SensorSample.id > last_id)
+                .order_by(SensorSample.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return rescored
+
+            scores = self.score_samples(rows)
+            db.execute(
+                update(SensorSample),
+                [
+                    {"id": row.id, "calculated_mood_score": score}
+                    for row, score in zip(rows, scores.tolist())
+                ],
+            )
+            db.commit()
+
+            rescored += len(rows)
+            last_id = rows[-1].id
+
+    def migrate_mood_logs(self, db: Session, batch_size: int = 5000) -> int:
+        """
+        Move wearable readings stored as mood_logs JSON into sensor_samples.
+
+        Manual mood entries (those with a mood_rating) and readings with
+        non-numeric metrics stay where they are. Each batch is inserted and
+        deleted in one transaction, so the move can be stopped and re-run.
+        """
+        moved = 0
+        last_id = 0
+        while True:
+            logs = (
+                db.query(
+                    MoodLog.id,
+                    MoodLog.user_id,
+                    MoodLog.timestamp,
+                    MoodLog.raw_sensor_data,
+                    MoodLog.calculated_mood_score,
+                )
+                .filter(MoodLog.id > last_id)
+                .order_by(MoodLog.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not logs:
+                return moved
+
+            samples = []
+            moved_ids = []
+            for log in logs:
+                data = log.raw_sensor_data
+                if not isinstance(data, dict) or "mood_rating" in data:
+                    continue
+                reading = {field: data[field] for field in SENSOR_FIELDS if field in data}
+                if not reading or not all(
+                    isinstance(value, numbers.Real) for value in reading.values()
+                ):
+                    continue
+
+                score = log.calculated_mood_score
+                if score is None:
+                    score = ai_service.analyze_wearable_data(data)
+                samples.append(
+                    {
+                        "user_id": log.user_id,
+                        "timestamp": log.timestamp,
+                        "calculated_mood_score": score,
+                        **{field: reading.get(field) for field in SENSOR_FIELDS},
+                    }
+                )
+                moved_ids.append(log.id)
+
+            if samples:
+                db.execute(insert(SensorSample), samples)
+                db.query(MoodLog).filter(MoodLog.id.in_(moved_ids)).delete(
+                    synchronize_session=False
+                )
+            db.commit()
+
+            moved += len(samples)
+            last_id = logs[-1].id
+
+
+# Global instance
+sensor_service = SensorService()
@@ -0,0 +1,141 @@
+import hashlib
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Optional, Protocol, Sequence
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Scores within this distance of 0 count as neutral (VADER's usual cut-off)
+NEUTRAL_BAND = 0.05
+
+# Labels a trained model predicts: negative, neutral, positive
+SENTIMENT_LABELS = (-1, 0, 1)
+
+
+def sentiment_label(score: float) -> int:
+    """-1, 0 or 1 for a score, as used when checking accuracy"""
+    if score >= NEUTRAL_BAND:
+        return 1
+    if score <= -NEUTRAL_BAND:
+        return -1
+    return 0
+
+
+class SentimentBackend(Protocol):
+    """Scores journal texts from -1.0 (negative) to 1.0 (positive)"""
+
+    name: str
+    # Part of every sentiment cache key, so it must change whenever the
+    # scores could
+    version: str
+
+    def score_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        ...
+
+
+class VaderBackend:
+    """VADER's rule-based compound score; nothing to train"""
+
+    name = "vader"
+
+    def __init__(self):
+        try:
+            self.version = f"vader-{version('vaderSentiment')}"
+        except PackageNotFoundError:
+            self.version = "vader-unknown"
+        self._analyzer = None
+        self._lock = threading.Lock()
+
+    @property
+    def analyzer(self):
+        """Built on first use (it loads its lexicon files)"""
+        if self._analyzer is None:
+            with self._lock:
+                if self._analyzer is None:
+                    from vaderSentiment.vaderSentiment import \
+                        SentimentIntensityAnalyzer
+
+                    self._analyzer = SentimentIntensityAnalyzer()
+        return self._analyzer
+
+    def score_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        import numpy as np
+
+        polarity_scores = self.analyzer.polarity_scores
+        return np.array([polarity_scores(text)["compound"] for text in texts], dtype=np.float64)
+
+
+class SklearnBackend:
+    """
+    TF-IDF features and a linear classifier over -1/0/1 labels, trained
+    offline (train_sentiment_model.py) and loaded with joblib. A text's
+    score is its probability-weighted label, so a batch is one sparse
+    transform and one matrix product.
+    """
+
+    name = "sklearn"
+
+    def __init__(self, model_path: str):
+        if not model_path:
+            raise ValueError("SENTIMENT_MODEL_PATH must be set to use the sklearn backend")
+        self.model_path = model_path
+        with open(model_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self.version = f"sklearn-{digest[:16]}"
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        """Loaded on first use (importing scikit-learn is slow)"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import joblib
+
+                    self._model = joblib.load(self.model_path)
+        return self._model
+
+    def score_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        import numpy as np
+
+        if not texts:
+            return np.zeros(0, dtype=np.float64)
+        probabilities = self.model.predict_proba(list(texts))
+        return probabilities @ self.model.classes_.astype(np.float64)
+
+
+def make_backend(
+    name: str = settings.sentiment_backend,
+    model_path: Optional[str] = settings.sentiment_model_path,
+) -> SentimentBackend:
+    """The sentiment backend selected by SENTIMENT_BACKEND"""
+    if name == VaderBackend.name:
+        return VaderBackend()
+    if name == SklearnBackend.name:
+        return SklearnBackend(model_path)
+    raise ValueError(f"Unknown sentiment backend: {name}")
+
+
+def train_sklearn_model(texts: Sequence[str], labels: Sequence[int], path: str):
+    """Fit a TF-IDF + logistic regression model on labelled texts and save it"""
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    unknown = set(labels) - set(SENTIMENT_LABELS)
+    if unknown:
+        raise ValueError(f"Labels must be -1, 0 or 1, got {sorted(unknown)}")
+
+    model = make_pipeline(
+        # Keep case and bigrams: "not good" and "GREAT" carry sentiment
+        TfidfVectorizer(lowercase=False, ngram_range=(1, 2), sublinear_tf=True),
+        LogisticRegression(max_iter=1000),
+    )
+    model.fit(list(texts), list(labels))
+    joblib.dump(model, path)
+    return model
@@ -0,0 +1,208 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Writes from one process between checks of the disk table's size
+PRUNE_EVERY_WRITES = 1000
+
+COUNTERS = ("memory_hits", "disk_hits", "misses", "pruned")
+
+
+class SentimentCache:
+    """
+    Content-addressed memo cache for sentiment scores.
+
+    Scores are keyed by a hash of the normalized text and the analyzer version,
+    held in an in-process LRU and backed by a local SQLite file so that every
+    worker process on the host shares the same results. Rows record when they
+    were last used, and every PRUNE_EVERY_WRITES writes a process trims the
+    file back to max_disk_entries, least recently used first.
+
+    Lookups mostly happen in the sentiment pipeline's pool workers; their
+    counters are merged back into the API process's after every batch.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.sentiment_cache_path,
+        max_entries: int = settings.sentiment_cache_size,
+        max_disk_entries: int = settings.sentiment_cache_disk_size,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._writes_since_prune = 0
+
+        # Metrics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.pruned = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text without changing what the analyzer sees"""
+        # VADER is case-sensitive (caps add emphasis), so only fold
+        # unicode forms and whitespace
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @classmethod
+    def make_key(cls, text: str, analyzer_version: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(analyzer_version.encode())
+        digest.update(b"\0")
+        digest.update(cls.normalize(text).encode())
+        return digest.hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not be shared across a fork
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache "
+                "(key TEXT PRIMARY KEY, score REAL NOT NULL, last_used REAL NOT NULL DEFAULT 0)"
+            )
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(sentiment_cache)")]
+            if "last_used" not in columns:
+                # Files from before eviction; their rows count as least recently used
+                conn.execute(
+                    "ALTER TABLE sentiment_cache ADD COLUMN last_used REAL NOT NULL DEFAULT 0"
+                )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS sentiment_cache_last_used "
+                "ON sentiment_cache (last_used)"
+            )
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = os.getpid()
+            self._writes_since_prune = 0
+        return self._conn
+
+    def _remember(self, key: str, score: float):
+        self._memory[key] = score
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[float]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        """Cached scores for whichever keys have one"""
+        with self._lock:
+            found: Dict[str, float] = {}
+            missing: List[str] = []
+            for key in dict.fromkeys(keys):
+                score = self._memory.get(key)
+                if score is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = score
+                else:
+                    missing.append(key)
+            self.memory_hits += len(found)
+
+            rows: List[Tuple[str, float]] = []
+            try:
+                conn = self._connection()
+                if missing:
+                    placeholders = ",".join("?" * len(missing))
+                    rows = conn.execute(
+                        f"SELECT key, score FROM sentiment_cache WHERE key IN ({placeholders})",
+                        missing,
+                    ).fetchall()
+                # Memory hits count as uses too, or hot keys would age out on disk
+                used = list(found) + [key for key, _ in rows]
+                if used:
+                    placeholders = ",".join("?" * len(used))
+                    conn.execute(
+                        f"UPDATE sentiment_cache SET last_used = ? WHERE key IN ({placeholders})",
+                        [time.time(), *used],
+                    )
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error reading sentiment cache: {e}")
+
+            for key, score in rows:
+                self._remember(key, score)
+                found[key] = score
+            self.disk_hits += len(rows)
+            self.misses += len(missing) - len(rows)
+            return found
+
+    def set(self, key: str, score: float):
+        self.set_many([(key, score)])
+
+    def set_many(self, items: Iterable[Tuple[str, float]]):
+        items = list(items)
+        with self._lock:
+            for key, score in items:
+                self._remember(key, score)
+            try:
+                conn = self._connection()
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache (key, score, last_used) VALUES (?, ?, ?)",
+                    [(key, score, now) for key, score in items],
+                )
+                conn.commit()
+                self._writes_since_prune += len(items)
+                if self._writes_since_prune >= PRUNE_EVERY_WRITES:
+                    self._writes_since_prune = 0
+                    self._prune(conn)
+            except sqlite3.Error as e:
+                print(f"Error writing sentiment cache: {e}")
+
+    def _prune(self, conn: sqlite3.Connection):
+        """Delete the least recently used rows beyond max_disk_entries"""
+        row = conn.execute(
+            "SELECT last_used FROM sentiment_cache ORDER BY last_used DESC LIMIT 1 OFFSET ?",
+            (self.max_disk_entries,),
+        ).fetchone()
+        if row is None:
+            return
+        deleted = conn.execute(
+            "DELETE FROM sentiment_cache WHERE last_used <= ?", (row[0],)
+        ).rowcount
+        conn.commit()
+        self.pruned += deleted
+
+    def counters(self) -> Dict[str, int]:
+        """Counters so far, to send to another process's merge()"""
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def merge(self, counts: Dict[str, int]):
+        """Add the counters a worker process reported"""
+        with self._lock:
+            for name in COUNTERS:
+                setattr(self, name, getattr(self, name) + counts.get(name, 0))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics for this process and its sentiment pool workers"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "max_disk_entries": self.max_disk_entries,
+            "pruned": self.pruned,
+        }
+
+
+# Global instance
+sentiment_cache = SentimentCache()
@@ -0,0 +1,262 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import JournalEntry
+from app.services.activity_correlations import activity_correlations
+from app.services.sentiment_cache import sentiment_cache
+from app.services.wellness_cache import wellness_cache
+
+# Score POST /journal/entries stored before entries went through the pipeline
+PLACEHOLDER_SENTIMENT_SCORE = 0.5
+
+# Entries per UPDATE when clearing placeholder scores
+REQUEUE_CHUNK_SIZE = 500
+
+
+def _score_texts(texts: List[str]) -> Tuple[List[float], Dict[str, int]]:
+    """
+    Score a batch of journal texts inside a pool worker process. Also
+    returns the batch's sentiment cache counts for the parent to merge.
+    """
+    from app.services.ai_service import ai_service
+
+    before = sentiment_cache.counters()
+    scores = ai_service.analyze_journal_sentiment_batch(texts)
+    counts = {name: count - before[name] for name, count in sentiment_cache.counters().items()}
+    return scores, counts
+
+
+class SentimentPipeline:
+    """
+    Queue of journal entry IDs consumed by a process pool.
+
+    A dispatcher thread drains the queue into micro-batches and hands each
+    batch to a worker process (keeping the model off the request-handling
+    GIL). Up to `workers` batches are scored at once; when a batch finishes,
+    its scores are written back with a single bulk UPDATE using a session of
+    its own. Further batches wait in the queue until a worker frees up.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.sentiment_workers,
+        batch_size: int = settings.sentiment_batch_size,
+        batch_wait_ms: int = settings.sentiment_batch_wait_ms,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # One slot per worker process, held from dispatch until write-back
+        self._slots = threading.BoundedSemaphore(workers)
+        self._metrics_lock = threading.Lock()
+
+        # Metrics
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batches_processed = 0
+        self.entries_scored = 0
+        self.failed_batches = 0
+        self.last_batch_latency_ms = 0.0
+        self.max_batch_latency_ms = 0.0
+        self._total_batch_latency_ms = 0.0
+
+    def start(self):
+        """Start the process pool and the dispatcher thread"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            # Spin the workers up before the dispatcher thread exists
+            self._executor.submit(_score_texts, []).result()
+            self._thread = threading.Thread(
+                target=self._run, name="sentiment-pipeline", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Drain outstanding work and shut the pool down"""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            # Wait for batches still being scored to be written back
+            for _ in range(self.workers):
+                self._slots.acquire()
+            for _ in range(self.workers):
+                self._slots.release()
+            self._executor.shutdown()
+            self._thread = None
+            self._executor = None
+
+    def submit(self, journal_entry_id: int):
+        """Queue a journal entry for sentiment scoring"""
+        if self._thread is None:
+            self.start()
+        self._queue.put(journal_entry_id)
+
+    def requeue_unscored(self, db: Session) -> int:
+        """
+        Clear placeholder scores and queue every unscored entry, e.g. after
+        a deploy. An entry genuinely scored 0.5 is just scored again.
+        """
+        placeholder_ids = [
+            entry_id
+            for (entry_id,) in db.query(JournalEntry.id).filter(
+                JournalEntry.sentiment_score == PLACEHOLDER_SENTIMENT_SCORE
+            )
+        ]
+        for offset in range(0, len(placeholder_ids), REQUEUE_CHUNK_SIZE):
+            db.execute(
+                update(JournalEntry)
+                .where(JournalEntry.id.in_(placeholder_ids[offset : offset + REQUEUE_CHUNK_SIZE]))
+                .values(sentiment_score=None)
+            )
+        db.commit()
+
+        entry_ids = [
+            entry_id
+            for (entry_id,) in db.query(JournalEntry.id)
+            .filter(JournalEntry.sentiment_score.is_(None))
+            .order_by(JournalEntry.id)
+        ]
+        for entry_id in entry_ids:
+            self.submit(entry_id)
+        return len(entry_ids)
+
+    def _next_batch(self) -> Optional[List[int]]:
+        """Block for the first ID, then collect more until full or timed out"""
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry_id = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry_id is None:
+                # Finish this batch, then let the loop see the sentinel
+                self._queue.put(None)
+                break
+            batch.append(entry_id)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._slots.acquire()
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                self._slots.release()
+                with self._metrics_lock:
+                    self.failed_batches += 1
+                print(f"Error processing sentiment batch: {e}")
+
+    def _dispatch(self, entry_ids: List[int]):
+        """Send a batch to a worker; the slot is released once it is written back"""
+        started = time.perf_counter()
+
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(JournalEntry.id, JournalEntry.user_id, JournalEntry.entry_text)
+                .filter(JournalEntry.id.in_(set(entry_ids)))
+                .all()
+            )
+        finally:
+            db.close()
+        if not rows:
+            self._slots.release()
+            return
+
+        future = self._executor.submit(_score_texts, [row.entry_text for row in rows])
+        with self._metrics_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        future.add_done_callback(
+            lambda future: self._write_back(rows, future, started)
+        )
+
+    def _write_back(self, rows: List[Any], future: Future, started: float):
+        """Store a finished batch's scores (runs on the pool's result thread)"""
+        try:
+            scores, cache_counts = future.result()
+            sentiment_cache.merge(cache_counts)
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(JournalEntry),
+                    [
+                        {"id": row.id, "sentiment_score": score}
+                        for row, score in zip(rows, scores)
+                    ],
+                )
+                db.commit()
+            finally:
+                db.close()
+            activity_correlations.mark_dirty(row.user_id for row in rows)
+            # Wellness scores only count entries once they are scored
+            wellness_cache.invalidate_many(row.user_id for row in rows)
+        except Exception as e:
+            with self._metrics_lock:
+                self.failed_batches += 1
+            print(f"Error processing sentiment batch: {e}")
+        else:
+            latency_ms = (time.perf_counter() - started) * 1000
+            with self._metrics_lock:
+                self.batches_processed += 1
+                self.entries_scored += len(rows)
+                self.last_batch_latency_ms = latency_ms
+                self.max_batch_latency_ms = max(self.max_batch_latency_ms, latency_ms)
+                self._total_batch_latency_ms += latency_ms
+        finally:
+            with self._metrics_lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and per-batch latency metrics"""
+        avg_latency = (
+            self._total_batch_latency_ms / self.batches_processed
+            if self.batches_processed
+            else 0.0
+        )
+        return {
+            "running": self._thread is not None,
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "batches_processed": self.batches_processed,
+            "entries_scored": self.entries_scored,
+            "failed_batches": self.failed_batches,
+            "last_batch_latency_ms": round(self.last_batch_latency_ms, 2),
+            "avg_batch_latency_ms": round(avg_latency, 2),
+            "max_batch_latency_ms": round(self.max_batch_latency_ms, 2),
+        }
+
+
+# Global instance
+sentiment_pipeline = SentimentPipeline()
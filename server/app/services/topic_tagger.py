@@ -0,0 +1,151 @@
+import json
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import JournalEntry, JournalEntryTag
+
+DEFAULT_TOPIC_LEXICON: Dict[str, List[str]] = {
+    "sleep": [
+        "sleep", "sleeps", "sleeping", "slept", "sleepy", "sleepless",
+        "tired", "tiredness", "exhausted", "exhausting", "exhaustion",
+        "insomnia", "rest", "rested", "resting", "restless", "nap", "naps",
+        "napped", "napping", "fatigue", "fatigued",
+    ],
+    "stress": [
+        "stress", "stressed", "stresses", "stressful", "stressing", "anxious",
+        "anxiety", "overwhelmed", "overwhelming", "panic", "panicked",
+        "panicking", "worried", "worry", "worrying", "nervous", "tense",
+    ],
+    "work": [
+        "work", "works", "worked", "working", "job", "jobs", "boss",
+        "deadline", "deadlines", "meeting", "meetings", "office",
+        "colleague", "colleagues", "career",
+    ],
+}
+
+
+class TopicTagger:
+    """
+    Multi-pattern keyword matcher (Aho-Corasick) that maps journal text to
+    topic tags in a single pass, however many keywords the lexicon holds.
+
+    Keywords match whole words, case-insensitively: "rest" matches neither
+    "interest" nor "restaurant", and "work" does not match "workout". The
+    lexicon lists each inflection it should match ("stress", "stressed",
+    "stressful").
+    """
+
+    def __init__(self, lexicon: Dict[str, List[str]]):
+        self.lexicon = lexicon
+        # Trie stored as parallel lists indexed by node id
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+
+        for topic, keywords in lexicon.items():
+            for keyword in keywords:
+                self._add(keyword.lower(), topic)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, topic: str):
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(keyword), topic))
+
+    def _build_failure_links(self):
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self._goto[node].items():
+                pending.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def tag(self, text: str) -> List[str]:
+        """Return the sorted topics whose keywords appear in text"""
+        topics: Set[str] = set()
+        text = text.lower()
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if not self._output[node]:
+                continue
+            end = position + 1
+            if end < len(text) and text[end].isalnum():
+                continue
+            for length, topic in self._output[node]:
+                start = position - length + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    topics.add(topic)
+        return sorted(topics)
+
+    def build_tags(self, user_id: int, text: str) -> List[JournalEntryTag]:
+        """Tag rows for a new journal entry (assign to entry.topic_tags)"""
+        return [JournalEntryTag(user_id=user_id, tag=tag) for tag in self.tag(text)]
+
+    def retag_entries(self, db: Session, batch_size: int = 1000) -> int:
+        """Recompute tags for every journal entry, e.g. after a lexicon change"""
+        tagged = 0
+        last_id = 0
+        while True:
+            entries = (
+                db.query(
+                    JournalEntry.id,
+                    JournalEntry.user_id,
+                    JournalEntry.entry_text,
+                    JournalEntry.created_at,
+                )
+                .filter(JournalEntry.id > last_id)
+                .order_by(JournalEntry.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not entries:
+                return tagged
+
+            entry_ids = [entry.id for entry in entries]
+            db.query(JournalEntryTag).filter(
+                JournalEntryTag.journal_entry_id.in_(entry_ids)
+            ).delete(synchronize_session=False)
+            for entry in entries:
+                for tag in self.tag(entry.entry_text):
+                    db.add(
+                        JournalEntryTag(
+                            journal_entry_id=entry.id,
+                            user_id=entry.user_id,
+                            tag=tag,
+                            created_at=entry.created_at,
+                        )
+                    )
+            db.commit()
+
+            tagged += len(entries)
+            last_id = entry_ids[-1]
+
+
+def load_lexicon(path: Optional[str] = settings.topic_lexicon_path) -> Dict[str, List[str]]:
+    """Load the topic lexicon from a JSON file, or fall back to the defaults"""
+    if not path:
+        return DEFAULT_TOPIC_LEXICON
+    with open(path) as f:
+        return json.load(f)
+
+
+# Global instance
+topic_tagger = TopicTagger(load_lexicon())
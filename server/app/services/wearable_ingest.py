@@ -0,0 +1,279 @@
+import csv
+import io
+import numbers
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import SensorSample
+from app.db.schemas import WearableSample
+from app.services.activity_correlations import activity_correlations
+from app.services.anomaly_detector import anomaly_detector
+from app.services.mood_rollups import mood_rollups
+from app.services.sensor_service import SENSOR_FIELDS, sensor_service
+from app.services.wellness_cache import wellness_cache
+
+if TYPE_CHECKING:
+    import numpy as np
+
+COPY_COLUMNS = ["user_id", "timestamp"] + SENSOR_FIELDS + ["calculated_mood_score"]
+COPY_SENSOR_SAMPLES = (
+    f"COPY sensor_samples ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+)
+
+# Packed binary batch format, selected with this Content-Type:
+#   8-byte header: b"UPWS", format version (uint8), 3 reserved bytes
+#   then one 28-byte little-endian record per sample: Unix time in
+#   milliseconds (int64, UTC) and each metric as float32, NaN when the
+#   device did not report it
+PACKED_SAMPLES_CONTENT_TYPE = "application/vnd.uplook.wearable-samples"
+PACKED_SAMPLES_MAGIC = b"UPWS"
+PACKED_SAMPLES_VERSION = 1
+PACKED_SAMPLES_HEADER_SIZE = 8
+# NumPy dtype spec for one record (kept as a list so that importing this
+# module doesn't import NumPy)
+PACKED_SAMPLE_FIELDS = [("timestamp_ms", "<i8")] + [(field, "<f4") for field in SENSOR_FIELDS]
+PACKED_SAMPLE_SIZE = 8 + 4 * len(SENSOR_FIELDS)
+
+# Accepted sample timestamps, packed or JSON: from 2000-01-01 (earlier means
+# an unset device clock) to this far ahead of the server's clock
+PACKED_TIMESTAMP_MIN_MS = 946684800000
+PACKED_TIMESTAMP_MAX_SKEW_SECONDS = 300
+
+# Packed timestamps share a UTC offset within each of these (DST changes
+# happen on quarter hours everywhere)
+LOCAL_OFFSET_BUCKET_MS = 15 * 60 * 1000
+
+# Accepted metric ranges (inclusive), as in WearableSample
+SENSOR_BOUNDS = {
+    "heart_rate": (0, 300),
+    "hrv": (0, 500),
+    "stress_level": (0, 100),
+    "sleep_quality": (0, 100),
+    "activity_level": (0, 1000),
+}
+
+Columns = Tuple["np.ndarray", Dict[str, "np.ndarray"]]
+
+
+def check_reading(raw_data: Dict[str, Any]) -> Dict[str, float]:
+    """
+    The typed metrics in a single raw reading (other keys are left out).
+    Raises ValueError if one is not a finite number within SENSOR_BOUNDS.
+    """
+    reading = {}
+    for field, (low, high) in SENSOR_BOUNDS.items():
+        value = raw_data.get(field)
+        if value is None:
+            continue
+        # NaN fails the range check as well
+        if isinstance(value, bool) or not isinstance(value, numbers.Real) or not low <= value <= high:
+            raise ValueError(f"{field} must be a finite number from {low} to {high}")
+        reading[field] = float(value)
+    return reading
+
+
+def samples_to_columns(samples: List[WearableSample]) -> Columns:
+    """
+    Validated JSON samples as (datetime64 timestamps, float64 metric columns).
+    Raises ValueError naming the first sample whose timestamp is out of range.
+    """
+    import numpy as np
+
+    timestamps = np.array([sample.timestamp for sample in samples], dtype="datetime64[us]")
+    earliest = np.datetime64(datetime.fromtimestamp(PACKED_TIMESTAMP_MIN_MS / 1000), "us")
+    latest = np.datetime64(datetime.fromtimestamp(time.time() + PACKED_TIMESTAMP_MAX_SKEW_SECONDS), "us")
+    out_of_range = (timestamps < earliest) | (timestamps > latest)
+    if out_of_range.any():
+        index = int(np.argmax(out_of_range))
+        raise ValueError(f"Sample {index}: timestamp out of range")
+    columns = {
+        field: np.array([getattr(sample, field) for sample in samples], dtype=np.float64)
+        for field in SENSOR_FIELDS
+    }
+    return timestamps, columns
+
+
+def epoch_ms_to_local(timestamp_ms: "np.ndarray") -> "np.ndarray":
+    """
+    Epoch milliseconds as naive local datetime64[us], the convention of
+    every sensor table (rows elsewhere are stamped with datetime.now())
+    """
+    import numpy as np
+
+    buckets, bucket_of_sample = np.unique(
+        timestamp_ms // LOCAL_OFFSET_BUCKET_MS, return_inverse=True
+    )
+    offsets_ms = np.array(
+        [
+            time.localtime(int(bucket) * LOCAL_OFFSET_BUCKET_MS // 1000).tm_gmtoff * 1000
+            for bucket in buckets
+        ],
+        dtype=np.int64,
+    )
+    local_ms = timestamp_ms + offsets_ms[bucket_of_sample.reshape(-1)]
+    return local_ms.astype("datetime64[ms]").astype("datetime64[us]")
+
+
+def decode_packed_samples(body: bytes, max_samples: int) -> Columns:
+    """
+    Decode and validate a packed batch straight into NumPy columns.
+    Raises ValueError describing the first problem found.
+    """
+    import numpy as np
+
+    header = body[:PACKED_SAMPLES_HEADER_SIZE]
+    if len(header) < PACKED_SAMPLES_HEADER_SIZE or header[:4] != PACKED_SAMPLES_MAGIC:
+        raise ValueError("Missing packed sample header")
+    if header[4] != PACKED_SAMPLES_VERSION:
+        raise ValueError(f"Unsupported packed sample version {header[4]}")
+
+    payload_size = len(body) - PACKED_SAMPLES_HEADER_SIZE
+    if payload_size % PACKED_SAMPLE_SIZE:
+        raise ValueError(
+            f"Payload is not a whole number of {PACKED_SAMPLE_SIZE}-byte records"
+        )
+    count = payload_size // PACKED_SAMPLE_SIZE
+    if not 1 <= count <= max_samples:
+        raise ValueError(f"Batch must contain between 1 and {max_samples} samples")
+
+    records = np.frombuffer(body, dtype=PACKED_SAMPLE_FIELDS, offset=PACKED_SAMPLES_HEADER_SIZE)
+    # Checked before converting, as far-off values overflow microseconds silently
+    timestamp_ms = records["timestamp_ms"]
+    latest_ms = int((time.time() + PACKED_TIMESTAMP_MAX_SKEW_SECONDS) * 1000)
+    out_of_range = (timestamp_ms < PACKED_TIMESTAMP_MIN_MS) | (timestamp_ms > latest_ms)
+    if out_of_range.any():
+        index = int(np.argmax(out_of_range))
+        raise ValueError(f"Sample {index}: timestamp out of range")
+    timestamps = epoch_ms_to_local(timestamp_ms)
+
+    columns = {}
+    for field, (low, high) in SENSOR_BOUNDS.items():
+        column = records[field].astype(np.float64)
+        reported = ~np.isnan(column)
+        # Infinities fail these comparisons too
+        out_of_range = reported & ((column < low) | (column > high))
+        if out_of_range.any():
+            index = int(np.argmax(out_of_range))
+            raise ValueError(f"Sample {index}: {field} out of range")
+        columns[field] = column
+    return timestamps, columns
+
+
+def _nullable(values: "np.ndarray") -> List[Any]:
+    """Column values as Python floats, with NaN as None (NULL)"""
+    return [None if value != value else value for value in values.tolist()]
+
+
+class WearableIngestService:
+    """
+    Bulk ingest for buffered wearable readings.
+
+    A batch arrives as metric columns (from JSON or the packed binary
+    format), is scored in one vectorized pass and written as a single
+    multi-row INSERT (COPY on PostgreSQL) with the mood score already
+    filled in, so there is no per-sample commit or follow-up scoring task.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.batches_ingested = 0
+        self.samples_ingested = 0
+        self._ingest_seconds = 0.0
+
+    def ingest(
+        self,
+        db: Session,
+        user_id: int,
+        timestamps: "np.ndarray",
+        columns: Dict[str, "np.ndarray"],
+    ) -> Dict[str, Any]:
+        """Score and store a batch of samples for a user"""
+        started = time.perf_counter()
+
+        scores = sensor_service.score_columns(columns)
+        score_values = scores.tolist()
+        timestamp_values: List[datetime] = timestamps.tolist()
+        metric_values = {field: _nullable(columns[field]) for field in SENSOR_FIELDS}
+
+        rows = [
+            {
+                "user_id": user_id,
+                "timestamp": timestamp_values[i],
+                **{field: metric_values[field][i] for field in SENSOR_FIELDS},
+                "calculated_mood_score": score_values[i],
+            }
+            for i in range(len(score_values))
+        ]
+
+        if db.get_bind().dialect.name == "postgresql":
+            self._copy_rows(db, rows)
+        else:
+            db.execute(insert(SensorSample), rows)
+        mood_rollups.record(
+            db,
+            (
+                (user_id, timestamp, score)
+                for timestamp, score in zip(timestamp_values, score_values)
+            ),
+        )
+        anomaly_detector.observe(db, ((user_id, row["timestamp"], row) for row in rows))
+        db.commit()
+        wellness_cache.invalidate(user_id)
+        activity_correlations.mark_dirty([user_id])
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.batches_ingested += 1
+            self.samples_ingested += len(rows)
+            self._ingest_seconds += elapsed
+
+        return {
+            "accepted": len(rows),
+            "first_timestamp": timestamps.min().item(),
+            "last_timestamp": timestamps.max().item(),
+            "average_mood_score": float(scores.mean()),
+        }
+
+    def _copy_rows(self, db: Session, rows: List[Dict[str, Any]]):
+        """Stream rows through COPY on the session's own connection"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # csv writes None as an empty field, which COPY reads as NULL
+            writer.writerow(
+                [
+                    row[column].isoformat() if column == "timestamp" else row[column]
+                    for column in COPY_COLUMNS
+                ]
+            )
+        buffer.seek(0)
+
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(COPY_SENSOR_SAMPLES, buffer)
+        finally:
+            cursor.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Ingest counters for the admin metrics endpoint"""
+        with self._lock:
+            return {
+                "batches_ingested": self.batches_ingested,
+                "samples_ingested": self.samples_ingested,
+                "samples_per_second": (
+                    round(self.samples_ingested / self._ingest_seconds, 1)
+                    if self._ingest_seconds
+                    else 0.0
+                ),
+            }
+
+
+# Global instance
+wearable_ingest = WearableIngestService()
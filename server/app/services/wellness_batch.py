@@ -0,0 +1,167 @@
+import io
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.models import JournalEntry, MoodLog, SensorSample, User, WellnessScore
+from app.services.ai_service import (WELLNESS_IMPROVING_ABOVE,
+                                     WELLNESS_MOOD_WEIGHT,
+                                     WELLNESS_SENTIMENT_WEIGHT,
+                                     WELLNESS_WINDOW_DAYS)
+
+SCORE_COLUMNS = [
+    "user_id",
+    "overall_score",
+    "sentiment_component",
+    "mood_component",
+    "trend",
+    "computed_at",
+]
+COPY_WELLNESS_SCORES = (
+    f"COPY wellness_scores ({', '.join(SCORE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+)
+
+
+def score_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Wellness scores from per-user sentiment and mood sums and counts, with
+    the same defaults, weights and rounding as calculate_wellness_score
+    """
+    sentiment = np.where(
+        frame["sentiment_count"] > 0,
+        (frame["sentiment_sum"] / frame["sentiment_count"].clip(lower=1) + 1) / 2,
+        0.5,
+    )
+    mood = np.where(
+        frame["mood_count"] > 0,
+        frame["mood_sum"] / frame["mood_count"].clip(lower=1),
+        0.5,
+    )
+    overall = (sentiment * WELLNESS_SENTIMENT_WEIGHT + mood * WELLNESS_MOOD_WEIGHT) * 100
+
+    return pd.DataFrame(
+        {
+            "user_id": frame["user_id"].to_numpy(),
+            "overall_score": np.round(overall, 1),
+            "sentiment_component": np.round(sentiment * 100, 1),
+            "mood_component": np.round(mood * 100, 1),
+            "trend": np.where(
+                overall > WELLNESS_IMPROVING_ABOVE, "improving", "needs_attention"
+            ),
+        }
+    )
+
+
+class WellnessBatchService:
+    """
+    Population-wide wellness scores for the nightly job.
+
+    A week of journal sentiment and mood scores is reduced to per-user sums
+    and counts by three GROUP BY queries, scored for every user at once
+    with pandas/NumPy, and written as a fresh wellness_scores snapshot in
+    one transaction (COPY on PostgreSQL), so readers never see a half-
+    written run. Journal sentiment comes from the stored scores written by
+    the sentiment pipeline rather than re-running VADER per entry; entries
+    it has not scored yet are skipped, as in calculate_wellness_score.
+    """
+
+    def __init__(self, window_days: int = WELLNESS_WINDOW_DAYS, write_chunk_size: int = 10000):
+        self.window_days = window_days
+        self.write_chunk_size = write_chunk_size
+
+    def aggregates(self, db: Session, since: datetime) -> pd.DataFrame:
+        """One row per user with sentiment and mood sums and counts since a time"""
+        connection = db.connection()
+        users = pd.read_sql(select(User.id.label("user_id")), connection)
+        sentiment = pd.read_sql(
+            select(
+                JournalEntry.user_id,
+                func.sum(JournalEntry.sentiment_score).label("sentiment_sum"),
+                func.count(JournalEntry.sentiment_score).label("sentiment_count"),
+            )
+            .where(
+                JournalEntry.created_at >= since,
+                JournalEntry.sentiment_score.isnot(None),
+            )
+            .group_by(JournalEntry.user_id),
+            connection,
+        )
+        mood = pd.concat(
+            [
+                pd.read_sql(
+                    select(
+                        model.user_id,
+                        func.sum(model.calculated_mood_score).label("mood_sum"),
+                        func.count(model.calculated_mood_score).label("mood_count"),
+                    )
+                    .where(model.timestamp >= since)
+                    .group_by(model.user_id),
+                    connection,
+                )
+                for model in (MoodLog, SensorSample)
+            ]
+        )
+        mood = mood.groupby("user_id", as_index=False).sum()
+
+        frame = users.merge(sentiment, on="user_id", how="left").merge(
+            mood, on="user_id", how="left"
+        )
+        # Empty aggregates come back as object columns, so fix the dtypes too
+        defaults = {"sentiment_sum": 0.0, "sentiment_count": 0, "mood_sum": 0.0, "mood_count": 0}
+        return frame.fillna(defaults).astype({column: type(value) for column, value in defaults.items()})
+
+    def compute(self, db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Score every user and replace the wellness_scores snapshot"""
+        now = now or datetime.now()
+
+        started = time.perf_counter()
+        frame = self.aggregates(db, now - timedelta(days=self.window_days))
+        queried = time.perf_counter()
+        scores = score_frame(frame)
+        scores["computed_at"] = now
+        scored = time.perf_counter()
+
+        db.query(WellnessScore).delete(synchronize_session=False)
+        if db.get_bind().dialect.name == "postgresql":
+            self._copy_scores(db, scores)
+        else:
+            for offset in range(0, len(scores), self.write_chunk_size):
+                chunk = scores.iloc[offset : offset + self.write_chunk_size]
+                db.execute(
+                    insert(WellnessScore),
+                    [
+                        dict(zip(SCORE_COLUMNS, row))
+                        for row in chunk[SCORE_COLUMNS].itertuples(index=False)
+                    ],
+                )
+        db.commit()
+        written = time.perf_counter()
+
+        return {
+            "users": len(scores),
+            "improving": int((scores["trend"] == "improving").sum()),
+            "computed_at": now.isoformat(),
+            "query_seconds": round(queried - started, 3),
+            "score_seconds": round(scored - queried, 3),
+            "write_seconds": round(written - scored, 3),
+        }
+
+    def _copy_scores(self, db: Session, scores: pd.DataFrame):
+        buffer = io.StringIO()
+        scores[SCORE_COLUMNS].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(COPY_WELLNESS_SCORES, buffer)
+        finally:
+            cursor.close()
+
+
+# Global instance
+wellness_batch = WellnessBatchService()
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import WellnessDataVersion
+
+
+class WellnessCache:
+    """
+    Per-user memo of the computed wellness score.
+
+    Writers call invalidate() after committing a journal entry, mood log,
+    sensor sample or activity for a user. That drops this worker's entry and
+    bumps the user's row in wellness_data_versions; every cached score
+    carries the version read before it was computed, and a hit is only
+    served while the version still matches, so other workers recompute on
+    their next read too. A hit costs one primary-key lookup instead of the
+    scoring queries. Entries are held in an LRU bounded by max_entries and
+    also expire after ttl_seconds, which covers data ageing out of the
+    scoring window.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.wellness_cache_size,
+        ttl_seconds: int = settings.wellness_cache_ttl_seconds,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        # user_id -> (expires at, data version, score)
+        self._memory: "OrderedDict[int, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        # Computations in flight, so an invalidation that lands mid-compute
+        # stops the (possibly stale) result from being stored
+        self._computing: Dict[int, object] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.failed_bumps = 0
+
+    def _version(self, db: Session, user_id: int) -> int:
+        return (
+            db.query(WellnessDataVersion.version)
+            .filter(WellnessDataVersion.user_id == user_id)
+            .scalar()
+        ) or 0
+
+    def get_or_compute(
+        self, db: Session, user_id: int, compute: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Cached score for a user, computing and storing it on a miss"""
+        version = self._version(db, user_id)
+        with self._lock:
+            entry = self._memory.get(user_id)
+            if entry is not None and time.monotonic() < entry[0]:
+                if entry[1] == version:
+                    self._memory.move_to_end(user_id)
+                    self.hits += 1
+                    return dict(entry[2])
+                # Another worker committed data for this user
+                self.stale_hits += 1
+            self.misses += 1
+            token = object()
+            self._computing[user_id] = token
+
+        score = compute()
+
+        with self._lock:
+            if self._computing.get(user_id) is token:
+                del self._computing[user_id]
+                self._memory[user_id] = (time.monotonic() + self.ttl, version, score)
+                self._memory.move_to_end(user_id)
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+                    self.evictions += 1
+        return dict(score)
+
+    def invalidate(self, user_id: int):
+        """Drop a user's score everywhere after new data for them is committed"""
+        self.invalidate_many([user_id])
+
+    def invalidate_many(self, user_ids: Iterable[int]):
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return
+        with self._lock:
+            for user_id in user_ids:
+                self._memory.pop(user_id, None)
+                self._computing.pop(user_id, None)
+            self.invalidations += len(user_ids)
+        self._bump(user_ids)
+
+    def _bump(self, user_ids: Iterable[int]):
+        """Increment the users' data versions in a transaction of its own"""
+        db = SessionLocal()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                insert = postgresql_insert
+            else:
+                insert = sqlite_insert
+            statement = insert(WellnessDataVersion).values(
+                [{"user_id": user_id, "version": 1} for user_id in user_ids]
+            )
+            db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={"version": WellnessDataVersion.version + 1},
+                )
+            )
+            db.commit()
+        except Exception as e:
+            # Other workers fall back to the TTL for these users
+            db.rollback()
+            with self._lock:
+                self.failed_bumps += 1
+            print(f"Error bumping wellness data versions: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and size for the admin metrics endpoint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "failed_bumps": self.failed_bumps,
+            }
+
+
+# Global instance
+wellness_cache = WellnessCache()
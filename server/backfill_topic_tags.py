@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Backfill journal topic tags for existing entries.
+
+Run once after deploying topic tagging, and again whenever the topic
+lexicon (TOPIC_LEXICON_PATH) changes.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.topic_tagger import topic_tagger
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("🏷️  Tagging journal entries...")
+        tagged = topic_tagger.retag_entries(db)
+        print(f"✅ Tagged {tagged} journal entries")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
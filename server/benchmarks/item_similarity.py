@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark item-item recommendations from the trained artifact against SQL.
+
+Seeds a database with synthetic users whose completions cluster around a
+few tastes, trains the neighbor table (train_item_similarity.py's path),
+then times "people who did X also did Y" lookups for sampled users' recent
+items: once from the memory-mapped artifact, once as the co-occurrence
+query a request would otherwise run over activity_logs. Also reports how
+often the two agree on the top item.
+
+    python benchmarks/item_similarity.py --users 5000 --items 500
+    python benchmarks/item_similarity.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import aliased, sessionmaker
+
+from app.db.models import (ActivityLog, Base, CategoryEnum, Content,
+                           ContentTypeEnum, User)
+from app.services.item_similarity import ItemSimilarityService
+
+SEED_CHUNK_SIZE = 50000
+
+
+def seed(db, users: int, items: int, per_user: int, tastes: int, now: datetime):
+    rng = np.random.default_rng(42)
+    db.execute(
+        insert(Content),
+        [
+            {
+                "id": i,
+                "title": f"Content {i}",
+                "content_type": ContentTypeEnum.VIDEO,
+                "category": CategoryEnum.WORK,
+                "url": "https://example.com",
+            }
+            for i in range(1, items + 1)
+        ],
+    )
+    # Each taste favours a slice of the catalog; users mostly stay in theirs
+    taste_items = np.array_split(np.arange(1, items + 1), tastes)
+
+    for start in range(0, users, SEED_CHUNK_SIZE):
+        ids = range(start + 1, min(start + SEED_CHUNK_SIZE, users) + 1)
+        db.execute(
+            insert(User),
+            [
+                {"id": i, "clerk_user_id": f"bench-{i}", "email": f"bench-{i}@example.com"}
+                for i in ids
+            ],
+        )
+        logs = []
+        for user_id in ids:
+            favourites = taste_items[rng.integers(tastes)]
+            for _ in range(per_user):
+                pool = favourites if rng.random() < 0.8 else np.arange(1, items + 1)
+                logs.append(
+                    {
+                        "user_id": user_id,
+                        "content_id": int(rng.choice(pool)),
+                        "completed_at": now - timedelta(minutes=int(rng.integers(1, 60 * 24 * 90))),
+                    }
+                )
+        db.execute(insert(ActivityLog), logs)
+        db.commit()
+
+
+def also_did_sql(db, seed_ids, limit: int = 3):
+    """The co-occurrence query a request would run without the artifact"""
+    seed_logs, other_logs = aliased(ActivityLog), aliased(ActivityLog)
+    rows = (
+        db.query(other_logs.content_id, func.count(func.distinct(other_logs.user_id)))
+        .join(seed_logs, seed_logs.user_id == other_logs.user_id)
+        .filter(seed_logs.content_id.in_(seed_ids), ~other_logs.content_id.in_(seed_ids))
+        .group_by(other_logs.content_id)
+        .order_by(func.count(func.distinct(other_logs.user_id)).desc())
+        .limit(limit)
+        .all()
+    )
+    return [row[0] for row in rows]
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--per-user", type=int, default=20)
+    parser.add_argument("--tastes", type=int, default=10)
+    parser.add_argument("--lookups", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    database_url = args.database_url or "sqlite:///" + os.path.join(workdir, "bench.db")
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    now = datetime.now()
+
+    print(f"Seeding {args.users} users x {args.per_user} completions ({engine.dialect.name})...")
+    seed(db, args.users, args.items, args.per_user, args.tastes, now)
+
+    service = ItemSimilarityService(path=os.path.join(workdir, "item_similarity.npy"))
+    started = time.perf_counter()
+    items = service.train(db, now=now)
+    print(
+        f"Trained {items} items in {time.perf_counter() - started:.2f}s, "
+        f"artifact {os.path.getsize(service.path) / 1024:.0f} KiB"
+    )
+
+    rng = np.random.default_rng(7)
+    seeds = [
+        [
+            row.content_id
+            for row in db.query(ActivityLog.content_id)
+            .filter(ActivityLog.user_id == int(user_id))
+            .limit(3)
+        ]
+        for user_id in rng.integers(1, args.users + 1, args.lookups)
+    ]
+
+    artifact_us, sql_us, agree = [], [], 0
+    for seed_ids in seeds:
+        started = time.perf_counter()
+        from_artifact = service.similar_to(seed_ids, seed_ids)
+        artifact_us.append((time.perf_counter() - started) * 1e6)
+
+        started = time.perf_counter()
+        from_sql = also_did_sql(db, seed_ids)
+        sql_us.append((time.perf_counter() - started) * 1e6)
+
+        agree += bool(from_artifact and from_sql and from_artifact[0][0] in from_sql)
+
+    for name, samples in (("artifact", artifact_us), ("sql", sql_us)):
+        p50, p99 = percentiles(samples)
+        print(f"{name:10} p50 {p50:10.1f} us  p99 {p99:10.1f} us  mean {statistics.mean(samples):10.1f} us")
+    print(f"Artifact's top item is in the SQL top 3 for {agree}/{len(seeds)} lookups")
+
+    db.close()
+    if not args.database_url:
+        os.remove(database_url[len("sqlite:///") :])
+    os.remove(service.path)
+
+
+if __name__ == "__main__":
+    main()
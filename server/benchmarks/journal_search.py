@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark /journal/search against a user with a large journal history.
+
+Seeds one user with N synthetic entries (10k by default) and times ranked
+search, date-filtered search and cursor pagination through the service.
+
+    python benchmarks/journal_search.py --entries 10000
+    python benchmarks/journal_search.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, JournalEntry, User
+from app.services.journal_search import JournalSearchService
+
+VOCABULARY = (
+    "today felt calm anxious tired grateful work meeting sleep rest walk "
+    "meditation breathing family friend stress deadline coffee morning evening "
+    "run gym happy sad focus project weekend dinner read book music rain sun"
+).split()
+
+QUERIES = ["sleep", "work stress", "grateful family", "meditation breathing calm"]
+
+
+def seed(db, entries: int) -> int:
+    user = User(clerk_user_id="bench-search", email="bench-search@example.com")
+    db.add(user)
+    db.commit()
+
+    start = datetime.now() - timedelta(days=entries // 4)
+    rng = random.Random(42)
+    rows = [
+        {
+            "user_id": user.id,
+            "entry_text": " ".join(rng.choices(VOCABULARY, k=rng.randint(20, 120))),
+            "created_at": start + timedelta(hours=6 * i),
+        }
+        for i in range(entries)
+    ]
+    for offset in range(0, len(rows), 5000):
+        db.execute(insert(JournalEntry), rows[offset : offset + 5000])
+    db.commit()
+    return user.id
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or (
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    )
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    print(f"Seeding {args.entries} entries ({engine.dialect.name})...")
+    user_id = seed(db, args.entries)
+    service = JournalSearchService()
+
+    _, cold_ms, _ = timed(lambda: service.search(db, user_id, "sleep"), 1)
+    print(f"first search (builds fallback index if used): {cold_ms:.1f} ms")
+
+    for query in QUERIES:
+        results, median_ms, max_ms = timed(
+            lambda: service.search(db, user_id, query, limit=20), args.repeat
+        )
+        print(f"{query!r:32} {len(results):3} hits  median {median_ms:7.2f} ms  max {max_ms:7.2f} ms")
+
+    date_from = datetime.now() - timedelta(days=30)
+    _, median_ms, _ = timed(
+        lambda: service.search(db, user_id, "work", date_from=date_from), args.repeat
+    )
+    print(f"{'work (last 30 days)':32}      median {median_ms:7.2f} ms")
+
+    # Walk ten pages using the keyset cursor
+    after = None
+    page_times = []
+    for _ in range(10):
+        started = time.perf_counter()
+        page = service.search(db, user_id, "stress", limit=20, after=after)
+        page_times.append((time.perf_counter() - started) * 1000)
+        if not page:
+            break
+        entry, rank = page[-1]
+        after = (rank, entry.created_at, entry.id)
+    print(f"{'stress, 10 pages':32}      median {statistics.median(page_times):7.2f} ms/page")
+
+    db.query(JournalEntry).filter(JournalEntry.user_id == user_id).delete()
+    db.query(User).filter(User.id == user_id).delete()
+    db.commit()
+
+
+if __name__ == "__main__":
+    main()
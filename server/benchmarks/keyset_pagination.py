@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark OFFSET vs keyset pagination on /activity/logs.
+
+Seeds one user with enough activity logs for 500+ pages and times
+fetching page 1 and page 500 with both strategies.
+
+    python benchmarks/keyset_pagination.py --rows 50000
+    python benchmarks/keyset_pagination.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import keyset_page, row_cursor
+from app.db.models import (ActivityLog, Base, CategoryEnum, Content,
+                           ContentTypeEnum, User)
+
+PAGE_SIZE = 50
+
+
+def seed(db, rows: int):
+    user = User(clerk_user_id="bench-pages", email="bench-pages@example.com")
+    content = Content(
+        title="Benchmark",
+        content_type=ContentTypeEnum.MEDITATION,
+        category=CategoryEnum.ANXIETY,
+        url="https://example.com/benchmark",
+    )
+    db.add_all([user, content])
+    db.commit()
+
+    start = datetime.now() - timedelta(minutes=rows)
+    batch = []
+    for i in range(rows):
+        batch.append(
+            {
+                "user_id": user.id,
+                "content_id": content.id,
+                "completed_at": start + timedelta(minutes=i),
+            }
+        )
+        if len(batch) == 10000:
+            db.execute(insert(ActivityLog), batch)
+            batch = []
+    if batch:
+        db.execute(insert(ActivityLog), batch)
+    db.commit()
+    return user, content
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    if args.rows < args.page * PAGE_SIZE:
+        parser.error(f"--rows must be at least {args.page * PAGE_SIZE}")
+
+    database_url = args.database_url or (
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    )
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    print(f"Seeding {args.rows} activity logs ({engine.dialect.name})...")
+    user, content = seed(db, args.rows)
+
+    def logs():
+        return db.query(ActivityLog).filter(ActivityLog.user_id == user.id)
+
+    def offset_page(page: int):
+        return (
+            logs()
+            .order_by(ActivityLog.completed_at.desc(), ActivityLog.id.desc())
+            .offset((page - 1) * PAGE_SIZE)
+            .limit(PAGE_SIZE)
+            .all()
+        )
+
+    # Cursor for the last row of the page before the one being fetched
+    boundary = offset_page(args.page - 1)[-1]
+    cursor = row_cursor(boundary, ActivityLog.completed_at, ActivityLog.id)
+
+    results = {
+        "offset page 1": timed(lambda: offset_page(1), args.repeat),
+        f"offset page {args.page}": timed(lambda: offset_page(args.page), args.repeat),
+        "keyset page 1": timed(
+            lambda: keyset_page(
+                logs(), ActivityLog.completed_at, ActivityLog.id, PAGE_SIZE
+            ),
+            args.repeat,
+        ),
+        f"keyset page {args.page}": timed(
+            lambda: keyset_page(
+                logs(), ActivityLog.completed_at, ActivityLog.id, PAGE_SIZE,
+                before=cursor,
+            ),
+            args.repeat,
+        ),
+    }
+    for label, median_ms in results.items():
+        print(f"{label:20} median {median_ms:8.2f} ms")
+
+    keyset_rows, _ = keyset_page(
+        logs(), ActivityLog.completed_at, ActivityLog.id, PAGE_SIZE, before=cursor
+    )
+    assert [row.id for row in keyset_rows] == [row.id for row in offset_page(args.page)]
+
+    db.query(ActivityLog).filter(ActivityLog.user_id == user.id).delete()
+    db.query(Content).filter(Content.id == content.id).delete()
+    db.query(User).filter(User.id == user.id).delete()
+    db.commit()
+
+
+if __name__ == "__main__":
+    main()
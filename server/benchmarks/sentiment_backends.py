@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark sentiment backends for accuracy, throughput and latency.
+
+Scores the test split of a fixed labelled corpus with each backend
+(straight through score_batch, bypassing the sentiment cache) and reports
+3-class accuracy, batch throughput at the pipeline's batch size, and
+single-text latency. The sklearn model is trained on the training split
+unless --model points at one from train_sentiment_model.py.
+
+The built-in corpus is synthetic, so its accuracy figures only show the
+backends work; pass --corpus with real labelled journal entries (a CSV
+with "text" and "label" columns, labels -1/0/1) to choose a backend.
+
+    python benchmarks/sentiment_backends.py
+    python benchmarks/sentiment_backends.py --corpus labelled.csv --min-accuracy 0.8
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.sentiment_backends import (SklearnBackend, VaderBackend,
+                                             sentiment_label,
+                                             train_sklearn_model)
+
+SUBJECTS = [
+    "Today", "This morning", "Work", "My run", "The team meeting",
+    "Dinner with friends", "Sleep last night", "The weekend", "Therapy",
+    "The commute", "My presentation", "Yoga class",
+]
+PHRASES = {
+    1: [
+        "was wonderful", "made me really happy", "felt calm and relaxed",
+        "went great and I'm proud of myself", "was fun and energizing",
+        "left me grateful", "was a big success", "felt peaceful",
+    ],
+    -1: [
+        "was awful", "made me anxious and stressed", "felt exhausting",
+        "went badly and I'm frustrated", "left me sad and lonely",
+        "was terrible", "made me angry", "felt hopeless",
+    ],
+    0: [
+        "was at the usual time", "took about an hour", "was on Tuesday",
+        "happened downtown", "was scheduled for noon", "had four people",
+        "was in the second building", "ran until six",
+    ],
+}
+ENDINGS = ["", " Tomorrow is another day.", " I wrote it down here.", " More later."]
+
+
+def synthetic_corpus(size: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    texts, labels = [], []
+    for _ in range(size):
+        label = int(rng.choice([-1, 0, 1]))
+        texts.append(
+            f"{SUBJECTS[rng.integers(len(SUBJECTS))]} "
+            f"{PHRASES[label][rng.integers(len(PHRASES[label]))]}."
+            f"{ENDINGS[rng.integers(len(ENDINGS))]}"
+        )
+        labels.append(label)
+    return texts, labels
+
+
+def load_corpus(path: str):
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    return [row["text"] for row in rows], [int(row["label"]) for row in rows]
+
+
+def measure(backend, texts, labels, batch_size: int, latency_samples: int):
+    started = time.perf_counter()
+    backend.score_batch(texts[:1])
+    load_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    scores = np.concatenate(
+        [backend.score_batch(texts[i : i + batch_size]) for i in range(0, len(texts), batch_size)]
+    )
+    throughput = len(texts) / (time.perf_counter() - started)
+
+    latencies = []
+    for text in texts[:latency_samples]:
+        started = time.perf_counter()
+        backend.score_batch([text])
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    accuracy = np.mean([sentiment_label(score) == label for score, label in zip(scores, labels)])
+    return {
+        "accuracy": float(accuracy),
+        "throughput": throughput,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "load_ms": load_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default=None)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.sentiment_batch_size)
+    parser.add_argument("--latency-samples", type=int, default=1000)
+    parser.add_argument("--min-accuracy", type=float, default=None)
+    args = parser.parse_args()
+
+    texts, labels = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.size)
+    order = np.random.default_rng(7).permutation(len(texts))
+    split = int(len(texts) * 0.8)
+    train = [int(i) for i in order[:split]]
+    test = [int(i) for i in order[split:]]
+    test_texts = [texts[i] for i in test]
+    test_labels = [labels[i] for i in test]
+
+    model_path = args.model
+    if model_path is None:
+        model_path = os.path.join(tempfile.mkdtemp(), "sentiment_model.joblib")
+        started = time.perf_counter()
+        train_sklearn_model([texts[i] for i in train], [labels[i] for i in train], model_path)
+        print(f"Trained sklearn model on {len(train)} texts in {time.perf_counter() - started:.1f}s")
+
+    print(f"Scoring {len(test_texts)} test texts, batches of {args.batch_size}")
+    print(f"  {'backend':10} {'accuracy':>8} {'texts/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'load ms':>8}")
+    results = {}
+    for backend in (VaderBackend(), SklearnBackend(model_path)):
+        result = measure(backend, test_texts, test_labels, args.batch_size, args.latency_samples)
+        results[backend.name] = result
+        print(
+            f"  {backend.name:10} {result['accuracy']:8.3f} {result['throughput']:10.0f} "
+            f"{result['p50_ms']:8.3f} {result['p99_ms']:8.3f} {result['load_ms']:8.1f}"
+        )
+
+    if args.model is None:
+        os.remove(model_path)
+
+    if args.min_accuracy is not None:
+        eligible = [name for name, result in results.items() if result["accuracy"] >= args.min_accuracy]
+        if not eligible:
+            sys.exit(f"No backend reaches {args.min_accuracy:.0%} accuracy")
+        fastest = max(eligible, key=lambda name: results[name]["throughput"])
+        print(f"Fastest backend with at least {args.min_accuracy:.0%} accuracy: {fastest}")
+
+
+if __name__ == "__main__":
+    main()
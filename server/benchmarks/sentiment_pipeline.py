@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark sentiment pipeline throughput against its worker count.
+
+Seeds journal entries with distinct texts (so the sentiment cache never
+hits), queues them all, and times how long each pool size takes to score
+and write them back, along with the most batches it had in flight at once.
+Throughput should grow with workers up to the number of free cores.
+
+    python benchmarks/sentiment_pipeline.py --entries 20000 --workers 1 2 4
+    python benchmarks/sentiment_pipeline.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import SessionLocal
+from app.db.models import Base, JournalEntry, User
+from app.services.sentiment_cache import sentiment_cache
+from app.services.sentiment_pipeline import SentimentPipeline
+
+WORDS = [
+    "calm", "happy", "stressed", "tired", "grateful", "anxious", "proud",
+    "lonely", "rested", "busy", "sad", "excited", "work", "run", "friends",
+    "sleep", "family", "meeting", "dinner", "walk", "deadline", "weekend",
+]
+
+
+def seed(db, entries: int):
+    rng = np.random.default_rng(42)
+    db.execute(insert(User), [{"id": 1, "clerk_user_id": "bench-1", "email": "bench-1@example.com"}])
+    db.execute(
+        insert(JournalEntry),
+        [
+            {
+                "user_id": 1,
+                "entry_text": f"Entry {i}: " + " ".join(rng.choice(WORDS, size=40)),
+            }
+            for i in range(entries)
+        ],
+    )
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    database_url = args.database_url or "sqlite:///" + os.path.join(workdir, "bench.db")
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    # The pipeline opens its own sessions
+    SessionLocal.configure(bind=engine)
+    db = SessionLocal()
+    sentiment_cache.path = os.path.join(workdir, "sentiment_cache.sqlite3")
+
+    print(f"Seeding {args.entries} journal entries ({engine.dialect.name}) on {os.cpu_count()} cores...")
+    seed(db, args.entries)
+    entry_ids = [row.id for row in db.query(JournalEntry.id)]
+
+    baseline = None
+    for workers in args.workers:
+        db.execute(update(JournalEntry).values(sentiment_score=None))
+        db.commit()
+        # A fresh cache per run, or later runs would only measure hits
+        sentiment_cache.path = os.path.join(workdir, f"sentiment_cache_{workers}.sqlite3")
+        sentiment_cache._memory.clear()
+
+        pipeline = SentimentPipeline(workers=workers)
+        pipeline.start()
+        started = time.perf_counter()
+        for entry_id in entry_ids:
+            pipeline.submit(entry_id)
+        pipeline.stop()
+        seconds = time.perf_counter() - started
+
+        stats = pipeline.stats()
+        unscored = db.query(JournalEntry).filter(JournalEntry.sentiment_score.is_(None)).count()
+        assert unscored == 0 and stats["failed_batches"] == 0, (unscored, stats)
+        rate = len(entry_ids) / seconds
+        baseline = baseline or rate
+        print(
+            f"workers {workers:2}  {seconds:7.2f}s  {rate:9.0f} entries/s  "
+            f"x{rate / baseline:4.2f}  max in flight {stats['max_in_flight']}"
+        )
+
+    db.close()
+    if not args.database_url:
+        os.remove(database_url[len("sqlite:///") :])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark API worker startup: time spent importing the app.
+
+Imports app.api.main (or --module) in fresh interpreters with
+python -X importtime, and reports the median total import time and the
+packages that cost the most. Heavy analytics dependencies are loaded on
+first use or by the post-startup warm-up, so by default the run fails if
+any of them shows up during the import.
+
+    python benchmarks/startup_imports.py --repeat 5
+    python benchmarks/startup_imports.py --budget-ms 1500
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages that must not be imported while a worker boots
+HEAVY_PACKAGES = ["numpy", "pandas", "pyarrow", "vaderSentiment", "sklearn", "scipy"]
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def import_profile(module: str, env: Dict[str, str]):
+    """Self time per top-level package and total time (µs) for one cold import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    by_package = defaultdict(int)
+    total = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        by_package[name.split(".")[0]] += int(self_us)
+        if not indent:
+            total += int(cumulative_us)
+    return by_package, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.api.main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--allow-heavy", action="store_true")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    # Importing the app creates its tables, so point it at a scratch database
+    database_path = None
+    if args.database_url is None:
+        database_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    env = dict(os.environ, DATABASE_URL=args.database_url or f"sqlite:///{database_path}")
+
+    # The first run also fills __pycache__, so it isn't counted
+    import_profile(args.module, env)
+    runs = [import_profile(args.module, env) for _ in range(args.repeat)]
+    totals_ms = [total / 1000 for _, total in runs]
+    by_package = runs[-1][0]
+
+    print(f"Importing {args.module} ({args.repeat} runs)")
+    print(f"{'median':10} {statistics.median(totals_ms):8.1f} ms")
+    print(f"{'min':10} {min(totals_ms):8.1f} ms")
+    print(f"{'max':10} {max(totals_ms):8.1f} ms")
+    print()
+    print("Slowest packages (self time, last run):")
+    for name, self_us in sorted(by_package.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {name:30} {self_us / 1000:8.1f} ms")
+
+    failed = False
+    heavy = [name for name in HEAVY_PACKAGES if name in by_package]
+    if heavy and not args.allow_heavy:
+        print(f"\nHeavy packages imported at startup: {', '.join(heavy)}")
+        failed = True
+    if args.budget_ms is not None and statistics.median(totals_ms) > args.budget_ms:
+        print(f"\nMedian import time is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+
+    if database_path and os.path.exists(database_path):
+        os.remove(database_path)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
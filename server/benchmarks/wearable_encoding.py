@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON vs packed binary wearable batches: bytes and parse time.
+
+Encodes the same synthetic batch both ways and times turning each body
+into validated NumPy metric columns, which is what the batch ingest
+endpoint does before scoring. Sizes are shown raw and gzip-compressed.
+
+    python benchmarks/wearable_encoding.py --samples 10000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.db.schemas import WearableBatch
+from app.services.sensor_service import SENSOR_FIELDS
+from app.services.wearable_ingest import (PACKED_SAMPLE_FIELDS,
+                                          PACKED_SAMPLES_HEADER_SIZE,
+                                          PACKED_SAMPLES_MAGIC,
+                                          PACKED_SAMPLES_VERSION,
+                                          decode_packed_samples,
+                                          samples_to_columns)
+
+
+def make_bodies(samples: int):
+    rng = np.random.default_rng(42)
+    start = datetime(2026, 1, 1)
+    records = np.zeros(samples, dtype=PACKED_SAMPLE_FIELDS)
+    records["timestamp_ms"] = [
+        int((start + timedelta(seconds=i)).timestamp() * 1000) for i in range(samples)
+    ]
+    records["heart_rate"] = rng.integers(45, 140, samples)
+    records["hrv"] = rng.integers(15, 110, samples)
+    records["stress_level"] = rng.integers(0, 101, samples)
+    records["sleep_quality"] = np.nan
+    records["activity_level"] = np.nan
+
+    header = PACKED_SAMPLES_MAGIC + bytes([PACKED_SAMPLES_VERSION, 0, 0, 0])
+    assert len(header) == PACKED_SAMPLES_HEADER_SIZE
+    packed = header + records.tobytes()
+
+    json_body = json.dumps(
+        {
+            "samples": [
+                {
+                    "t": datetime.fromtimestamp(record["timestamp_ms"] / 1000, timezone.utc)
+                    .replace(tzinfo=None)
+                    .isoformat(),
+                    "hr": int(record["heart_rate"]),
+                    "hrv": int(record["hrv"]),
+                    "stress": int(record["stress_level"]),
+                }
+                for record in records
+            ]
+        },
+        separators=(",", ":"),
+    ).encode()
+    return json_body, packed
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    json_body, packed = make_bodies(args.samples)
+
+    (json_timestamps, json_columns), json_ms = timed(
+        lambda: samples_to_columns(WearableBatch.model_validate_json(json_body).samples),
+        args.repeat,
+    )
+    (packed_timestamps, packed_columns), packed_ms = timed(
+        lambda: decode_packed_samples(packed, args.samples), args.repeat
+    )
+
+    assert np.array_equal(json_timestamps, packed_timestamps)
+    for field in SENSOR_FIELDS:
+        assert np.array_equal(json_columns[field], packed_columns[field], equal_nan=True)
+
+    print(f"{args.samples} samples")
+    print(f"  {'':8} {'bytes':>10} {'gzipped':>10} {'parse ms':>10}")
+    for label, body, parse_ms in (
+        ("json", json_body, json_ms),
+        ("packed", packed, packed_ms),
+    ):
+        print(
+            f"  {label:8} {len(body):10} {len(gzip.compress(body)):10} {parse_ms:10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark wearable ingest throughput in samples per second per worker.
+
+Compares one sample per request (insert, commit, score, commit, as
+/ai/smartwatch-sync originally did) with batched ingest
+(/ai/smartwatch-sync/batch) at several batch sizes. Batch timings include
+request schema validation.
+
+    python benchmarks/wearable_ingest.py --samples 20000
+    python benchmarks/wearable_ingest.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, MoodLog, SensorSample, User
+from app.db.schemas import WearableBatch
+from app.services.ai_service import ai_service
+from app.services.wearable_ingest import WearableIngestService, samples_to_columns
+
+
+def make_payloads(samples: int):
+    rng = random.Random(42)
+    start = datetime.now() - timedelta(seconds=samples)
+    return [
+        {
+            "t": (start + timedelta(seconds=i)).isoformat(),
+            "hr": rng.randint(45, 140),
+            "hrv": rng.randint(15, 110),
+            "stress": rng.randint(0, 100),
+        }
+        for i in range(samples)
+    ]
+
+
+def single_sample_rate(db, user_id: int, payloads) -> float:
+    started = time.perf_counter()
+    for payload in payloads:
+        mood_log = MoodLog(
+            user_id=user_id,
+            raw_sensor_data={
+                "heart_rate": payload["hr"],
+                "hrv": payload["hrv"],
+                "stress_level": payload["stress"],
+            },
+        )
+        db.add(mood_log)
+        db.commit()
+        mood_log.calculated_mood_score = ai_service.analyze_wearable_data(
+            mood_log.raw_sensor_data
+        )
+        db.commit()
+    return len(payloads) / (time.perf_counter() - started)
+
+
+def batch_rate(db, user_id: int, payloads, batch_size: int) -> float:
+    service = WearableIngestService()
+    started = time.perf_counter()
+    for offset in range(0, len(payloads), batch_size):
+        batch = WearableBatch.model_validate(
+            {"samples": payloads[offset : offset + batch_size]}
+        )
+        service.ingest(db, user_id, *samples_to_columns(batch.samples))
+    return len(payloads) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--single-samples", type=int, default=1000)
+    parser.add_argument("--batch-sizes", default="100,1000,5000")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or (
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    )
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    user = User(clerk_user_id="bench-wearable", email="bench-wearable@example.com")
+    db.add(user)
+    db.commit()
+
+    payloads = make_payloads(args.samples)
+    print(f"Ingesting {args.samples} samples ({engine.dialect.name})...")
+
+    rate = single_sample_rate(db, user.id, payloads[: args.single_samples])
+    print(f"{'one per request':18} {rate:10.0f} samples/s")
+    for batch_size in [int(size) for size in args.batch_sizes.split(",")]:
+        rate = batch_rate(db, user.id, payloads, batch_size)
+        print(f"{f'batch of {batch_size}':18} {rate:10.0f} samples/s")
+
+    db.query(MoodLog).filter(MoodLog.user_id == user.id).delete()
+    db.query(SensorSample).filter(SensorSample.user_id == user.id).delete()
+    db.query(User).filter(User.id == user.id).delete()
+    db.commit()
+
+
+if __name__ == "__main__":
+    main()
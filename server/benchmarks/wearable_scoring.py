@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark scalar vs vectorized wearable mood scoring.
+
+Scores 10k and 1M synthetic readings with analyze_wearable_data (one dict
+at a time), analyze_wearable_batch (dicts in, NumPy inside) and
+score_wearable_arrays (metric columns already in arrays), and checks that
+all three produce identical scores.
+
+    python benchmarks/wearable_scoring.py
+    python benchmarks/wearable_scoring.py --sizes 10000,1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.services.ai_service import WEARABLE_DEFAULTS, ai_service
+
+# Readings that exercise every branch and fallback of the scalar version
+EDGE_CASES = [
+    {},
+    {"heart_rate": 59.999, "hrv": 250, "activity_level": 400},
+    {"heart_rate": 60, "stress_level": 0, "sleep_quality": 100},
+    {"heart_rate": 100, "stress_level": 100, "sleep_quality": 0},
+    {"heart_rate": 151, "hrv": 0, "activity_level": 0},
+    {"heart_rate": 0, "hrv": -10, "stress_level": 150},
+    {"heart_rate": float("nan"), "hrv": float("nan")},
+    {"activity_level": float("nan"), "sleep_quality": float("inf")},
+    {"heart_rate": True, "hrv": 50.5},
+    {"heart_rate": None},
+    {"hrv": "70"},
+    None,
+]
+
+
+def make_readings(size: int, rng: np.random.Generator):
+    columns = {
+        "heart_rate": rng.integers(35, 180, size),
+        "hrv": rng.integers(5, 150, size),
+        "stress_level": rng.integers(0, 101, size),
+        "sleep_quality": rng.integers(0, 101, size),
+        "activity_level": rng.integers(0, 150, size),
+    }
+    readings = [
+        dict(zip(columns, values))
+        for values in zip(*(column.tolist() for column in columns.values()))
+    ]
+    return readings, columns
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,1000000")
+    args = parser.parse_args()
+
+    edge_scalar = [ai_service.analyze_wearable_data(reading) for reading in EDGE_CASES]
+    edge_batch = ai_service.analyze_wearable_batch(EDGE_CASES)
+    assert np.array_equal(edge_scalar, edge_batch, equal_nan=True), (
+        edge_scalar,
+        edge_batch,
+    )
+
+    rng = np.random.default_rng(42)
+    for size in [int(size) for size in args.sizes.split(",")]:
+        readings, columns = make_readings(size, rng)
+
+        scalar, scalar_ms = timed(
+            lambda: [ai_service.analyze_wearable_data(reading) for reading in readings]
+        )
+        batch, batch_ms = timed(lambda: ai_service.analyze_wearable_batch(readings))
+        arrays, arrays_ms = timed(
+            lambda: ai_service.score_wearable_arrays(
+                *(columns[field] for field in WEARABLE_DEFAULTS)
+            )
+        )
+        assert scalar == batch == arrays.tolist()
+
+        print(f"{size} samples")
+        print(f"  {'scalar (dicts)':22} {scalar_ms:10.1f} ms")
+        print(f"  {'vectorized (dicts)':22} {batch_ms:10.1f} ms  {scalar_ms / batch_ms:6.1f}x")
+        print(f"  {'vectorized (arrays)':22} {arrays_ms:10.1f} ms  {scalar_ms / arrays_ms:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
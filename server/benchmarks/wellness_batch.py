@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark the nightly wellness score batch against per-user scoring.
+
+Seeds a database with synthetic users, each with a few journal entries,
+mood logs and sensor samples in the past week, times the set-based batch
+over all of them and extrapolates the per-user path
+(calculate_wellness_score) from a sample of users. Also checks that both
+agree on the sampled users.
+
+    python benchmarks/wellness_batch.py --users 1000000
+    python benchmarks/wellness_batch.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import (Base, JournalEntry, MoodLog, SensorSample, User,
+                           WellnessScore)
+from app.services.ai_service import ai_service
+from app.services.wellness_batch import WellnessBatchService
+
+JOURNAL_TEXTS = [
+    "Had a calm, happy day with friends",
+    "Work was stressful and I slept badly",
+    "Feeling okay, nothing special",
+    "Great run this morning, proud of myself",
+]
+
+SEED_CHUNK_SIZE = 50000
+
+
+def seed(db, users: int, now: datetime):
+    rng = np.random.default_rng(42)
+    sentiment_by_text = [ai_service.analyze_journal_sentiment(text) for text in JOURNAL_TEXTS]
+    week_seconds = 7 * 24 * 3600
+
+    for start in range(0, users, SEED_CHUNK_SIZE):
+        ids = range(start + 1, min(start + SEED_CHUNK_SIZE, users) + 1)
+        db.execute(
+            insert(User),
+            [
+                {"id": i, "clerk_user_id": f"bench-{i}", "email": f"bench-{i}@example.com"}
+                for i in ids
+            ],
+        )
+
+        journal, mood, sensor = [], [], []
+        for user_id in ids:
+            # Timestamps stay an hour clear of the window edge so both paths agree
+            for _ in range(rng.integers(0, 3)):
+                text = int(rng.integers(len(JOURNAL_TEXTS)))
+                journal.append(
+                    {
+                        "user_id": user_id,
+                        "entry_text": JOURNAL_TEXTS[text],
+                        "sentiment_score": sentiment_by_text[text],
+                        "created_at": now - timedelta(seconds=int(rng.integers(3600, week_seconds))),
+                    }
+                )
+            for _ in range(rng.integers(0, 3)):
+                mood.append(
+                    {
+                        "user_id": user_id,
+                        "raw_sensor_data": {},
+                        "calculated_mood_score": float(rng.integers(1, 6)) / 5,
+                        "timestamp": now - timedelta(seconds=int(rng.integers(3600, week_seconds))),
+                    }
+                )
+            for _ in range(rng.integers(0, 5)):
+                sensor.append(
+                    {
+                        "user_id": user_id,
+                        "timestamp": now - timedelta(seconds=int(rng.integers(3600, week_seconds))),
+                        "heart_rate": float(rng.integers(50, 120)),
+                        "calculated_mood_score": float(rng.random()),
+                    }
+                )
+        for model, rows in ((JournalEntry, journal), (MoodLog, mood), (SensorSample, sensor)):
+            if rows:
+                db.execute(insert(model), rows)
+        db.commit()
+        print(f"  seeded {ids[-1]} users", end="\r")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--sample-users", type=int, default=500)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or (
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    )
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    now = datetime.now()
+
+    print(f"Seeding {args.users} users ({engine.dialect.name})...")
+    seed(db, args.users, now)
+
+    service = WellnessBatchService()
+    result = service.compute(db, now=now)
+    batch_seconds = result["query_seconds"] + result["score_seconds"] + result["write_seconds"]
+    print(
+        f"{'batch':10} {batch_seconds:8.2f}s  "
+        f"(query {result['query_seconds']:.2f}s, score {result['score_seconds']:.2f}s, "
+        f"write {result['write_seconds']:.2f}s)"
+    )
+
+    sample = np.random.default_rng(7).choice(
+        np.arange(1, args.users + 1), size=min(args.sample_users, args.users), replace=False
+    )
+    started = time.perf_counter()
+    per_user = {
+        int(user_id): ai_service._compute_wellness_score(db, int(user_id)) for user_id in sample
+    }
+    per_user_seconds = (time.perf_counter() - started) / len(sample) * args.users
+    print(f"{'per-user':10} {per_user_seconds:8.2f}s  (extrapolated from {len(sample)} users)")
+
+    snapshot = {
+        row.user_id: row
+        for row in db.query(WellnessScore).filter(WellnessScore.user_id.in_(per_user))
+    }
+    for user_id, expected in per_user.items():
+        row = snapshot[user_id]
+        assert abs(row.overall_score - expected["overall_score"]) <= 0.1, (user_id, expected)
+        assert row.trend == expected["trend"], (user_id, expected)
+    print(f"Batch matches per-user scores for {len(per_user)} sampled users")
+
+    db.close()
+    if not args.database_url:
+        os.remove(database_url[len("sqlite:///") :])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Archive and delete raw sensor samples older than the retention horizon.
+
+Run daily (e.g. from cron). Samples older than SENSOR_RETENTION_DAYS are
+written to Parquet files under SENSOR_ARCHIVE_DIR, folded into per-day
+aggregates and deleted in bounded batches. Safe to interrupt and re-run.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.sensor_compaction import sensor_compaction
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print(f"🗜️  Compacting sensor samples before {sensor_compaction.cutoff():%Y-%m-%d}...")
+        result = sensor_compaction.compact(db)
+        print(f"✅ Archived {result['archived']} samples to {len(result['files'])} files")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Recompute every user's wellness score into the wellness_scores table.
+
+Run nightly (e.g. from cron). Each run replaces the whole snapshot in one
+transaction, so it is safe to re-run at any time.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.population_sketch import population_sketch
+from app.services.wellness_batch import wellness_batch
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("💚 Computing wellness scores for all users...")
+        result = wellness_batch.compute(db)
+        print(
+            f"✅ Scored {result['users']} users ({result['improving']} improving) in "
+            f"{result['query_seconds'] + result['score_seconds'] + result['write_seconds']:.1f}s"
+        )
+        print("📊 Recounting streak and wellness percentiles...")
+        population = population_sketch.rebuild(db)
+        print(f"✅ Counted {population['streak']} streaks and {population['wellness']} scores")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
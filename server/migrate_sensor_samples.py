@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Move wearable readings stored as mood_logs JSON into sensor_samples.
+
+Manual mood entries stay in mood_logs. Safe to interrupt and re-run.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.mood_rollups import mood_rollups
+from app.services.sensor_compaction import sensor_compaction
+from app.services.sensor_service import sensor_service
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("⌚ Moving wearable readings to sensor_samples...")
+        moved = sensor_service.migrate_mood_logs(db)
+        print(f"✅ Moved {moved} readings")
+        print("📊 Rebuilding mood rollups...")
+        mood_rollups.rebuild(db, since=sensor_compaction.raw_horizon(db))
+        print("✅ Rebuilt mood rollups")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
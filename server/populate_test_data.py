@@ -14,10 +14,15 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.db.models import (
     Base, User, Goal, UserGoal, UserSettings, Content, 
-    ActivityLog, JournalEntry, MoodLog, ChatMessage,
+    ActivityLog, JournalEntry, JournalEntryTag, MoodLog, MoodRollup, SensorSample,
+    ChatMessage,
     ContentTypeEnum, CategoryEnum, BadgeTypeEnum, UserRoleEnum
 )
 from app.core.config import settings
+from app.services.content_catalog import content_catalog
+from app.services.content_popularity import content_popularity
+from app.services.mood_rollups import mood_rollups
+from app.services.topic_tagger import topic_tagger
 
 def create_test_data():
     """Create test data for the database."""
@@ -35,8 +40,11 @@ def create_test_data():
         print("🧹 Clearing existing data...")
         db.query(UserGoal).delete()
         db.query(ActivityLog).delete()
+        db.query(JournalEntryTag).delete()
         db.query(JournalEntry).delete()
         db.query(MoodLog).delete()
+        db.query(SensorSample).delete()
+        db.query(MoodRollup).delete()
         db.query(ChatMessage).delete()
         db.query(UserSettings).delete()
         db.query(Content).delete()
@@ -251,6 +259,7 @@ def create_test_data():
             db.add(content)
             contents.append(content)
         
+        content_catalog.bump(db)
         db.commit()
         print(f"✅ Created {len(contents)} content items")
         
@@ -266,6 +275,7 @@ def create_test_data():
                 db.add(activity)
         
         db.commit()
+        content_popularity.rebuild(db)
         print("✅ Created activity logs")
         
         # Create Journal Entries
@@ -296,6 +306,7 @@ def create_test_data():
             db.add(entry)
         
         db.commit()
+        topic_tagger.retag_entries(db)
         print("✅ Created journal entries")
         
         # Create Mood Logs
@@ -316,6 +327,7 @@ def create_test_data():
                 db.add(mood_log)
         
         db.commit()
+        mood_rollups.rebuild(db)
         print("✅ Created mood logs")
         
         # Create Chat Messages
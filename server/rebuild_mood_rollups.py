@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Rebuild the hourly and daily mood rollups from raw mood data.
+
+Run once after deploying rollups, with wearable ingest paused.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.mood_rollups import mood_rollups
+from app.services.sensor_compaction import sensor_compaction
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("📊 Rebuilding mood rollups...")
+        folded = mood_rollups.rebuild(db, since=sensor_compaction.raw_horizon(db))
+        print(f"✅ Folded {folded} mood scores into rollups")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Recompute every user's activity-mood correlations.
+
+Run nightly (e.g. from cron) so results follow the sliding window; the API
+workers only refresh users whose data changed since they started.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.activity_correlations import activity_correlations
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("🔗 Refreshing activity-mood correlations...")
+        refreshed = activity_correlations.refresh_all(db)
+        print(
+            f"✅ Refreshed {refreshed} users "
+            f"({activity_correlations.results_stored} results stored)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
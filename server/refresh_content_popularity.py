@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Recount decayed content popularity from activity logs.
+
+Run nightly (e.g. from cron). The API folds completions in as they are
+logged; this picks up rows loaded some other way (imports, test data) and
+drops content whose count has decayed below the popularity floor.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.content_popularity import content_popularity
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("📈 Rebuilding content popularity...")
+        stored = content_popularity.rebuild(db)
+        print(f"✅ Stored popularity for {stored} content items")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
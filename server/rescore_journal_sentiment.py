@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Score journal entries that have no real sentiment score yet.
+
+Run once after deploying pipeline scoring for POST /journal/entries, which
+used to store a 0.5 placeholder, and whenever entries were left unscored
+(e.g. the server stopped with entries still queued).
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.sentiment_pipeline import sentiment_pipeline
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("🧠 Queueing unscored journal entries...")
+        queued = sentiment_pipeline.requeue_unscored(db)
+        print(f"⏳ Scoring {queued} journal entries...")
+        # Drains the queue before returning
+        sentiment_pipeline.stop()
+        stats = sentiment_pipeline.stats()
+        print(f"✅ Scored {stats['entries_scored']} journal entries ({stats['failed_batches']} failed batches)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from sqlalchemy.orm import Session
 from app.db.database import engine, SessionLocal
 from app.db.models import Base, Content, ContentTypeEnum, CategoryEnum
+from app.services.content_catalog import content_catalog
 
 def create_sample_content(db: Session):
     """Create sample content for testing"""
@@ -108,6 +109,7 @@ def create_sample_content(db: Session):
         content = Content(**content_data)
         db.add(content)
     
+    content_catalog.bump(db)
     db.commit()
     print(f"Successfully created {len(sample_contents)} content items!")
 
@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Settings are read when app modules are imported, so point them at a
+# scratch database before any test imports one
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["SENTIMENT_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "sentiment_cache.sqlite3")
+os.environ["INGEST_SPOOL_DIR"] = tempfile.mkdtemp()
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def tables():
+    from app.db.database import engine
+    from app.db.models import Base
+
+    Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def db(tables):
+    from app.db.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    from app.db.models import User
+
+    clerk_user_id = f"test-{uuid.uuid4().hex}"
+    user = User(clerk_user_id=clerk_user_id, email=f"{clerk_user_id}@example.com")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def client(user):
+    """API client signed in as user; background workers are not started"""
+    from app.api.main import app
+    from app.core import security
+
+    for dependency in (security.get_current_user, security.get_current_active_user):
+        app.dependency_overrides[dependency] = lambda: user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
@@ -0,0 +1,28 @@
+import numpy as np
+
+from app.services.activity_correlations import correlate
+
+
+def test_lagged_days_before_the_window_are_not_counted_as_without():
+    # Activity on day 0 and 1; before day 0 it is unknown, not absent
+    activity = np.array([[1, 1, 0, 0, 1, 0]], dtype=float)
+    values = np.array([0.9, 0.8, 0.7, 0.2, 0.3, 0.8])
+
+    result = correlate(activity, values, lag=1)
+
+    # Day 0 has no activity on the day before it in the window, so it is dropped
+    assert result["days_with"][0] == 3
+    assert result["days_without"][0] == 2
+    assert np.isclose(result["mean_with"][0], (0.8 + 0.7 + 0.8) / 3)
+    assert np.isclose(result["mean_without"][0], (0.2 + 0.3) / 2)
+
+
+def test_unobserved_days_are_skipped():
+    activity = np.array([[1, 0, 1, 0]], dtype=float)
+    values = np.array([0.5, np.nan, 0.7, 0.1])
+
+    result = correlate(activity, values, lag=0)
+
+    assert result["days_with"][0] == 2
+    assert result["days_without"][0] == 1
+    assert np.isclose(result["effect"][0], 0.6 - 0.1)
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from app.db.database import SessionLocal
+from app.db.models import SensorBaseline
+from app.services.anomaly_detector import AnomalyDetector
+
+
+def readings(user_id, start, values):
+    return [
+        (user_id, start + timedelta(minutes=i), {"hrv": value, "stress_level": None})
+        for i, value in enumerate(values)
+    ]
+
+
+def test_observe_flags_a_drop_against_the_baseline(db, user):
+    detector = AnomalyDetector(threshold=3, min_samples=5, window=50, cooldown_minutes=60)
+    start = datetime(2024, 6, 1)
+
+    assert detector.observe(db, readings(user.id, start, [60, 62, 61, 59, 60, 61])) == 0
+    db.commit()
+    assert detector.observe(db, readings(user.id, start + timedelta(hours=1), [20])) == 1
+    db.commit()
+
+    baseline = db.get(SensorBaseline, (user.id, "hrv"))
+    db.refresh(baseline)
+    assert baseline.count == 7
+    assert db.get(SensorBaseline, (user.id, "stress_level")) is None
+
+
+def test_first_readings_from_two_writers_both_count(db, user):
+    detector = AnomalyDetector(min_samples=100)
+    start = datetime(2024, 6, 1)
+    other = SessionLocal()
+    try:
+        # The second session must add to the row the first created, not insert again
+        detector.observe(db, readings(user.id, start, [60]))
+        db.commit()
+        detector.observe(other, readings(user.id, start, [70]))
+        other.commit()
+    finally:
+        other.close()
+
+    baseline = db.get(SensorBaseline, (user.id, "hrv"))
+    db.refresh(baseline)
+    assert baseline.count == 2
+    assert baseline.mean == 65
@@ -0,0 +1,47 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from app.db.models import CategoryEnum, Content, ContentPopularity, ContentTypeEnum
+from app.services.content_popularity import ContentPopularityService, log2_add
+
+
+@pytest.fixture
+def content(db):
+    content = Content(
+        title="Stretching",
+        content_type=ContentTypeEnum.VIDEO,
+        category=CategoryEnum.WORK,
+        url="https://example.com",
+    )
+    db.add(content)
+    db.commit()
+    return content
+
+
+def test_record_adds_into_existing_rows_in_sql(db, content):
+    service = ContentPopularityService(half_life_days=7)
+    first, second = datetime(2024, 6, 1), datetime(2024, 6, 8)
+
+    service.record(db, [(content.id, second)])
+    db.commit()
+    service.record(db, [(content.id, first), (content.id, first)])
+    db.commit()
+
+    row = db.get(ContentPopularity, content.id)
+    db.refresh(row)
+    expected = log2_add(
+        service._exponent(second), log2_add(service._exponent(first), service._exponent(first))
+    )
+    assert math.isclose(row.log_score, expected, rel_tol=1e-12)
+    assert row.last_completed_at == second
+    # Two completions a half-life before a third count as one more
+    assert math.isclose(service.decayed_count(row.log_score, second), 2.0)
+
+
+def test_record_with_no_completions_writes_nothing(db, content):
+    ContentPopularityService().record(db, [])
+    db.commit()
+
+    assert db.get(ContentPopularity, content.id) is None
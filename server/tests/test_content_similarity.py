@@ -0,0 +1,42 @@
+import time
+
+from app.db.models import CategoryEnum, Content, ContentTypeEnum
+from app.services.content_catalog import content_catalog
+from app.services.content_similarity import ContentSimilarityService
+
+
+def add_content(db, title, description):
+    content = Content(
+        title=title,
+        description=description,
+        content_type=ContentTypeEnum.ARTICLE,
+        category=CategoryEnum.WORK,
+        url="https://example.com",
+    )
+    db.add(content)
+    db.commit()
+    return content
+
+
+def wait_for_refresh(service, timeout=30):
+    deadline = time.monotonic() + timeout
+    while service._refresher is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_similar_serves_the_last_table_and_refreshes_in_background(db):
+    first = add_content(db, "Deep breathing for sleep", "Slow breathing exercises before sleep")
+    second = add_content(db, "Breathing before sleep", "Calm breathing to fall asleep")
+    content_catalog.reload(db)
+    service = ContentSimilarityService()
+
+    # Nothing built yet: the request returns at once and starts a build
+    assert service.similar(first.id) == []
+    wait_for_refresh(service)
+    assert [item.id for item in service.similar(first.id)] == [second.id]
+
+    third = add_content(db, "Sleep breathing routine", "Breathing routine for deep sleep")
+    content_catalog.reload(db)
+    assert [item.id for item in service.similar(first.id)] == [second.id]
+    wait_for_refresh(service)
+    assert third.id in [item.id for item in service.similar(first.id, limit=20)]
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.models import (ActivityLog, CategoryEnum, Content, ContentTypeEnum,
+                           JournalEntry, MoodLog, SensorSample)
+from app.services.export_service import export_service
+
+START = datetime(2026, 1, 1, 9)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    """Flush every record or two, so the gzip stream arrives in many pieces"""
+    monkeypatch.setattr(export_service, "chunk_size", 128)
+
+
+@pytest.fixture
+def history(db, user):
+    content = Content(
+        title="Yoga",
+        content_type=ContentTypeEnum.VIDEO,
+        category=CategoryEnum.WORK,
+        url="https://example.com",
+    )
+    db.add(content)
+    db.commit()
+    rows = (
+        [
+            JournalEntry(user_id=user.id, entry_text=f"Entry {i}", created_at=START)
+            for i in range(3)
+        ]
+        + [
+            MoodLog(user_id=user.id, raw_sensor_data={"hr": 60 + i}, timestamp=START)
+            for i in range(2)
+        ]
+        + [
+            SensorSample(user_id=user.id, timestamp=START + timedelta(minutes=i), heart_rate=60.0)
+            for i in range(2)
+        ]
+        + [
+            ActivityLog(user_id=user.id, content_id=content.id, completed_at=START)
+            for _ in range(2)
+        ]
+    )
+    db.add_all(rows)
+    db.commit()
+    return [(type_name(row), row.id) for row in rows]
+
+
+def type_name(row):
+    return {
+        JournalEntry: "journal_entry",
+        MoodLog: "mood_log",
+        SensorSample: "sensor_sample",
+        ActivityLog: "activity_log",
+    }[type(row)]
+
+
+def read_gzip_lines(client, params, stop_after=None):
+    """NDJSON records from a gzipped export, dropping the connection after stop_after"""
+    records, pending = [], b""
+    decompressor = zlib.decompressobj(wbits=31)
+    with client.stream("GET", "/users/me/export", params={**params, "gzip": True}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        for chunk in response.iter_raw():
+            pending += decompressor.decompress(chunk)
+            *lines, pending = pending.split(b"\n")
+            records += [json.loads(line) for line in lines]
+            if stop_after is not None and len(records) >= stop_after:
+                return records[:stop_after]
+    assert decompressor.eof and pending == b""
+    return records
+
+
+@pytest.mark.parametrize("stop_after", [1, 3, 4, 8])
+def test_resuming_from_the_cursor_gives_every_record_once(client, history, stop_after):
+    first = read_gzip_lines(client, {}, stop_after=stop_after)
+    assert len(first) == stop_after
+    rest = read_gzip_lines(client, {"cursor": first[-1]["cursor"]})
+
+    exported = [(record["record_type"], record["id"]) for record in first + rest]
+    assert exported == history
+
+
+def test_csv_export_resumes_too(client, history):
+    full = client.get("/users/me/export", params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(full.text)))
+    assert [(row["record_type"], int(row["id"])) for row in rows] == history
+
+    resumed = client.get(
+        "/users/me/export", params={"format": "csv", "cursor": rows[4]["cursor"]}
+    )
+    rest = list(csv.DictReader(io.StringIO(resumed.text)))
+    assert [(row["record_type"], int(row["id"])) for row in rest] == history[5:]
+
+
+def test_invalid_export_cursor_is_a_400(client):
+    assert client.get("/users/me/export", params={"cursor": "garbage"}).status_code == 400
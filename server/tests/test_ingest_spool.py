@@ -0,0 +1,113 @@
+import json
+import os
+import zlib
+
+import pytest
+
+from app.db.models import (CategoryEnum, Content, ContentTypeEnum,
+                           SensorSample)
+from app.services.content_catalog import content_catalog
+from app.services.ingest_spool import (DEAD_LETTER_NAME, RECORD_HEADER,
+                                       SEALED_SUFFIX, IngestSpool)
+
+
+def write_segment(spool_dir, name, records):
+    with open(os.path.join(spool_dir, name + SEALED_SUFFIX), "wb") as f:
+        for record in records:
+            payload = json.dumps(record).encode()
+            f.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+
+
+def sensor_record(record_id, user_id, **metrics):
+    return {
+        "id": record_id,
+        "kind": "sensor_sample",
+        "data": {
+            "user_id": user_id,
+            "timestamp": "2026-01-01T00:00:00",
+            "calculated_mood_score": 0.5,
+            **metrics,
+        },
+    }
+
+
+def test_drain_dead_letters_records_that_fail_to_load(tmp_path, db, user):
+    spool = IngestSpool(spool_dir=str(tmp_path), drain_batch_size=10)
+    write_segment(
+        str(tmp_path),
+        "0000000000001-1-test-000001",
+        [
+            sensor_record("good-1", user.id, hrv=40.0),
+            {"id": "malformed", "kind": "sensor_sample", "data": {"user_id": user.id}},
+            {"id": "unknown-kind", "kind": "nope", "data": {"user_id": user.id}},
+            sensor_record("good-2", user.id, hrv=42.0),
+        ],
+    )
+
+    assert spool.drain_once() == 4
+
+    assert spool.records_rejected == 2
+    assert not [name for name in os.listdir(tmp_path) if name != DEAD_LETTER_NAME]
+    with open(tmp_path / DEAD_LETTER_NAME) as f:
+        dead = [json.loads(line) for line in f]
+    assert [entry["record"]["id"] for entry in dead] == ["malformed", "unknown-kind"]
+    assert dead[0]["error"].startswith("KeyError")
+    hrvs = sorted(row.hrv for row in db.query(SensorSample).filter(SensorSample.user_id == user.id))
+    assert hrvs == [40.0, 42.0]
+
+    # Later segments still load
+    write_segment(str(tmp_path), "0000000000002-1-test-000002", [sensor_record("good-3", user.id)])
+    assert spool.drain_once() == 1
+    assert spool.stats()["segments"] == 0
+
+
+@pytest.mark.parametrize(
+    "raw_sensor_data",
+    [{"hrv": 1e400}, {"hrv": float("nan")}, {"heart_rate": -1}, {"stress_level": "high"}],
+)
+def test_smartwatch_sync_rejects_bad_metrics_before_spooling(client, raw_sensor_data):
+    body = json.dumps({"raw_sensor_data": raw_sensor_data})
+    response = client.post(
+        "/ai/smartwatch-sync", content=body, headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 422
+
+
+def test_smartwatch_sync_accepts_a_valid_reading(client):
+    response = client.post(
+        "/ai/smartwatch-sync", json={"raw_sensor_data": {"heart_rate": 62, "hrv": 48, "steps": 900}}
+    )
+    assert response.status_code == 202
+    assert response.json()["status"] == "accepted"
+
+
+def test_activity_log_rejects_unknown_content_before_spooling(client, db):
+    content = Content(
+        title="Breathing",
+        content_type=ContentTypeEnum.VIDEO,
+        category=CategoryEnum.WORK,
+        url="https://example.com",
+    )
+    db.add(content)
+    db.commit()
+    content_catalog.reload(db)
+
+    assert client.post("/activity/log", json={"content_id": content.id}).status_code == 202
+    assert client.post("/activity/log", json={"content_id": content.id + 1000}).status_code == 404
+
+
+def test_activity_log_accepts_content_created_since_the_last_reload(client, db):
+    content_catalog.reload(db)
+    # Created by another worker: this one's snapshot hasn't seen it yet
+    content = Content(
+        title="Stretching",
+        content_type=ContentTypeEnum.VIDEO,
+        category=CategoryEnum.WORK,
+        url="https://example.com",
+    )
+    db.add(content)
+    db.commit()
+    assert content_catalog.snapshot.get(content.id) is None
+
+    assert client.post("/activity/log", json={"content_id": content.id}).status_code == 202
+    assert content_catalog.snapshot.get(content.id) is not None
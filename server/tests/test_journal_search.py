@@ -0,0 +1,49 @@
+from app.db.models import JournalEntry
+from app.services.journal_search import journal_search
+
+
+def search_ids(client, q):
+    response = client.get("/journal/search", params={"q": q})
+    assert response.status_code == 200
+    return [result["id"] for result in response.json()["results"]]
+
+
+def test_fallback_index_follows_new_and_edited_entries(client, db, user):
+    first = client.post("/journal/entries", json={"entry_text": "Walked by the river at dawn"}).json()
+    assert search_ids(client, "river") == [first["id"]]
+    assert user.id in journal_search._indexes
+
+    # Patched into the built index
+    second = client.post("/journal/entries", json={"entry_text": "The river was loud, river everywhere"}).json()
+    assert search_ids(client, "river") == [second["id"], first["id"]]
+
+    # Edited outside the API: the changed signature triggers a rebuild
+    entry = db.get(JournalEntry, first["id"])
+    entry.entry_text = "Walked through the forest at dawn"
+    db.commit()
+    assert search_ids(client, "river") == [second["id"]]
+    assert search_ids(client, "forest dawn") == [first["id"]]
+
+    db.delete(db.get(JournalEntry, second["id"]))
+    db.commit()
+    assert search_ids(client, "river") == []
+
+
+def test_search_pages_through_matches_with_cursor(client, user):
+    ids = [
+        client.post("/journal/entries", json={"entry_text": f"calm morning number {i}"}).json()["id"]
+        for i in range(5)
+    ]
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "calm morning", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/journal/search", params=params).json()
+        seen += [result["id"] for result in body["results"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    # Equal ranks fall back to newest first
+    assert seen == sorted(ids, reverse=True)
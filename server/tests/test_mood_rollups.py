@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.db.models import MoodLog, MoodRollup, SensorSample
+from app.services.ai_service import ai_service
+from app.services.mood_rollups import MAX_TREND_POINTS, mood_rollups
+
+HOUR = datetime(2026, 3, 10, 9)
+
+
+def rollups(db, user_id, resolution):
+    return {
+        rollup.bucket_start: (
+            rollup.sample_count,
+            round(rollup.score_sum, 6),
+            rollup.min_score,
+            rollup.max_score,
+        )
+        for rollup in db.query(MoodRollup).filter(
+            MoodRollup.user_id == user_id, MoodRollup.resolution == resolution
+        )
+    }
+
+
+def add_samples(db, user_id, timestamps, score=0.5):
+    db.execute(
+        insert(SensorSample),
+        [
+            {"user_id": user_id, "timestamp": timestamp, "calculated_mood_score": score}
+            for timestamp in timestamps
+        ],
+    )
+    mood_rollups.record(db, ((user_id, timestamp, score) for timestamp in timestamps))
+    db.commit()
+
+
+def test_record_folds_points_into_hour_and_day_buckets(db, user):
+    mood_rollups.record(
+        db,
+        [
+            (user.id, HOUR + timedelta(minutes=5), 0.4),
+            (user.id, HOUR + timedelta(minutes=50), 0.8),
+            (user.id, HOUR + timedelta(hours=3), 0.6),
+            (user.id, HOUR, None),
+        ],
+    )
+    db.commit()
+    # A second call adds to the existing buckets rather than replacing them
+    mood_rollups.record(
+        db,
+        [
+            (user.id, HOUR + timedelta(minutes=30), 0.2),
+            (user.id, HOUR + timedelta(hours=3, minutes=10), 0.9),
+        ],
+    )
+    db.commit()
+
+    assert rollups(db, user.id, "hour") == {
+        HOUR: (3, 1.4, 0.2, 0.8),
+        HOUR + timedelta(hours=3): (2, 1.5, 0.6, 0.9),
+    }
+    assert rollups(db, user.id, "day") == {datetime(2026, 3, 10): (5, 2.9, 0.2, 0.9)}
+
+
+def test_rebuild_matches_incremental_rollups(db, user):
+    timestamps = [HOUR + timedelta(minutes=37 * i) for i in range(60)]
+    for offset in range(0, len(timestamps), 7):
+        add_samples(db, user.id, timestamps[offset : offset + 7], score=offset / 100)
+    db.add(
+        MoodLog(
+            user_id=user.id,
+            raw_sensor_data={"mood_rating": 4},
+            calculated_mood_score=0.8,
+            timestamp=HOUR + timedelta(minutes=1),
+        )
+    )
+    mood_rollups.record(db, [(user.id, HOUR + timedelta(minutes=1), 0.8)])
+    db.commit()
+    hourly, daily = rollups(db, user.id, "hour"), rollups(db, user.id, "day")
+
+    assert mood_rollups.rebuild(db, user.id) == len(timestamps) + 1
+    assert rollups(db, user.id, "hour") == hourly
+    assert rollups(db, user.id, "day") == daily
+
+
+def test_new_mood_logs_are_folded_into_the_rollups(client, db, user):
+    for rating in (4, 2):
+        assert client.post("/mood/logs", json={"mood_rating": rating}).status_code == 200
+
+    # Summed over buckets, as the two requests may straddle an hour
+    daily = rollups(db, user.id, "day").values()
+    assert sum(count for count, _, _, _ in daily) == 2
+    assert sum(total for _, total, _, _ in daily) == pytest.approx(1.2)
+    assert min(low for _, _, low, _ in daily) == pytest.approx(0.4)
+    assert max(high for _, _, _, high in daily) == pytest.approx(0.8)
+
+
+@pytest.mark.parametrize("resolution", ["raw", "hour", "day"])
+def test_explicit_resolution_is_kept(db, user, resolution):
+    since = datetime.now() - timedelta(days=365)
+    assert mood_rollups.pick_resolution(db, user.id, since, 365, resolution) == resolution
+
+
+def test_auto_resolution_follows_point_count_and_range(db, user):
+    now = datetime.now()
+    add_samples(db, user.id, [now - timedelta(minutes=i + 1) for i in range(MAX_TREND_POINTS)])
+
+    def pick(days):
+        since = now - timedelta(days=days)
+        return mood_rollups.pick_resolution(db, user.id, since, days, "auto")
+
+    assert pick(7) == "raw"
+    assert pick(365) == "raw"
+
+    add_samples(db, user.id, [now - timedelta(hours=1, seconds=30)])
+    assert pick(7) == "hour"
+    assert pick(MAX_TREND_POINTS // 24) == "hour"
+    assert pick(MAX_TREND_POINTS // 24 + 1) == "day"
+    assert pick(365) == "day"
+
+
+def test_auto_trend_is_served_from_rollups(db, user):
+    now = datetime.now()
+    add_samples(db, user.id, [now - timedelta(minutes=i + 1) for i in range(MAX_TREND_POINTS + 1)])
+
+    trend = ai_service.get_mood_trends(db, user.id, days=30, resolution="auto")
+    assert sum(bucket["sample_count"] for bucket in trend) == MAX_TREND_POINTS + 1
+    assert all(bucket["timestamp"].endswith("T00:00:00") for bucket in trend)
+    assert all(bucket["mood_score"] == pytest.approx(0.5) for bucket in trend)
@@ -0,0 +1,134 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.models import (ActivityLog, CategoryEnum, ChatMessage, Content,
+                           ContentTypeEnum, JournalEntry)
+
+START = datetime(2026, 1, 1, 12)
+# Runs of equal timestamps, so ties straddle page boundaries
+TIMESTAMPS = [START] * 4 + [START + timedelta(seconds=1)] * 3 + [START - timedelta(minutes=5)] * 3
+
+
+def walk(client, path, cursor_param, limit=3):
+    """Follow X-Next-Cursor from the first page to the last"""
+    ids, params, pages = [], {"limit": limit}, 0
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        ids += [item["id"] for item in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids, pages
+        params = {"limit": limit, cursor_param: cursor}
+
+
+def newest_first(rows, timestamp_field):
+    return [
+        row.id
+        for row in sorted(
+            rows, key=lambda row: (getattr(row, timestamp_field), row.id), reverse=True
+        )
+    ]
+
+
+@pytest.fixture
+def activity_logs(db, user):
+    content = Content(
+        title="Walk",
+        content_type=ContentTypeEnum.VIDEO,
+        category=CategoryEnum.WORK,
+        url="https://example.com",
+    )
+    db.add(content)
+    db.commit()
+    logs = [
+        ActivityLog(user_id=user.id, content_id=content.id, completed_at=timestamp)
+        for timestamp in TIMESTAMPS
+    ]
+    db.add_all(logs)
+    db.commit()
+    return logs
+
+
+@pytest.fixture
+def journal_entries(db, user):
+    entries = [
+        JournalEntry(user_id=user.id, entry_text=f"Entry {i}", created_at=timestamp)
+        for i, timestamp in enumerate(TIMESTAMPS)
+    ]
+    db.add_all(entries)
+    db.commit()
+    return entries
+
+
+def test_activity_logs_pages_are_complete(client, activity_logs):
+    ids, pages = walk(client, "/activity/logs", "before")
+
+    assert ids == newest_first(activity_logs, "completed_at")
+    assert pages == 4
+
+
+def test_activity_journal_pages_are_complete(client, journal_entries):
+    ids, _ = walk(client, "/activity/journal", "before")
+
+    assert ids == newest_first(journal_entries, "created_at")
+
+
+def test_journal_entries_pages_are_complete(client, journal_entries):
+    ids, _ = walk(client, "/journal/entries", "cursor")
+
+    assert ids == newest_first(journal_entries, "created_at")
+
+
+def test_chat_history_pages_are_complete(client, db):
+    room = f"room-{uuid.uuid4().hex}"
+    messages = [
+        ChatMessage(
+            chat_room=room, sender_clerk_id="someone", message=f"Hi {i}", timestamp=timestamp
+        )
+        for i, timestamp in enumerate(TIMESTAMPS)
+    ]
+    db.add_all(messages)
+    db.commit()
+
+    pages = []
+    params = {"limit": 4}
+    while True:
+        response = client.get(f"/chat/rooms/{room}/messages", params=params)
+        assert response.status_code == 200
+        # Each page is chronological; pages go back in time
+        pages.append([message["id"] for message in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 4, "before": cursor}
+
+    ids = [message_id for page in pages for message_id in reversed(page)]
+    assert ids == newest_first(messages, "timestamp")
+
+
+def test_pages_are_stable_when_new_rows_arrive(client, db, user, journal_entries):
+    first = client.get("/activity/journal", params={"limit": 3})
+    after_cursor = first.headers["X-After-Cursor"]
+    next_cursor = first.headers["X-Next-Cursor"]
+
+    newer = JournalEntry(user_id=user.id, entry_text="Later", created_at=START + timedelta(hours=1))
+    db.add(newer)
+    db.commit()
+
+    # The next page picks up where the first stopped, unshifted by the new row
+    second = client.get("/activity/journal", params={"limit": 3, "before": next_cursor})
+    expected = newest_first(journal_entries, "created_at")
+    assert [item["id"] for item in second.json()] == expected[3:6]
+
+    # And paging towards newer rows finds it
+    latest = client.get("/activity/journal", params={"limit": 3, "after": after_cursor})
+    assert [item["id"] for item in latest.json()] == [newer.id]
+
+
+def test_malformed_cursor_is_a_400(client):
+    assert client.get("/activity/logs", params={"before": "garbage"}).status_code == 400
+    assert client.get("/journal/entries", params={"cursor": "garbage"}).status_code == 400
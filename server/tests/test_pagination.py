@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor, keyset_page
+from app.db.models import JournalEntry
+
+
+def add_entries(db, user, timestamps):
+    entries = [
+        JournalEntry(user_id=user.id, entry_text=f"Entry {i}", created_at=timestamp)
+        for i, timestamp in enumerate(timestamps)
+    ]
+    db.add_all(entries)
+    db.commit()
+    return entries
+
+
+def newest_first(entries):
+    return [entry.id for entry in sorted(entries, key=lambda e: (e.created_at, e.id), reverse=True)]
+
+
+def page_through(db, user, limit):
+    query = db.query(JournalEntry).filter(JournalEntry.user_id == user.id)
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = keyset_page(
+            query, JournalEntry.created_at, JournalEntry.id, limit, before=cursor
+        )
+        ids += [row.id for row in rows]
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_round_trip():
+    values = [datetime(2026, 1, 2, 3, 4, 5, 678901), 42]
+    assert decode_cursor(encode_cursor(values), 2) == values
+
+
+@pytest.mark.parametrize("microsecond", [0, 250000])
+def test_ties_on_created_at_are_broken_by_id(db, user, microsecond):
+    start = datetime(2026, 1, 1, 12, 0, 0, microsecond)
+    # Runs of equal timestamps that straddle page boundaries
+    entries = add_entries(
+        db,
+        user,
+        [start] * 4 + [start + timedelta(seconds=1)] * 3 + [start - timedelta(seconds=1)] * 2,
+    )
+
+    ids, pages = page_through(db, user, limit=2)
+
+    assert ids == newest_first(entries)
+    assert pages == 5
+
+
+def test_after_cursor_pages_back_towards_newer_rows(db, user):
+    start = datetime(2026, 1, 1, 12)
+    entries = add_entries(db, user, [start] * 3 + [start + timedelta(minutes=1)] * 3)
+    expected = newest_first(entries)
+    query = db.query(JournalEntry).filter(JournalEntry.user_id == user.id)
+
+    middle = encode_cursor([start, expected[3]])
+
+    older, _ = keyset_page(query, JournalEntry.created_at, JournalEntry.id, 2, before=middle)
+    assert [row.id for row in older] == expected[4:6]
+
+    newer, cursor = keyset_page(query, JournalEntry.created_at, JournalEntry.id, 2, after=middle)
+    assert [row.id for row in newer] == expected[1:3]
+    assert cursor is not None
+
+    newest, cursor = keyset_page(query, JournalEntry.created_at, JournalEntry.id, 2, after=cursor)
+    assert [row.id for row in newest] == expected[0:1]
+    assert cursor is None
+
+
+def test_server_default_timestamps_page_completely(db, user):
+    entries = [JournalEntry(user_id=user.id, entry_text=f"Entry {i}") for i in range(5)]
+    db.add_all(entries)
+    db.commit()
+    for entry in entries:
+        db.refresh(entry)
+
+    ids, _ = page_through(db, user, limit=2)
+
+    assert ids == newest_first(entries)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        encode_cursor([1, 2, 3]),
+        encode_cursor(["2026-01-01", 1]),
+        encode_cursor([datetime(2026, 1, 1), "1"]),
+        "eyJkdCI6MX0",  # {"dt":1}
+    ],
+)
+def test_malformed_cursor_is_a_400(db, user, cursor):
+    query = db.query(JournalEntry).filter(JournalEntry.user_id == user.id)
+    with pytest.raises(HTTPException) as raised:
+        keyset_page(query, JournalEntry.created_at, JournalEntry.id, 10, before=cursor)
+    assert raised.value.status_code == 400
+
+
+def test_before_and_after_together_is_a_400(db, user):
+    query = db.query(JournalEntry).filter(JournalEntry.user_id == user.id)
+    cursor = encode_cursor([datetime(2026, 1, 1), 1])
+    with pytest.raises(HTTPException) as raised:
+        keyset_page(
+            query, JournalEntry.created_at, JournalEntry.id, 10, before=cursor, after=cursor
+        )
+    assert raised.value.status_code == 400
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from app.db.models import MoodLog, WellnessScore
+from app.services.ai_service import ai_service
+from app.services.population_sketch import bucket_of, population_sketch
+from app.services.wellness_cache import wellness_cache
+
+
+def wellness_counts():
+    return list(population_sketch._counts["wellness"])
+
+
+def test_per_user_scores_move_the_user_between_wellness_buckets(db, user):
+    population_sketch.load(db)
+    before = wellness_counts()
+
+    first = ai_service.calculate_wellness_score(db, user.id)["overall_score"]
+    after_first = wellness_counts()
+    assert sum(after_first) == sum(before) + 1
+    assert after_first[bucket_of("wellness", first)] == before[bucket_of("wellness", first)] + 1
+
+    db.add(
+        MoodLog(
+            user_id=user.id, raw_sensor_data={}, calculated_mood_score=1.0, timestamp=datetime.now()
+        )
+    )
+    db.commit()
+    wellness_cache.invalidate(user.id)
+    second = ai_service.calculate_wellness_score(db, user.id)["overall_score"]
+    assert second != first
+
+    after_second = wellness_counts()
+    assert sum(after_second) == sum(after_first)
+    assert after_second[bucket_of("wellness", first)] == after_first[bucket_of("wellness", first)] - 1
+    assert after_second[bucket_of("wellness", second)] == after_first[bucket_of("wellness", second)] + 1
+
+    stored = db.get(WellnessScore, user.id)
+    db.refresh(stored)
+    assert stored.overall_score == second
+    assert population_sketch.rank(db, "wellness", second)["population"] == sum(after_second)
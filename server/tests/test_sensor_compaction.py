@@ -0,0 +1,114 @@
+import importlib.util
+import math
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.db.models import SensorDailyAggregate, SensorSample
+from app.services.sensor_compaction import SensorCompactionService
+from app.services.sensor_service import sensor_service
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+@pytest.fixture
+def compaction(tmp_path, monkeypatch):
+    """Compaction with a 30-day horizon and batches that split days"""
+    service = SensorCompactionService(
+        retention_days=30, archive_dir=str(tmp_path), batch_size=7
+    )
+    if not HAS_PYARROW:
+        # Archiving needs pyarrow; without it, test folding and deletion alone
+        monkeypatch.setattr(service, "_archive", lambda frame: None)
+    return service
+
+
+def add_samples(db, user_id, days_ago, count):
+    start = (datetime.now() - timedelta(days=days_ago)).replace(
+        hour=6, minute=0, second=0, microsecond=0
+    )
+    db.execute(
+        insert(SensorSample),
+        [
+            {
+                "user_id": user_id,
+                "timestamp": start + timedelta(minutes=17 * i),
+                "heart_rate": 60.0 + i,
+                # Some metrics unreported, so sums and counts differ per field
+                "hrv": None if i % 3 == 0 else 40.0 + i / 2,
+                "stress_level": 30.0 + i % 5,
+                "sleep_quality": None,
+                "activity_level": 100.0 * (i % 4),
+                "calculated_mood_score": 0.5 + i / 100,
+            }
+            for i in range(count)
+        ],
+    )
+    db.commit()
+
+
+def assert_same_averages(actual, expected):
+    assert [day["date"] for day in actual] == [day["date"] for day in expected]
+    for got, want in zip(actual, expected):
+        assert got["samples"] == want["samples"]
+        for field, value in want.items():
+            if value is None or isinstance(value, str):
+                assert got[field] == value
+            else:
+                assert math.isclose(got[field], value), (got["date"], field)
+
+
+def test_compaction_folds_old_samples_into_daily_aggregates(db, user, compaction):
+    for days_ago, count in [(45, 12), (40, 20), (33, 5), (2, 9)]:
+        add_samples(db, user.id, days_ago, count)
+    before = sensor_service.daily_averages(db, user.id, days=60)
+    assert len(before) == 4
+
+    result = compaction.compact(db)
+    assert result["archived"] >= 37
+
+    remaining = db.query(SensorSample.timestamp).filter(SensorSample.user_id == user.id).all()
+    assert len(remaining) == 9
+    assert all(row.timestamp >= compaction.cutoff() for row in remaining)
+
+    aggregates = {
+        row.day: row
+        for row in db.query(SensorDailyAggregate).filter(SensorDailyAggregate.user_id == user.id)
+    }
+    assert sorted(row.sample_count for row in aggregates.values()) == [5, 12, 20]
+    day = aggregates[(datetime.now() - timedelta(days=45)).date()]
+    assert day.hrv_count == 8
+    assert day.sleep_quality_count == 0
+    assert day.heart_rate_sum == sum(60.0 + i for i in range(12))
+
+    assert_same_averages(sensor_service.daily_averages(db, user.id, days=60), before)
+    assert compaction.raw_horizon(db) is not None
+
+
+def test_recompaction_adds_to_existing_days(db, user, compaction):
+    add_samples(db, user.id, 40, 10)
+    compaction.compact(db)
+
+    # Late arrivals for a day that was already compacted
+    add_samples(db, user.id, 40, 6)
+    before = sensor_service.daily_averages(db, user.id, days=60)
+    compaction.compact(db)
+
+    assert db.query(SensorSample).filter(SensorSample.user_id == user.id).count() == 0
+    aggregate = db.query(SensorDailyAggregate).filter(SensorDailyAggregate.user_id == user.id).one()
+    assert aggregate.sample_count == 16
+    assert_same_averages(sensor_service.daily_averages(db, user.id, days=60), before)
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow is not installed")
+def test_compaction_archives_samples_to_parquet(db, user, compaction):
+    import pandas as pd
+
+    add_samples(db, user.id, 40, 10)
+    result = compaction.compact(db)
+
+    archived = pd.concat(pd.read_parquet(path) for path in result["files"])
+    assert len(archived) == result["archived"]
+    mine = archived[archived["user_id"] == user.id].sort_values("id")
+    assert mine["heart_rate"].tolist() == [60.0 + i for i in range(10)]
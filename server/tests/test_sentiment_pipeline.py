@@ -0,0 +1,26 @@
+from app.db.models import JournalEntry
+from app.services.sentiment_pipeline import PLACEHOLDER_SENTIMENT_SCORE, SentimentPipeline
+
+
+def test_requeue_unscored_rescores_placeholders(db, user):
+    entries = [
+        JournalEntry(
+            user_id=user.id,
+            entry_text="What a wonderful, happy day!",
+            sentiment_score=PLACEHOLDER_SENTIMENT_SCORE,
+        ),
+        JournalEntry(user_id=user.id, entry_text="I feel terrible and sad."),
+        JournalEntry(user_id=user.id, entry_text="Scored already", sentiment_score=-0.2),
+    ]
+    db.add_all(entries)
+    db.commit()
+
+    pipeline = SentimentPipeline(workers=1, batch_wait_ms=10)
+    assert pipeline.requeue_unscored(db) >= 2
+    pipeline.stop()
+
+    for entry in entries:
+        db.refresh(entry)
+    assert entries[0].sentiment_score > PLACEHOLDER_SENTIMENT_SCORE
+    assert entries[1].sentiment_score < 0
+    assert entries[2].sentiment_score == -0.2
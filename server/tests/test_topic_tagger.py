@@ -0,0 +1,39 @@
+import pytest
+
+from app.services.topic_tagger import DEFAULT_TOPIC_LEXICON, TopicTagger
+
+tagger = TopicTagger(DEFAULT_TOPIC_LEXICON)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Great workout this morning",
+        "Dinner at a new restaurant",
+        "Spilled soup on my napkin",
+        "Lost interest in the show",
+        "Read about stressors online",
+    ],
+)
+def test_keywords_inside_longer_words_do_not_match(text):
+    assert tagger.tag(text) == []
+
+
+@pytest.mark.parametrize(
+    "text, topics",
+    [
+        ("Stressed about the deadline", ["stress", "work"]),
+        ("Such a stressful week", ["stress"]),
+        ("STRESS!", ["stress"]),
+        ("Took a nap, then rested", ["sleep"]),
+        ("Slept badly; tired at work's meeting", ["sleep", "work"]),
+    ],
+)
+def test_listed_inflections_match_whole_words(text, topics):
+    assert tagger.tag(text) == topics
+
+
+def test_overlapping_keywords_match_when_whole():
+    tagger = TopicTagger({"a": ["rest"], "b": ["restless"]})
+    assert tagger.tag("restless night") == ["b"]
+    assert tagger.tag("a restless rest") == ["a", "b"]
@@ -0,0 +1,163 @@
+import struct
+import time
+from datetime import datetime
+
+import pytest
+
+from app.db.models import SensorSample
+from app.services.wearable_ingest import (PACKED_SAMPLE_FIELDS,
+                                          PACKED_SAMPLES_CONTENT_TYPE,
+                                          PACKED_SAMPLES_MAGIC,
+                                          PACKED_SAMPLES_VERSION)
+
+TIMESTAMP_MS = 1767225600000  # 2026-01-01T00:00:00Z
+
+
+def post_json(client, body: str):
+    return client.post(
+        "/ai/smartwatch-sync/batch",
+        content=body,
+        headers={"content-type": "application/json"},
+    )
+
+
+def packed(*records):
+    """A packed batch from (timestamp_ms, heart_rate, hrv, stress, sleep, activity) tuples"""
+    body = PACKED_SAMPLES_MAGIC + bytes([PACKED_SAMPLES_VERSION, 0, 0, 0])
+    record_format = "<q" + "f" * (len(PACKED_SAMPLE_FIELDS) - 1)
+    return body + b"".join(struct.pack(record_format, *record) for record in records)
+
+
+def test_accepts_a_valid_batch(client):
+    response = post_json(client, '{"samples": [{"t": "2026-01-01T00:00:00", "hr": 60, "hrv": 45}]}')
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 1
+
+
+@pytest.mark.parametrize("value", ["1e400", "-1e400", "NaN", "Infinity", "-Infinity"])
+def test_rejects_non_finite_metrics(client, value):
+    response = post_json(client, f'{{"samples": [{{"t": "2026-01-01T00:00:00", "hrv": {value}}}]}}')
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["samples", 0, "hrv"]
+
+
+@pytest.mark.parametrize("field, value", [("hrv", 501), ("activity", 1001)])
+def test_rejects_unrealistic_metrics(client, field, value):
+    response = post_json(client, f'{{"samples": [{{"t": "2026-01-01T00:00:00", "{field}": {value}}}]}}')
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("hrv", [float("inf"), float("-inf"), 501.0])
+def test_packed_batch_rejects_out_of_range_metrics(client, hrv):
+    nan = float("nan")
+    response = client.post(
+        "/ai/smartwatch-sync/batch",
+        content=packed(
+            (TIMESTAMP_MS, 60, 45, nan, nan, nan),
+            (TIMESTAMP_MS + 1000, 60, hrv, nan, nan, nan),
+        ),
+        headers={"content-type": PACKED_SAMPLES_CONTENT_TYPE},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Sample 1: hrv out of range"
+
+
+@pytest.mark.parametrize(
+    "timestamp_ms",
+    [
+        2**62,  # overflowed to 1970-01-01 when converted to microseconds
+        0,
+        -1,
+        946684799999,  # just before 2000-01-01
+        int((time.time() + 86400) * 1000),
+    ],
+)
+def test_packed_batch_rejects_out_of_range_timestamps(client, timestamp_ms):
+    nan = float("nan")
+    response = client.post(
+        "/ai/smartwatch-sync/batch",
+        content=packed(
+            (TIMESTAMP_MS, 60, 45, nan, nan, nan),
+            (timestamp_ms, 60, 45, nan, nan, nan),
+        ),
+        headers={"content-type": PACKED_SAMPLES_CONTENT_TYPE},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Sample 1: timestamp out of range"
+
+
+def test_packed_batch_accepts_recent_timestamps(client):
+    nan = float("nan")
+    now_ms = int(time.time() * 1000)
+    response = client.post(
+        "/ai/smartwatch-sync/batch",
+        content=packed((TIMESTAMP_MS, 60, 45, nan, nan, nan), (now_ms, 60, 45, nan, nan, nan)),
+        headers={"content-type": PACKED_SAMPLES_CONTENT_TYPE},
+    )
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 2
+
+
+@pytest.fixture
+def new_york_time(monkeypatch):
+    """Run with a local timezone that has an offset and DST"""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_packed_timestamps_are_stored_as_naive_local_time(client, db, user, new_york_time):
+    nan = float("nan")
+    winter_ms, summer_ms = TIMESTAMP_MS, 1782907200000  # 2026-07-01T12:00:00Z
+    response = client.post(
+        "/ai/smartwatch-sync/batch",
+        content=packed((winter_ms, 60, 45, nan, nan, nan), (summer_ms, 61, 45, nan, nan, nan)),
+        headers={"content-type": PACKED_SAMPLES_CONTENT_TYPE},
+    )
+    assert response.status_code == 200
+
+    stored = [
+        sample.timestamp
+        for sample in db.query(SensorSample)
+        .filter(SensorSample.user_id == user.id)
+        .order_by(SensorSample.timestamp)
+    ]
+    assert stored == [datetime(2025, 12, 31, 19), datetime(2026, 7, 1, 8)]
+    assert stored == [datetime.fromtimestamp(ms / 1000) for ms in (winter_ms, summer_ms)]
+
+
+@pytest.mark.parametrize(
+    "timestamp", ["1970-01-01T00:00:00", "1999-12-31T00:00:00", "2999-01-01T00:00:00+02:00"]
+)
+def test_json_batch_rejects_out_of_range_timestamps(client, timestamp):
+    response = post_json(
+        client,
+        f'{{"samples": [{{"t": "2026-01-01T00:00:00", "hr": 60}}, {{"t": "{timestamp}", "hr": 60}}]}}',
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Sample 1: timestamp out of range"
+
+
+def test_json_batch_rejects_offsets_that_overflow(client):
+    response = post_json(client, '{"samples": [{"t": "9999-12-31T23:59:59-05:00", "hr": 60}]}')
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["samples", 0, "t"]
+
+
+def test_json_timestamps_with_an_offset_are_stored_as_naive_local_time(client, db, user, new_york_time):
+    response = post_json(
+        client,
+        '{"samples": [{"t": "2026-07-01T12:00:00Z", "hr": 60}, {"t": "2026-07-01T09:30:00", "hr": 61}]}',
+    )
+    assert response.status_code == 200
+
+    stored = [
+        sample.timestamp
+        for sample in db.query(SensorSample)
+        .filter(SensorSample.user_id == user.id)
+        .order_by(SensorSample.timestamp)
+    ]
+    # 12:00Z is 08:00 in New York; naive timestamps are already local
+    assert stored == [datetime(2026, 7, 1, 8), datetime(2026, 7, 1, 9, 30)]
@@ -0,0 +1,81 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.services.ai_service import WEARABLE_DEFAULTS, ai_service
+
+NAN, INF = float("nan"), float("inf")
+
+READINGS = [
+    # Missing metrics fall back to the defaults
+    {},
+    {"heart_rate": 72},
+    {"hrv": 80, "sleep_quality": 90},
+    # Heart rate band edges and clamping of each normalized term
+    {"heart_rate": 59.999, "hrv": 250, "activity_level": 400},
+    {"heart_rate": 60, "stress_level": 0, "sleep_quality": 100},
+    {"heart_rate": 100, "stress_level": 100, "sleep_quality": 0},
+    {"heart_rate": 150, "hrv": 100, "activity_level": 100},
+    {"heart_rate": 151, "hrv": 0, "activity_level": 0},
+    {"heart_rate": 0, "hrv": -10, "stress_level": 150},
+    # Overall score clamped at 0 and 1
+    {"heart_rate": 0, "hrv": 0, "stress_level": 400, "sleep_quality": 0, "activity_level": 0},
+    {"heart_rate": 80, "hrv": 500, "stress_level": -300, "sleep_quality": 300, "activity_level": 1000},
+    # NaN and infinities
+    {"heart_rate": NAN, "hrv": NAN},
+    {"stress_level": NAN},
+    {"activity_level": NAN, "sleep_quality": INF},
+    {"heart_rate": -INF, "hrv": INF},
+    # Values the scalar version falls back to 0.5 for
+    {"heart_rate": True, "hrv": 50.5},
+    {"heart_rate": None},
+    {"hrv": "70"},
+    None,
+]
+
+
+def same(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+@pytest.mark.parametrize("reading", READINGS, ids=repr)
+def test_batch_matches_scalar_per_reading(reading):
+    scalar = ai_service.analyze_wearable_data(reading)
+    (batch,) = ai_service.analyze_wearable_batch([reading])
+
+    assert same(batch, scalar), (batch, scalar)
+
+
+def test_batch_matches_scalar_for_mixed_batch():
+    rng = np.random.default_rng(7)
+    random = [
+        {field: float(value) for field, value in zip(WEARABLE_DEFAULTS, row)}
+        for row in rng.uniform(-50, 250, size=(200, len(WEARABLE_DEFAULTS)))
+    ]
+    readings = READINGS + random
+
+    scalar = [ai_service.analyze_wearable_data(reading) for reading in readings]
+    batch = ai_service.analyze_wearable_batch(readings)
+
+    assert len(batch) == len(readings)
+    assert all(same(b, s) for b, s in zip(batch, scalar))
+
+
+def test_arrays_match_scalar():
+    # The dicts of plain numbers; the rest never reach the arrays path
+    readings = READINGS[:15]
+    columns = [
+        np.array([reading.get(field, default) for reading in readings], dtype=np.float64)
+        for field, default in WEARABLE_DEFAULTS.items()
+    ]
+
+    scalar = [ai_service.analyze_wearable_data(reading) for reading in readings]
+    arrays = ai_service.score_wearable_arrays(*columns).tolist()
+
+    assert all(same(a, s) for a, s in zip(arrays, scalar))
+
+
+def test_empty_batch():
+    assert ai_service.analyze_wearable_batch([]) == []
+    assert ai_service.score_wearable_arrays(*[np.array([])] * 5).tolist() == []
@@ -0,0 +1,32 @@
+from app.services.wellness_cache import WellnessCache
+
+
+def test_invalidation_reaches_other_workers(db, user):
+    # Two caches stand in for two API worker processes
+    worker_a, worker_b = WellnessCache(), WellnessCache()
+    computed = []
+
+    def compute():
+        computed.append(1)
+        return {"score": len(computed)}
+
+    assert worker_a.get_or_compute(db, user.id, compute) == {"score": 1}
+    assert worker_a.get_or_compute(db, user.id, compute) == {"score": 1}
+
+    worker_b.invalidate(user.id)
+
+    assert worker_a.get_or_compute(db, user.id, compute) == {"score": 2}
+    assert worker_a.stats()["stale_hits"] == 1
+    assert worker_a.get_or_compute(db, user.id, compute) == {"score": 2}
+    assert worker_a.stats()["hits"] == 2
+
+
+def test_invalidate_many_bumps_each_user_once(db, user):
+    cache = WellnessCache()
+    cache.get_or_compute(db, user.id, lambda: {"score": 1})
+
+    cache.invalidate_many([user.id, user.id])
+
+    assert cache._version(db, user.id) >= 1
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["failed_bumps"] == 0
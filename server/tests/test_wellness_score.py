@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+
+from app.db.models import JournalEntry, MoodLog
+from app.services.ai_service import ai_service
+from app.services.wellness_batch import WellnessBatchService, score_frame
+
+
+def test_batch_and_per_user_scores_agree(db, user):
+    now = datetime.now()
+    db.add_all(
+        [
+            JournalEntry(user_id=user.id, entry_text="Great day", sentiment_score=0.8, created_at=now),
+            JournalEntry(user_id=user.id, entry_text="Rough day", sentiment_score=-0.4, created_at=now),
+            # Not scored by the pipeline yet
+            JournalEntry(user_id=user.id, entry_text="Awful, awful day", created_at=now),
+            MoodLog(user_id=user.id, raw_sensor_data={}, calculated_mood_score=0.6, timestamp=now),
+        ]
+    )
+    db.commit()
+
+    service = WellnessBatchService()
+    frame = service.aggregates(db, now - timedelta(days=service.window_days))
+    batch = score_frame(frame[frame["user_id"] == user.id]).iloc[0]
+    per_user = ai_service._compute_wellness_score(db, user.id)
+
+    assert per_user["sentiment_component"] == 60.0
+    for column in ("overall_score", "sentiment_component", "mood_component", "trend"):
+        assert batch[column] == per_user[column]
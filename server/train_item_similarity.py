@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Train the item-item similarity model behind "people who did X also did Y"
+recommendations.
+
+Run nightly (e.g. from cron). Reads who completed what over the last
+ITEM_SIMILARITY_WINDOW_DAYS and writes each item's nearest neighbors to
+ITEM_SIMILARITY_PATH, which API workers pick up without a restart.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine, SessionLocal
+from app.db.models import Base
+from app.services.item_similarity import item_similarity
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("🤝 Training item similarity model...")
+        items = item_similarity.train(db)
+        print(f"✅ Wrote neighbors for {items} content items to {item_similarity.path}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
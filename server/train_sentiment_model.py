@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Train the scikit-learn sentiment model from a labelled CSV file.
+
+    python train_sentiment_model.py labelled_entries.csv
+
+The CSV needs "text" and "label" columns, with labels -1 (negative),
+0 (neutral) or 1 (positive). The model is written to SENTIMENT_MODEL_PATH;
+set SENTIMENT_BACKEND=sklearn to use it. Check it against VADER with
+benchmarks/sentiment_backends.py first.
+"""
+
+import csv
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services.sentiment_backends import train_sklearn_model
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit(f"Usage: {sys.argv[0]} labelled_entries.csv")
+    if not settings.sentiment_model_path:
+        sys.exit("❌ Set SENTIMENT_MODEL_PATH to where the model should be written")
+
+    with open(sys.argv[1], newline="") as f:
+        rows = list(csv.DictReader(f))
+    texts = [row["text"] for row in rows]
+    labels = [int(row["label"]) for row in rows]
+
+    print(f"🧠 Training sentiment model on {len(texts)} labelled texts...")
+    train_sklearn_model(texts, labels, settings.sentiment_model_path)
+    print(f"✅ Model written to {settings.sentiment_model_path}")
+
+
+if __name__ == "__main__":
+    main()